@@ -1,6 +1,14 @@
 import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
 from dotenv import load_dotenv
-from sqlmodel import SQLModel, create_engine
+from sqlalchemy import event, exc, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+from sqlmodel import SQLModel, Session, create_engine
+from app.services import metrics
 
 # Load environment variables
 load_dotenv()
@@ -12,7 +20,214 @@ if not DATABASE_URL:
     sqlite_file_name = "../database.db"
     DATABASE_URL = f"sqlite:///{sqlite_file_name}"
 
-engine = create_engine(DATABASE_URL)
+# Pool sizing: size it to API workers + background threads (sync, outbox) per process
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Recycle connections before Postgres / a proxy (PgBouncer, LB) drops idle ones
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))  # ms
+# Run migrations at startup; turn off when several workers start at once and
+# run `alembic upgrade head` as a deploy step instead
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "true").lower() in ("1", "true", "yes")
+BASELINE_REVISION = "0001"
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+# Rows per INSERT ... ON CONFLICT statement; keeps SQLite under its bound-parameter limit
+DB_UPSERT_CHUNK_SIZE = int(os.getenv("DB_UPSERT_CHUNK_SIZE", "500"))
+
+
+class PoolMetrics:
+    """Checkout counters and time spent waiting for a free connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connections_opened = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+
+    def record_checkout(self, waited: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            # Sub-millisecond gets came straight from the idle queue
+            if waited >= 0.001:
+                self.waits += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "connections_opened": self.connections_opened,
+                "waits": self.waits,
+                "wait_seconds": round(self.wait_seconds, 4),
+                "avg_wait_ms": round(self.wait_seconds / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+                "timeouts": self.timeouts,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        pool_metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers run alongside the sync / outbox writers
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+    cursor.close()
+
+
+def make_engine(url: str = DATABASE_URL, **overrides):
+    """Builds an engine with pool settings from the environment.
+
+    SQLite gets WAL, a busy timeout and check_same_thread=False, since
+    sessions move between the event loop and threadpool workers. In-memory
+    SQLite keeps SQLAlchemy's default single-connection pool.
+    """
+    parsed = make_url(url)
+    options = {"echo": DB_ECHO}
+    if parsed.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT / 1000}
+        if parsed.database and parsed.database != ":memory:":
+            options.update(poolclass=InstrumentedQueuePool, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    else:
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+        )
+    options.update(overrides)
+
+    new_engine = create_engine(url, **options)
+    if parsed.get_backend_name() == "sqlite":
+        event.listen(new_engine, "connect", _set_sqlite_pragmas)
+    event.listen(new_engine, "connect", lambda *args: pool_metrics.record_connect())
+    metrics.instrument_engine(new_engine)
+    return new_engine
+
+
+engine = make_engine()
+
+def _alembic_config():
+    from alembic.config import Config
+
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.attributes["configure_logger"] = False
+    return config
 
 def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+    """Brings the schema up to the latest migration (see migrations/).
+
+    An empty database is created straight from the models and stamped as
+    current. One created by create_all before migrations existed is stamped
+    at the baseline revision and then upgraded.
+    """
+    if not DB_AUTO_MIGRATE:
+        return
+    from alembic import command
+
+    config = _alembic_config()
+    tables = inspect(engine).get_table_names()
+    if not tables:
+        from app.services.analytics import create_status_log
+        from app.services.candidate_search import create_search_index
+
+        SQLModel.metadata.create_all(engine)
+        # Triggers and the search index are not part of the models
+        with engine.begin() as connection:
+            create_search_index(connection)
+            create_status_log(connection)
+        command.stamp(config, "head")
+        return
+    if "alembic_version" not in tables:
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
+
+def get_session():
+    """FastAPI dependency: one session per request, closed when the request ends."""
+    with Session(engine) as session:
+        yield session
+
+def pool_stats():
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__, **pool_metrics.snapshot()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=DB_MAX_OVERFLOW,
+            timeout=DB_POOL_TIMEOUT,
+        )
+    return stats
+
+def bulk_upsert(session: Session, model, rows: List[dict], conflict_columns: List[str], update_columns: Optional[List[str]] = None, returning: Optional[List[str]] = None):
+    """INSERT ... ON CONFLICT DO UPDATE for many rows, in chunks, inside the caller's transaction.
+
+    `conflict_columns` must match a unique index or constraint. Later rows
+    win when the input repeats a key. Returns the `returning` columns of
+    every written row (Postgres and SQLite only).
+    """
+    if not rows:
+        return []
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise Exception(f"Bulk upsert is not supported on {dialect}")
+
+    # A statement may not touch the same row twice
+    unique_rows = list({tuple(row[column] for column in conflict_columns): row for row in rows}.values())
+    table = model.__table__
+    if update_columns is None:
+        update_columns = [column for column in unique_rows[0] if column not in conflict_columns]
+
+    written = []
+    for start in range(0, len(unique_rows), DB_UPSERT_CHUNK_SIZE):
+        statement = insert(table).values(unique_rows[start:start + DB_UPSERT_CHUNK_SIZE])
+        statement = statement.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={column: statement.excluded[column] for column in update_columns},
+        )
+        if returning:
+            statement = statement.returning(*(table.c[column] for column in returning))
+            written.extend(session.execute(statement).all())
+        else:
+            session.execute(statement)
+    return written
@@ -1,9 +1,27 @@
+import asyncio
+import logging
+import os
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from app.database import create_db_and_tables, engine
 
 from sqlmodel import Session, select
 from app.models.user import User
+from app.services.zoho_http import close_async_clients
+from app.services.sync import sync_engine, ZOHO_SYNC_ENABLED
+from app.services.outbox import outbox_worker, OUTBOX_ENABLED
+from app.services.portal_engine import portal_engine
+from app.services.webhooks import webhook_processor, ZOHO_WEBHOOKS_ENABLED
+from app.services.metrics import TimedJSONResponse, TimingMiddleware
+from app.services.tenants import TenantMiddleware
+
+# DEBUG also logs Zoho response bodies
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+# httpx logs every request at INFO; Zoho calls are counted in /metrics instead
+logging.getLogger("httpx").setLevel(logging.WARNING)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -14,26 +32,65 @@ async def lifespan(app: FastAPI):
             user = User(username="admin", password_hash="dummyhash")
             session.add(user)
             session.commit()
+    if ZOHO_SYNC_ENABLED:
+        sync_engine.start()
+    if OUTBOX_ENABLED:
+        outbox_worker.start()
+    if ZOHO_WEBHOOKS_ENABLED:
+        webhook_processor.start()
     yield
+    webhook_processor.stop()
+    outbox_worker.stop()
+    await asyncio.to_thread(portal_engine.close)
+    sync_engine.stop()
+    await close_async_clients()
 
 
-from app.routers import jobs
+from app.routers import analytics, candidates, events, jobs, metrics, stats, webhooks
 
 app = FastAPI(
     title="Job Auto-Poster",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=TimedJSONResponse,
 )
 
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES
+# Innermost, so CORS preflights never fail on an unknown tenant
+app.add_middleware(TenantMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://localhost:5173"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
+)
+# Compresses JSON and NDJSON (streamed chunks are flushed as they go);
+# SSE is excluded by GZipMiddleware, and attachments are already compressed
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=int(os.getenv("GZIP_MINIMUM_SIZE", "1000")),
+    compresslevel=int(os.getenv("GZIP_LEVEL", "6")),
+    exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES + (
+        "application/pdf",
+        "application/octet-stream",
+        "application/msword",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "application/zip",
+    ),
 )
+# Added last so it wraps CORS and times the whole request
+app.add_middleware(TimingMiddleware)
 
 app.include_router(jobs.router)
+app.include_router(candidates.router)
+app.include_router(analytics.router)
+app.include_router(stats.router)
+app.include_router(events.router)
+app.include_router(webhooks.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 def read_root():
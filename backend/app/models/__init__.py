@@ -1,2 +1,6 @@
 from .user import User
 from .job import JobPosting
+from .candidate import Candidate
+from .sync_state import SyncState
+from .outbox import JobOutbox
+from .analytics import CandidateStatusChange, PipelineCandidate, PipelineStatusStats, PipelineStageStats, AnalyticsState
@@ -0,0 +1,51 @@
+from sqlalchemy import Index
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class CandidateStatusChange(SQLModel, table=True):
+    # Append-only log written by database triggers on candidate (see
+    # app.services.analytics): a candidate associated with a job (from_status
+    # None), moved between statuses, or removed from it (to_status None)
+    __table_args__ = (
+        Index("ix_candidatestatuschange_job_candidate", "job_id", "candidate_zoho_id"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    job_id: int = Field(index=True)
+    candidate_zoho_id: str
+    from_status: Optional[str] = None
+    to_status: Optional[str] = None
+    changed_at: datetime
+
+
+class PipelineCandidate(SQLModel, table=True):
+    # Where each candidate stands, as folded from the change log so far
+    job_id: int = Field(primary_key=True)
+    candidate_zoho_id: str = Field(primary_key=True)
+    status: Optional[str] = None  # None once removed from the job
+    entered_at: datetime
+    furthest_stage: int = 0  # 1-based position in PIPELINE_STAGES, 0 for none yet
+
+
+class PipelineStatusStats(SQLModel, table=True):
+    job_id: int = Field(primary_key=True)
+    status: str = Field(primary_key=True)
+    current: int = 0
+    entered: int = 0
+    exited: int = 0
+    # Summed over exits, for the average time spent in the status
+    seconds_in_status: float = 0.0
+
+
+class PipelineStageStats(SQLModel, table=True):
+    job_id: int = Field(primary_key=True)
+    stage: str = Field(primary_key=True)
+    # Candidates that got at least this far, for funnel conversion
+    reached: int = 0
+
+
+class AnalyticsState(SQLModel, table=True):
+    name: str = Field(primary_key=True)
+    last_change_id: int = 0
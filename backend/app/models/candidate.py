@@ -1,13 +1,32 @@
+from sqlalchemy import Index, UniqueConstraint
 from sqlmodel import SQLModel, Field
+from typing import List, Optional
+from datetime import datetime
 
 class Candidate(SQLModel, table=True):
+    # One row per candidate/job association, mirrored from Zoho. A candidate
+    # applied to several jobs has several rows, so zoho_id is unique per job.
+    __table_args__ = (
+        UniqueConstraint("job_id", "zoho_id", name="uq_candidate_job_zoho"),
+        Index("ix_candidate_job_status", "job_id", "status"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    zoho_id: Optional[str] = None
+    zoho_id: Optional[str] = Field(default=None, index=True)
     job_id: int = Field(foreign_key="jobposting.id")
-    first_name: str
-    last_name: str
-    email: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
     phone: Optional[str] = None
-    status: str # ATS Status (e.g., "Applied", "Interviewer", "Hired")
+    status: str = "Applied" # ATS Status (e.g., "Applied", "Interviewer", "Hired")
     resume_url: Optional[str] = None
-    applied_date: str
+    applied_date: Optional[str] = None
+    modified_time: Optional[datetime] = None
+
+
+class CandidateStatusUpdate(SQLModel):
+    candidate_id: str
+    status: str
+
+class BulkStatusUpdate(SQLModel):
+    updates: List[CandidateStatusUpdate]
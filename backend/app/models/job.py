@@ -1,10 +1,11 @@
 from sqlmodel import SQLModel, Field
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 
 class JobPosting(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    zoho_id: Optional[str] = None
+    # Unique when set; drafts waiting in the outbox have none yet
+    zoho_id: Optional[str] = Field(default=None, unique=True, index=True)
     title: str
     description: str
     location: str
@@ -12,5 +13,9 @@ class JobPosting(SQLModel, table=True):
     job_type: str = "Full Time" 
     salary_range: Optional[str] = None
     experience_required: Optional[str] = None
-    target_date: date
+    target_date: Optional[date] = None
+    # Mirrored from Zoho by the sync engine
+    client_name: Optional[str] = None
+    status: Optional[str] = None
+    modified_time: Optional[datetime] = None
     # Add more fields as needed: Account Manager, Contact Name etc.
@@ -0,0 +1,21 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime, timezone
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+class JobOutbox(SQLModel, table=True):
+    # One row per publish step of a job: "zoho" first, then "portal:<name>"
+    id: Optional[int] = Field(default=None, primary_key=True)
+    job_id: int = Field(foreign_key="jobposting.id", index=True)
+    target: str
+    idempotency_key: str = Field(index=True, unique=True)
+    status: str = Field(default="pending", index=True)  # pending | in_progress | done | failed
+    attempts: int = 0
+    next_attempt_at: datetime = Field(default_factory=_utcnow, index=True)
+    claimed_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    result: Optional[str] = None  # external id returned by the target
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
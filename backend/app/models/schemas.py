@@ -0,0 +1,122 @@
+from pydantic import ConfigDict
+from sqlmodel import SQLModel
+from typing import Dict, List, Optional, Union
+
+# Response shapes of the /jobs, /candidates and /analytics routes. Only the fields the
+# dashboard reads are returned, not the full Zoho record.
+
+
+class ResponseSchema(SQLModel):
+    # Zoho sends some text fields (phone numbers, salary) as numbers
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+
+class JobSummary(ResponseSchema):
+    # Every field is optional: ?fields= returns only the requested ones
+    id: Optional[str] = None
+    title: Optional[str] = None
+    location: Optional[str] = None
+    salary_range: Optional[str] = None
+    industry: Optional[str] = None
+    job_type: Optional[str] = None
+    target_date: Optional[str] = None
+    description: Optional[str] = None
+    client_name: Optional[str] = None
+    status: Optional[str] = None
+    modified_time: Optional[str] = None
+
+
+class JobDetail(JobSummary):
+    experience_required: Optional[str] = None
+
+
+class CandidateSummary(ResponseSchema):
+    id: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    status: str
+    applied_date: Optional[str] = None
+    resume_url: Optional[str] = None
+    job_id: str
+    modified_time: Optional[str] = None
+
+
+class CandidateSearchResult(CandidateSummary):
+    job_title: Optional[str] = None
+
+
+class CandidateSearchPage(ResponseSchema):
+    total: int
+    limit: int
+    offset: int
+    results: List[CandidateSearchResult]
+
+
+class CandidateDetails(ResponseSchema):
+    # Zoho field names, as the candidate pages read them
+    City: Optional[str] = None
+    Current_Job_Title: Optional[str] = None
+    Current_Employer: Optional[str] = None
+    Experience_in_Years: Optional[Union[int, float, str]] = None
+    Highest_Qualification_Held: Optional[str] = None
+    Skill_Set: Optional[str] = None
+    Additional_Info: Optional[str] = None
+    Modified_Time: Optional[str] = None
+
+
+class CandidateWithDetails(CandidateSummary):
+    details: CandidateDetails
+
+
+class CandidateProfile(CandidateDetails):
+    id: str
+    First_Name: Optional[str] = None
+    Last_Name: Optional[str] = None
+    Email: Optional[str] = None
+    Phone: Optional[str] = None
+    Mobile: Optional[str] = None
+    Application_Status: Optional[str] = None
+    Candidate_Stage: Optional[str] = None
+
+
+class CandidateAttachment(ResponseSchema):
+    id: str
+    candidate_id: str
+    file_name: Optional[str] = None
+    size: Optional[int] = None
+    category: Optional[str] = None
+    modified_time: Optional[str] = None
+
+
+class PipelineStatus(ResponseSchema):
+    status: str
+    stage: Optional[str] = None
+    current: int
+    entered: int
+    exited: int
+    avg_days_in_status: Optional[float] = None
+
+
+class PipelineStage(ResponseSchema):
+    stage: str
+    current: int
+    reached: int
+    conversion: Optional[float] = None
+    conversion_from_start: Optional[float] = None
+
+
+class PipelineJob(ResponseSchema):
+    job_id: str
+    title: Optional[str] = None
+    total: int
+    counts: Dict[str, int]
+
+
+class PipelineAnalytics(ResponseSchema):
+    job_id: Optional[str] = None
+    total: int
+    statuses: List[PipelineStatus]
+    funnel: List[PipelineStage]
+    jobs: Optional[List[PipelineJob]] = None
@@ -0,0 +1,9 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+class SyncState(SQLModel, table=True):
+    # Watermark per mirrored Zoho module ("jobs", "candidates")
+    entity: str = Field(primary_key=True)
+    last_modified: Optional[datetime] = None
+    last_synced_at: Optional[datetime] = None
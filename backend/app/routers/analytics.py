@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional
+from sqlmodel import Session
+from app.database import get_session
+from app.models.schemas import PipelineAnalytics
+from app.services import analytics, tenants
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/pipeline", response_model=PipelineAnalytics)
+async def read_pipeline(
+    job_id: Optional[str] = Query(None, description="Zoho id of one job; all jobs (with per-job counts) when omitted"),
+    session: Session = Depends(get_session),
+):
+    """Candidates per status, average days in each status and funnel conversion."""
+    if not tenants.is_default():
+        # Built from the default tenant's mirror
+        raise HTTPException(status_code=404, detail="Pipeline analytics are not available for this tenant")
+    try:
+        pipeline = await run_in_threadpool(analytics.load_pipeline, session, job_id)
+    except analytics.UnknownJob as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if pipeline is None:
+        raise HTTPException(status_code=503, detail="Pipeline analytics are available once the first Zoho sync has completed")
+    return pipeline
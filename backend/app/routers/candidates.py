@@ -0,0 +1,120 @@
+from contextlib import AsyncExitStack
+from email.message import Message
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from typing import List, Optional
+from sqlmodel import Session
+from app.database import get_session
+from app.models.schemas import CandidateAttachment, CandidateSearchPage
+from app.services import tenants
+from app.services.attachments import attachment_cache, stream_to_client
+from app.services.candidate_search import search_candidates
+from app.services.http_cache import conditional_json
+from app.services.tenants import current_tenant
+from app.services.zoho_jobs_async import AsyncZohoJobService
+
+router = APIRouter(prefix="/candidates", tags=["candidates"])
+
+# An attachment id always refers to the same file, so browsers may keep it
+ATTACHMENT_CACHE_CONTROL = "private, max-age=86400"
+
+
+def _file_name(content_disposition: Optional[str]):
+    if not content_disposition:
+        return None
+    message = Message()
+    message["content-disposition"] = content_disposition
+    return message.get_filename()
+
+
+def _content_disposition(file_name: str):
+    # inline, so PDFs open in the browser tab the dashboard links to
+    return f"inline; filename*=utf-8''{quote(file_name)}"
+
+
+@router.get("/search", response_model=CandidateSearchPage)
+async def search(
+    q: str = Query(..., min_length=1, description="Words to match as prefixes of name, email, phone, status or job title"),
+    status: Optional[str] = None,
+    job_id: Optional[str] = Query(None, description="Zoho id of a job to search within"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    session: Session = Depends(get_session),
+):
+    """Candidate/job associations across every mirrored job, best matches first."""
+    if not tenants.is_default():
+        # The index is built from the default tenant's mirror
+        raise HTTPException(status_code=404, detail="Candidate search is not available for this tenant")
+    page = await run_in_threadpool(search_candidates, session, q, status, job_id, limit, offset)
+    if page is None:
+        raise HTTPException(status_code=503, detail="Candidate search is available once the first Zoho sync has completed")
+    return page
+
+
+@router.get("/{candidate_id}/attachments", response_model=List[CandidateAttachment])
+async def read_candidate_attachments(candidate_id: str, request: Request):
+    try:
+        attachments = await AsyncZohoJobService.get_candidate_attachments(candidate_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Zoho API Error: {str(e)}")
+    return conditional_json(request, attachments, List[CandidateAttachment])
+
+
+@router.get("/{candidate_id}/attachments/{attachment_id}")
+async def download_candidate_attachment(candidate_id: str, attachment_id: str):
+    """Streams an attachment, from the local disk cache when possible."""
+    tenant_id = current_tenant().id
+    cached = await run_in_threadpool(attachment_cache.lookup, tenant_id, candidate_id, attachment_id)
+    if cached:
+        return FileResponse(
+            cached["path"],
+            media_type=cached["content_type"],
+            headers={
+                "Content-Disposition": _content_disposition(cached["file_name"]),
+                "Cache-Control": ATTACHMENT_CACHE_CONTROL,
+                "ETag": f'"{cached["sha256"]}"',
+                "X-Cache": "HIT",
+            },
+        )
+
+    exit_stack = AsyncExitStack()
+    try:
+        response = await exit_stack.enter_async_context(AsyncZohoJobService.stream_attachment(candidate_id, attachment_id))
+    except Exception as e:
+        await exit_stack.aclose()
+        raise HTTPException(status_code=500, detail=f"Zoho API Error: {str(e)}")
+    if response.status_code != 200:
+        await response.aread()
+        detail = response.text
+        await exit_stack.aclose()
+        if response.status_code in (204, 400, 404):
+            raise HTTPException(status_code=404, detail="Attachment not found")
+        raise HTTPException(status_code=500, detail=f"Zoho API Error: {detail}")
+
+    content_type = response.headers.get("content-type", "application/octet-stream")
+    file_name = _file_name(response.headers.get("content-disposition")) or attachment_id
+    headers = {
+        "Content-Disposition": _content_disposition(file_name),
+        "Cache-Control": ATTACHMENT_CACHE_CONTROL,
+        "X-Cache": "MISS",
+    }
+    if "content-length" in response.headers and "content-encoding" not in response.headers:
+        headers["Content-Length"] = response.headers["content-length"]
+    writer = await run_in_threadpool(attachment_cache.writer, tenant_id, candidate_id, attachment_id, {"file_name": file_name, "content_type": content_type})
+    return StreamingResponse(stream_to_client(response, writer, exit_stack), media_type=content_type, headers=headers)
+
+
+@router.get("/{candidate_id}/resume")
+async def download_candidate_resume(candidate_id: str):
+    """The candidate's most recent resume attachment."""
+    try:
+        attachments = await AsyncZohoJobService.get_candidate_attachments(candidate_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Zoho API Error: {str(e)}")
+    resumes = [attachment for attachment in attachments if (attachment["category"] or "").lower() == "resume"]
+    if not resumes:
+        raise HTTPException(status_code=404, detail="No resume attached")
+    latest = max(resumes, key=lambda attachment: attachment["modified_time"] or "")
+    return await download_candidate_attachment(candidate_id, latest["id"])
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Header, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app.services.events import event_broker, stream_events
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+@router.get("")
+async def read_events(request: Request, job_id: Optional[str] = None, last_event_id: Optional[str] = Header(None)):
+    """Server-Sent Events stream of job and candidate changes.
+
+    Pass `job_id` to only receive that job's candidate events (job-level
+    events are always sent). EventSource resends Last-Event-ID on reconnect
+    and missed events are replayed; a `resync` event means refetch.
+    """
+    try:
+        last_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_id = None
+    subscriber, backlog = event_broker.subscribe(job_id, last_id)
+    return StreamingResponse(
+        stream_events(subscriber, backlog, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
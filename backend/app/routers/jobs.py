@@ -1,74 +1,205 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+import logging
+from datetime import date
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from sqlmodel import Session
-from app.database import engine
+from app.database import get_session
 from app.models.job import JobPosting
-from app.services.zoho_jobs import ZohoJobService
+from app.models.candidate import BulkStatusUpdate
+from app.models.schemas import CandidateProfile, CandidateSummary, CandidateWithDetails, JobDetail, JobSummary
+from app.services.zoho_jobs import map_candidate_profile, map_job_detail
+from app.services.zoho_jobs_async import AsyncZohoJobService
+from app.services import mirror, outbox, tenants
+from app.services.http_cache import cache_control, conditional_json
+from app.services.job_query import JobQuery
+from app.services.serialization import dumps, serialize
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
-@router.post("/", response_model=dict)
-def create_job(job: JobPosting):
+@router.post("/", response_model=dict, status_code=202)
+async def create_job(job: JobPosting, idempotency_key: Optional[str] = Header(None), session: Session = Depends(get_session)):
+    # Table models skip validation on construction; this parses dates etc.
+    job = JobPosting.model_validate(job, from_attributes=True)
+    if not tenants.is_default():
+        # The outbox and job table belong to the default tenant's mirror, so
+        # other tenants create the opening in Zoho directly (no portal posting)
+        try:
+            zoho_id = await AsyncZohoJobService.create_job(job.model_dump(mode="json"))
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"id": zoho_id, "db_id": None, "status_url": None, "message": "Job created in Zoho Recruit"}
+
+    job.status = "Publishing"
     try:
-        # 1. Create in Zoho Recruit
-        zoho_id = ZohoJobService.create_job(job.model_dump())
-        
-        # 2. Persist to PostgreSQL
-        with Session(engine) as session:
-            job.zoho_id = zoho_id
-            session.add(job)
-            session.commit()
-            session.refresh(job)
-            
-        return {
-            "id": zoho_id, 
-            "db_id": job.id,
-            "message": "Job created in Zoho Recruit and persisted to PostgreSQL"
-        }
+        # The job and its outbox row are committed together; the outbox worker
+        # creates it in Zoho and on the portals in the background.
+        job, created = await run_in_threadpool(outbox.enqueue_job, session, job, idempotency_key)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/", response_model=List[dict])
-def read_jobs():
+    return {
+        "id": job.zoho_id,
+        "db_id": job.id,
+        "status_url": f"/jobs/publish/{job.id}",
+        "message": "Job queued for publishing to Zoho Recruit" if created else "Job already submitted with this Idempotency-Key",
+    }
+
+@router.get("/publish/{db_id}", response_model=dict)
+async def read_publish_status(db_id: int, session: Session = Depends(get_session)):
+    status = await run_in_threadpool(outbox.publish_status, session, db_id) if tenants.is_default() else None
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return status
+
+def _job_summaries(jobs):
+    # Only the fields that are set, so ?fields= selections stay as requested
+    return serialize(jobs, List[JobSummary], exclude_unset=True)
+
+async def _stream_pages(first_page, pages, ndjson: bool):
+    """Serializes job pages as they arrive: NDJSON lines or one chunked JSON array."""
+    first_page = _job_summaries(first_page)
+    if ndjson:
+        yield b"".join(dumps(job) + b"\n" for job in first_page)
+        async for page in pages:
+            yield b"".join(dumps(job) + b"\n" for job in _job_summaries(page))
+        return
+
+    yield b"[" + b",".join(dumps(job) for job in first_page)
+    separator = b"," if first_page else b""
+    async for page in pages:
+        if page:
+            yield separator + b",".join(dumps(job) for job in _job_summaries(page))
+            separator = b","
+    yield b"]"
+
+@router.get("/", response_model=List[JobSummary])
+async def read_jobs(
+    request: Request,
+    ids: Optional[str] = None,
+    status: Optional[str] = None,
+    client: Optional[str] = None,
+    location: Optional[str] = None,
+    industry: Optional[str] = None,
+    target_date_from: Optional[date] = None,
+    target_date_to: Optional[date] = None,
+    sort: Optional[str] = Query(None, description="Sort key, prefix with '-' for descending"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,status"),
+    session: Session = Depends(get_session),
+):
+    try:
+        query = JobQuery.from_params(
+            ids=ids, fields=fields, status=status, client=client, location=location, industry=industry,
+            target_date_from=target_date_from, target_date_to=target_date_to, sort=sort,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Served from the local mirror once the sync engine has completed a pass
+    jobs = await run_in_threadpool(mirror.load_jobs, session, query)
+    if jobs is not None:
+        return conditional_json(request, jobs, List[JobSummary], exclude_unset=True)
+
+    if not query.is_empty():
+        try:
+            return conditional_json(request, await AsyncZohoJobService.find_jobs(query), List[JobSummary], exclude_unset=True)
+        except Exception as e:
+            logger.warning("Zoho fetch failed: %s", e)
+            raise HTTPException(status_code=500, detail=f"Zoho API Error: {str(e)}")
+
+    pages = AsyncZohoJobService.stream_job_pages()
+    try:
+        # Fetch the first page up front so Zoho errors still map to a 500
+        first_page = await pages.__anext__()
+    except StopAsyncIteration:
+        first_page = []
+    except Exception as e:
+        logger.warning("Zoho fetch failed: %s", e)
+        raise HTTPException(status_code=500, detail=f"Zoho API Error: {str(e)}")
+
+    ndjson = "application/x-ndjson" in request.headers.get("accept", "")
+    media_type = "application/x-ndjson" if ndjson else "application/json"
+    # Streamed, so there is no body to hash for an ETag up front
+    return StreamingResponse(
+        _stream_pages(first_page, pages, ndjson),
+        media_type=media_type,
+        headers={"Cache-Control": cache_control()},
+    )
+
+@router.get("/{job_id}/candidates", response_model=List[CandidateSummary])
+async def read_job_candidates(job_id: str, request: Request, session: Session = Depends(get_session)):
+    return conditional_json(request, await _load_candidates(session, job_id), List[CandidateSummary])
+
+async def _load_candidates(session: Session, job_id: str):
+    candidates = await run_in_threadpool(mirror.load_job_candidates, session, job_id)
+    if candidates is not None:
+        return candidates
     try:
-        jobs = ZohoJobService.get_jobs()
-        return jobs
+        return await AsyncZohoJobService.get_associated_candidates(job_id)
     except Exception as e:
-        print(f"DEBUG: Zoho Fetch Error in router: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Zoho API Error: {str(e)}")
 
-@router.get("/{job_id}/candidates", response_model=List[dict])
-def read_job_candidates(job_id: str):
-    return ZohoJobService.get_associated_candidates(job_id)
+@router.get("/{job_id}/candidates/details", response_model=List[CandidateWithDetails])
+async def read_job_candidates_with_details(job_id: str, session: Session = Depends(get_session)):
+    """Every candidate of the job with profile details, in one request."""
+    candidates = await _load_candidates(session, job_id)
+    try:
+        return await AsyncZohoJobService.hydrate_candidates(candidates)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Zoho API Error: {str(e)}")
 
-@router.get("/{job_id}", response_model=dict)
-def read_job(job_id: str):
-    job = ZohoJobService.get_job_details(job_id)
+@router.get("/{job_id}", response_model=JobDetail)
+async def read_job(job_id: str, request: Request):
+    job = await AsyncZohoJobService.get_job_details(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job
-@router.get("/{job_id}/candidates/{candidate_id}", response_model=dict)
-def read_candidate_details(job_id: str, candidate_id: str):
-    candidate = ZohoJobService.get_candidate_details(candidate_id)
+    return conditional_json(request, map_job_detail(job), JobDetail)
+@router.get("/{job_id}/candidates/{candidate_id}", response_model=CandidateProfile)
+async def read_candidate_details(job_id: str, candidate_id: str):
+    candidate = await AsyncZohoJobService.get_candidate_details(candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
-    return candidate
+    return map_candidate_profile(candidate)
+
+@router.patch("/{job_id}/candidates/status", response_model=dict)
+async def bulk_update_candidate_status(job_id: str, bulk_update: BulkStatusUpdate, session: Session = Depends(get_session)):
+    if not bulk_update.updates:
+        raise HTTPException(status_code=400, detail="No updates in request body")
+
+    updates = [(update.candidate_id, update.status) for update in bulk_update.updates]
+    try:
+        results = await AsyncZohoJobService.bulk_update_candidate_status(job_id, updates)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    updated = {result["candidate_id"]: result["status"] for result in results if result["success"]}
+    await run_in_threadpool(mirror.mark_candidate_statuses, session, job_id, updated)
+    return {
+        "updated": len(updated),
+        "failed": len(results) - len(updated),
+        "results": results,
+    }
 
 @router.patch("/{job_id}/candidates/{candidate_id}/status", response_model=dict)
-def update_candidate_status(job_id: str, candidate_id: str, status_update: dict):
+async def update_candidate_status(job_id: str, candidate_id: str, status_update: dict, session: Session = Depends(get_session)):
     status = status_update.get("status")
     if not status:
         raise HTTPException(status_code=400, detail="Missing status in request body")
     
     try:
-        ZohoJobService.update_candidate_status(job_id, candidate_id, status)
+        await AsyncZohoJobService.update_candidate_status(job_id, candidate_id, status)
+        await run_in_threadpool(mirror.mark_candidate_status, session, job_id, candidate_id, status)
         return {"message": "Status updated successfully", "status": status}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 @router.patch("/{job_id}/archive", response_model=dict)
-def archive_job(job_id: str):
+async def archive_job(job_id: str, session: Session = Depends(get_session)):
     try:
-        ZohoJobService.archive_job(job_id)
+        await AsyncZohoJobService.archive_job(job_id)
+        await run_in_threadpool(mirror.mark_job_status, session, job_id, "Cancelled")
         return {"message": "Job archived successfully", "id": job_id}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,54 @@
+from fastapi import APIRouter
+from app.database import pool_stats
+from app.services.zoho_http import zoho_http_clients, async_zoho_http_clients
+from app.services.cache import cache_stats
+from app.services.sync import sync_engine
+from app.services.zoho_scheduler import zoho_schedulers
+from app.services.outbox import outbox_worker
+from app.services.portal_engine import portal_engine
+from app.services.events import event_broker
+from app.services.webhooks import webhook_processor
+from app.services.attachments import attachment_cache
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+@router.get("/http", response_model=dict)
+def read_http_stats():
+    # Pools and rate budgets are per tenant; X-Tenant picks which one
+    return {"sync": zoho_http_clients.get().stats(), "async": async_zoho_http_clients.get().stats()}
+
+@router.get("/cache", response_model=dict)
+def read_cache_stats():
+    return cache_stats()
+
+@router.get("/sync", response_model=dict)
+def read_sync_stats():
+    return sync_engine.stats()
+
+@router.get("/scheduler", response_model=dict)
+def read_scheduler_stats():
+    return zoho_schedulers.get().stats()
+
+@router.get("/outbox", response_model=dict)
+def read_outbox_stats():
+    return outbox_worker.stats()
+
+@router.get("/portals", response_model=dict)
+def read_portal_stats():
+    return portal_engine.stats()
+
+@router.get("/db", response_model=dict)
+def read_db_stats():
+    return pool_stats()
+
+@router.get("/events", response_model=dict)
+def read_event_stats():
+    return event_broker.stats()
+
+@router.get("/webhooks", response_model=dict)
+def read_webhook_stats():
+    return webhook_processor.stats()
+
+@router.get("/attachments", response_model=dict)
+def read_attachment_stats():
+    return attachment_cache.stats()
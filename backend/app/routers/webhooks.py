@@ -0,0 +1,47 @@
+import json
+from urllib.parse import parse_qsl
+from fastapi import APIRouter, Header, HTTPException, Request
+from typing import Optional
+from app.services import tenants, webhooks
+from app.services.webhooks import webhook_processor
+
+router = APIRouter(prefix="/webhooks", tags=["webhooks"])
+
+@router.post("/zoho", response_model=dict, status_code=202)
+async def receive_zoho_notification(
+    request: Request,
+    token: Optional[str] = None,
+    x_webhook_token: Optional[str] = Header(None),
+    x_webhook_signature: Optional[str] = Header(None),
+):
+    """Zoho Recruit notifications for JobOpenings / Candidates.
+
+    Only queues the change; the records are fetched and applied in the
+    background, so Zoho gets its response straight away.
+    """
+    # Notifications feed the mirror, which only the default tenant has
+    if not webhooks.ZOHO_WEBHOOKS_ENABLED or not tenants.is_default():
+        raise HTTPException(status_code=404, detail="Zoho webhooks are not configured")
+
+    body = await request.body()
+    try:
+        if "application/x-www-form-urlencoded" in request.headers.get("content-type", ""):
+            payload = dict(parse_qsl(body.decode()))
+        else:
+            payload = json.loads(body or b"{}")
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Malformed notification body")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Malformed notification body")
+
+    if not webhooks.verify(body, payload.get("token") or x_webhook_token or token, x_webhook_signature):
+        raise HTTPException(status_code=401, detail="Invalid webhook token or signature")
+
+    try:
+        module, operation, ids = webhooks.parse_notification(payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Zoho redelivers a notification when it misses our response
+    queued = webhook_processor.submit(module, operation, ids, webhooks.redelivery_key(payload))
+    return {"queued": queued, "module": module, "operation": operation, "ids": len(ids)}
@@ -0,0 +1,297 @@
+import logging
+import os
+import threading
+from typing import Optional
+from dotenv import load_dotenv
+from sqlalchemy import func, update
+from sqlmodel import Session, select
+from app.models.analytics import AnalyticsState, CandidateStatusChange, PipelineCandidate, PipelineStageStats, PipelineStatusStats
+from app.models.job import JobPosting
+from app.services import mirror
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Pipeline analytics for the mirrored jobs. Triggers on candidate append
+# every association, status change and removal to candidatestatuschange
+# (in the same transaction as the mirror write). refresh() folds the rows
+# added since its last run into small aggregate tables - per job and status,
+# and per job and funnel stage - so reading a dashboard costs the same
+# whatever the number of candidates.
+#
+# Alembic batch operations on candidate recreate the table and drop its
+# triggers; a migration doing that must call create_status_log again.
+
+# Funnel stages in order, with the Zoho statuses that count as reaching
+# them; the grouping of the dashboard's Kanban board. Other statuses
+# (rejections, Archived) are outcomes and don't move a candidate along.
+PIPELINE_STAGES = [
+    ("Screening", ["In Review", "Qualified", "Junk candidate", "Associated", "Applied"]),
+    ("Submissions", ["Submitted to client", "Approved by client"]),
+    ("Interview", ["Interview to be scheduled", "Interview-Scheduled", "Interview in progress", "On hold", "Rejected hirable"]),
+    ("Offered", ["Offer planned", "Offer accepted", "Offer made", "Offer declined", "Offer withdrawn"]),
+    ("Hired", ["Hired", "Joined", "No show", "Converted - Employee", "Converted - Temp", "Hired by client", "Hired-for-Interview", "Forward-to-Onboarding"]),
+]
+STAGE_POSITIONS = {status: position for position, (_, statuses) in enumerate(PIPELINE_STAGES, 1) for status in statuses}
+# Change-log rows folded per transaction
+ANALYTICS_BATCH_SIZE = int(os.getenv("ANALYTICS_BATCH_SIZE", "1000"))
+
+STATE_NAME = "pipeline"
+
+_LOG_COLUMNS = "candidatestatuschange (job_id, candidate_zoho_id, from_status, to_status, changed_at)"
+# Six fractional digits, as SQLAlchemy writes datetimes to SQLite
+_SQLITE_NOW = "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+SQLITE_DDL = [
+    f"""CREATE TRIGGER IF NOT EXISTS candidate_status_insert AFTER INSERT ON candidate WHEN NEW.zoho_id IS NOT NULL BEGIN
+        INSERT INTO {_LOG_COLUMNS} VALUES (NEW.job_id, NEW.zoho_id, NULL, NEW.status, {_SQLITE_NOW});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS candidate_status_update AFTER UPDATE OF status ON candidate
+        WHEN NEW.zoho_id IS NOT NULL AND OLD.status IS NOT NEW.status BEGIN
+        INSERT INTO {_LOG_COLUMNS} VALUES (NEW.job_id, NEW.zoho_id, OLD.status, NEW.status, {_SQLITE_NOW});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS candidate_status_delete AFTER DELETE ON candidate WHEN OLD.zoho_id IS NOT NULL BEGIN
+        INSERT INTO {_LOG_COLUMNS} VALUES (OLD.job_id, OLD.zoho_id, OLD.status, NULL, {_SQLITE_NOW});
+    END""",
+    f"INSERT OR IGNORE INTO analyticsstate (name, last_change_id) VALUES ('{STATE_NAME}', 0)",
+]
+
+POSTGRES_DDL = [
+    f"""CREATE OR REPLACE FUNCTION candidate_status_log() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO {_LOG_COLUMNS} VALUES (NEW.job_id, NEW.zoho_id, NULL, NEW.status, now());
+        ELSIF TG_OP = 'UPDATE' THEN
+            INSERT INTO {_LOG_COLUMNS} VALUES (NEW.job_id, NEW.zoho_id, OLD.status, NEW.status, now());
+        ELSE
+            INSERT INTO {_LOG_COLUMNS} VALUES (OLD.job_id, OLD.zoho_id, OLD.status, NULL, now());
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS candidate_status_insert ON candidate",
+    """CREATE TRIGGER candidate_status_insert AFTER INSERT ON candidate
+        FOR EACH ROW WHEN (NEW.zoho_id IS NOT NULL) EXECUTE FUNCTION candidate_status_log()""",
+    "DROP TRIGGER IF EXISTS candidate_status_update ON candidate",
+    """CREATE TRIGGER candidate_status_update AFTER UPDATE OF status ON candidate
+        FOR EACH ROW WHEN (NEW.zoho_id IS NOT NULL AND OLD.status IS DISTINCT FROM NEW.status) EXECUTE FUNCTION candidate_status_log()""",
+    "DROP TRIGGER IF EXISTS candidate_status_delete ON candidate",
+    """CREATE TRIGGER candidate_status_delete AFTER DELETE ON candidate
+        FOR EACH ROW WHEN (OLD.zoho_id IS NOT NULL) EXECUTE FUNCTION candidate_status_log()""",
+    f"INSERT INTO analyticsstate (name, last_change_id) VALUES ('{STATE_NAME}', 0) ON CONFLICT DO NOTHING",
+]
+
+DROP_DDL = {
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS candidate_status_insert",
+        "DROP TRIGGER IF EXISTS candidate_status_update",
+        "DROP TRIGGER IF EXISTS candidate_status_delete",
+    ],
+    "postgresql": [
+        "DROP TRIGGER IF EXISTS candidate_status_insert ON candidate",
+        "DROP TRIGGER IF EXISTS candidate_status_update ON candidate",
+        "DROP TRIGGER IF EXISTS candidate_status_delete ON candidate",
+        "DROP FUNCTION IF EXISTS candidate_status_log()",
+    ],
+}
+
+
+class UnknownJob(Exception):
+    pass
+
+
+def create_status_log(connection):
+    """Installs the candidate triggers that write the change log. Idempotent."""
+    statements = {"sqlite": SQLITE_DDL, "postgresql": POSTGRES_DDL}.get(connection.dialect.name)
+    if statements is None:
+        raise Exception(f"Pipeline analytics are not supported on {connection.dialect.name}")
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def drop_status_log(connection):
+    for statement in DROP_DDL.get(connection.dialect.name, []):
+        connection.exec_driver_sql(statement)
+
+
+_fold_lock = threading.Lock()
+
+
+def refresh(session: Session) -> int:
+    """Folds change-log rows added since the last refresh into the aggregates.
+
+    Returns how many rows were folded. Commits.
+    """
+    folded = 0
+    with _fold_lock:
+        while True:
+            count = _fold_batch(session)
+            folded += count
+            if count < ANALYTICS_BATCH_SIZE:
+                if folded:
+                    logger.debug("Folded %d candidate status changes", folded)
+                return folded
+
+
+def _fold_batch(session: Session) -> int:
+    # A no-op write first: it takes the row lock on Postgres and the write
+    # lock on SQLite, so other processes folding at once wait here instead
+    # of folding the same rows twice
+    session.execute(update(AnalyticsState).where(AnalyticsState.name == STATE_NAME).values(last_change_id=AnalyticsState.last_change_id))
+    state = session.get(AnalyticsState, STATE_NAME, populate_existing=True)
+    changes = session.exec(
+        select(CandidateStatusChange)
+        .where(CandidateStatusChange.id > state.last_change_id)
+        .order_by(CandidateStatusChange.id)
+        .limit(ANALYTICS_BATCH_SIZE)
+    ).all()
+    if not changes:
+        session.rollback()
+        return 0
+
+    candidates = {}
+    status_stats = {}
+    stage_stats = {}
+
+    def candidate_row(job_id, zoho_id):
+        key = (job_id, zoho_id)
+        if key not in candidates:
+            candidates[key] = session.get(PipelineCandidate, key)
+        return candidates[key]
+
+    def status_row(job_id, status):
+        key = (job_id, status)
+        if key not in status_stats:
+            status_stats[key] = session.get(PipelineStatusStats, key) or PipelineStatusStats(job_id=job_id, status=status)
+            session.add(status_stats[key])
+        return status_stats[key]
+
+    def stage_row(job_id, stage):
+        key = (job_id, stage)
+        if key not in stage_stats:
+            stage_stats[key] = session.get(PipelineStageStats, key) or PipelineStageStats(job_id=job_id, stage=stage)
+            session.add(stage_stats[key])
+        return stage_stats[key]
+
+    for change in changes:
+        candidate = candidate_row(change.job_id, change.candidate_zoho_id)
+        if candidate is not None and candidate.status is not None:
+            leaving = status_row(change.job_id, candidate.status)
+            leaving.current -= 1
+            leaving.exited += 1
+            leaving.seconds_in_status += max(0.0, (change.changed_at - candidate.entered_at).total_seconds())
+        if candidate is None:
+            candidate = PipelineCandidate(job_id=change.job_id, candidate_zoho_id=change.candidate_zoho_id, entered_at=change.changed_at)
+            candidates[(change.job_id, change.candidate_zoho_id)] = candidate
+            session.add(candidate)
+        candidate.status = change.to_status
+        candidate.entered_at = change.changed_at
+        if change.to_status is None:
+            continue
+
+        entering = status_row(change.job_id, change.to_status)
+        entering.current += 1
+        entering.entered += 1
+        position = STAGE_POSITIONS.get(change.to_status, 0)
+        if position > candidate.furthest_stage:
+            # Jumping ahead counts as passing through the stages in between
+            for stage, _ in PIPELINE_STAGES[candidate.furthest_stage:position]:
+                stage_row(change.job_id, stage).reached += 1
+            candidate.furthest_stage = position
+
+    state.last_change_id = changes[-1].id
+    session.commit()
+    return len(changes)
+
+
+def pending_changes(session: Session) -> int:
+    state = session.get(AnalyticsState, STATE_NAME)
+    last_change_id = state.last_change_id if state else 0
+    return session.exec(select(func.count()).select_from(CandidateStatusChange).where(CandidateStatusChange.id > last_change_id)).one()
+
+
+def _rate(part: int, whole: int):
+    return round(part / whole, 3) if whole else None
+
+
+def load_pipeline(session: Session, job_zoho_id: Optional[str] = None) -> Optional[dict]:
+    """Status counts, time in status and funnel conversion, for one job or all.
+
+    None until the mirror has completed its first sync.
+    """
+    if not mirror._is_ready(session):
+        return None
+    refresh(session)
+
+    status_query = select(
+        PipelineStatusStats.status,
+        func.sum(PipelineStatusStats.current),
+        func.sum(PipelineStatusStats.entered),
+        func.sum(PipelineStatusStats.exited),
+        func.sum(PipelineStatusStats.seconds_in_status),
+    ).group_by(PipelineStatusStats.status)
+    stage_query = select(PipelineStageStats.stage, func.sum(PipelineStageStats.reached)).group_by(PipelineStageStats.stage)
+    if job_zoho_id:
+        job_id = session.exec(select(JobPosting.id).where(JobPosting.zoho_id == job_zoho_id)).first()
+        if job_id is None:
+            raise UnknownJob(f"Job {job_zoho_id} is not in the mirror")
+        status_query = status_query.where(PipelineStatusStats.job_id == job_id)
+        stage_query = stage_query.where(PipelineStageStats.job_id == job_id)
+
+    statuses = []
+    stage_current = {}
+    for status, current, entered, exited, seconds in session.exec(status_query).all():
+        position = STAGE_POSITIONS.get(status, 0)
+        stage = PIPELINE_STAGES[position - 1][0] if position else None
+        stage_current[stage] = stage_current.get(stage, 0) + current
+        statuses.append({
+            "status": status,
+            "stage": stage,
+            "current": current,
+            "entered": entered,
+            "exited": exited,
+            "avg_days_in_status": round(seconds / exited / 86400, 2) if exited else None,
+        })
+    # Funnel order, then outcomes
+    statuses.sort(key=lambda row: (STAGE_POSITIONS.get(row["status"]) or len(PIPELINE_STAGES) + 1, row["status"]))
+
+    reached = dict(session.exec(stage_query).all())
+    funnel = []
+    first = previous = None
+    for stage, _ in PIPELINE_STAGES:
+        count = reached.get(stage, 0)
+        funnel.append({
+            "stage": stage,
+            "current": stage_current.get(stage, 0),
+            "reached": count,
+            "conversion": _rate(count, previous) if previous is not None else None,
+            "conversion_from_start": _rate(count, first) if first is not None else None,
+        })
+        first = count if first is None else first
+        previous = count
+
+    result = {
+        "job_id": job_zoho_id,
+        "total": sum(row["current"] for row in statuses),
+        "statuses": statuses,
+        "funnel": funnel,
+    }
+    if not job_zoho_id:
+        result["jobs"] = _job_counts(session)
+    return result
+
+
+def _job_counts(session: Session):
+    rows = session.exec(
+        select(JobPosting.zoho_id, JobPosting.title, PipelineStatusStats.status, PipelineStatusStats.current)
+        .join(PipelineStatusStats, PipelineStatusStats.job_id == JobPosting.id)
+        .where(PipelineStatusStats.current > 0)
+        .order_by(JobPosting.id)
+    ).all()
+    jobs = {}
+    for zoho_id, title, status, current in rows:
+        job = jobs.setdefault(zoho_id, {"job_id": zoho_id, "title": title, "total": 0, "counts": {}})
+        job["counts"][status] = current
+        job["total"] += current
+    return list(jobs.values())
@@ -0,0 +1,232 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Downloaded attachments are kept on disk, keyed by the SHA-256 of their
+# content, so reopening a resume (or the same file attached to several
+# candidates) is served locally. Least recently used files go first.
+ATTACHMENT_CACHE_DIR = Path(os.getenv("ATTACHMENT_CACHE_DIR") or Path(__file__).resolve().parents[2] / "attachment_cache")
+ATTACHMENT_CACHE_MAX_MB = float(os.getenv("ATTACHMENT_CACHE_MAX_MB", "512"))
+ATTACHMENT_CHUNK_SIZE = int(os.getenv("ATTACHMENT_CHUNK_SIZE", str(64 * 1024)))
+# Bytes gathered before each cache write, which runs off the event loop
+ATTACHMENT_WRITE_BATCH = int(os.getenv("ATTACHMENT_WRITE_BATCH", str(1024 * 1024)))
+
+
+class AttachmentCache:
+    """Size-bounded, content-addressed file store with LRU eviction.
+
+    blobs/<sha[:2]>/<sha> holds each distinct file once; refs/<key>.json maps
+    a (tenant, candidate, attachment id) to its blob plus file name and type. A
+    blob's mtime is its last use, which is what eviction orders by, so the
+    store survives restarts without a separate index. Refs whose blob was
+    evicted are dropped when next looked up.
+    """
+
+    def __init__(self, root: Path = ATTACHMENT_CACHE_DIR, max_bytes: int = int(ATTACHMENT_CACHE_MAX_MB * 1024 * 1024)):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total = None
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.deduplicated = 0
+        self.evictions = 0
+
+    def _ref_path(self, tenant_id: str, candidate_id: str, attachment_id: str):
+        key = hashlib.sha1(f"{tenant_id}:{candidate_id}:{attachment_id}".encode()).hexdigest()
+        return self.root / "refs" / f"{key}.json"
+
+    def _blob_path(self, digest: str):
+        return self.root / "blobs" / digest[:2] / digest
+
+    def _blobs(self):
+        blobs_dir = self.root / "blobs"
+        return [path for path in blobs_dir.glob("*/*") if path.is_file()] if blobs_dir.exists() else []
+
+    def _ensure_loaded(self):
+        # Called with the lock held
+        if self._total is None:
+            (self.root / "tmp").mkdir(parents=True, exist_ok=True)
+            for leftover in (self.root / "tmp").iterdir():
+                # Downloads cut short by a crash; recent ones may belong to
+                # another worker process sharing the directory
+                if time.time() - leftover.stat().st_mtime > 3600:
+                    leftover.unlink(missing_ok=True)
+            self._total = sum(path.stat().st_size for path in self._blobs())
+
+    def lookup(self, tenant_id: str, candidate_id: str, attachment_id: str) -> Optional[dict]:
+        """Metadata of a cached attachment including its blob `path`, or None."""
+        ref_path = self._ref_path(tenant_id, candidate_id, attachment_id)
+        with self._lock:
+            self._ensure_loaded()
+            try:
+                meta = json.loads(ref_path.read_text())
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+            blob = self._blob_path(meta["sha256"])
+            try:
+                # Marks it recently used
+                os.utime(blob)
+            except OSError:
+                ref_path.unlink(missing_ok=True)
+                self.misses += 1
+                return None
+            self.hits += 1
+        return {**meta, "path": blob}
+
+    def writer(self, tenant_id: str, candidate_id: str, attachment_id: str, meta: dict):
+        with self._lock:
+            self._ensure_loaded()
+        return _BlobWriter(self, self._ref_path(tenant_id, candidate_id, attachment_id), meta)
+
+    def _commit(self, tmp_path: Path, digest: str, size: int, ref_path: Path, meta: dict):
+        blob = self._blob_path(digest)
+        with self._lock:
+            if blob.exists():
+                # Same content under another attachment id
+                tmp_path.unlink(missing_ok=True)
+                os.utime(blob)
+                self.deduplicated += 1
+            else:
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, blob)
+                self._total += size
+                self.stored += 1
+            ref_path.parent.mkdir(parents=True, exist_ok=True)
+            ref_path.write_text(json.dumps({**meta, "sha256": digest, "size": size}))
+            self._evict(keep=blob)
+
+    def _evict(self, keep: Path):
+        # Called with the lock held; trims to 90% so every new file doesn't evict again
+        if self._total <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        blobs = sorted(self._blobs(), key=lambda path: path.stat().st_mtime)
+        # Other worker processes may have added or evicted files meanwhile
+        self._total = sum(blob.stat().st_size for blob in blobs)
+        for blob in blobs:
+            if self._total <= target:
+                break
+            if blob == keep:
+                continue
+            size = blob.stat().st_size
+            blob.unlink(missing_ok=True)
+            self._total -= size
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            self._ensure_loaded()
+            lookups = self.hits + self.misses
+            return {
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "stored": self.stored,
+                "deduplicated": self.deduplicated,
+                "evictions": self.evictions,
+            }
+
+
+class _BlobWriter:
+    """Spools one download to a temp file while hashing it.
+
+    commit() moves it into the store once the whole body has arrived;
+    abort() discards it, e.g. when the client disconnects mid-download.
+    Blocking: the relay calls it through asyncio.to_thread, and the lock
+    keeps an abort from racing a write still running in its thread.
+    """
+
+    def __init__(self, cache: AttachmentCache, ref_path: Path, meta: dict):
+        self.cache = cache
+        self.ref_path = ref_path
+        self.meta = meta
+        self.tmp_path = cache.root / "tmp" / uuid.uuid4().hex
+        self._file = None
+        self._closed = False
+        self._hash = hashlib.sha256()
+        self._lock = threading.Lock()
+        self.size = 0
+
+    def write(self, data: bytes):
+        with self._lock:
+            if self._closed:
+                return
+            self.size += len(data)
+            if self.size > self.cache.max_bytes:
+                # Larger than the whole cache; just stream it
+                self._discard()
+                return
+            if self._file is None:
+                self._file = open(self.tmp_path, "wb")
+            self._hash.update(data)
+            self._file.write(data)
+
+    def commit(self, data: bytes = b""):
+        """Writes the last `data` and adds the file to the store."""
+        self.write(data)
+        with self._lock:
+            if self._closed:
+                return
+            if self._file is None:
+                # Empty body
+                self._file = open(self.tmp_path, "wb")
+            self._file.close()
+            self._file = None
+            self._closed = True
+        self.cache._commit(self.tmp_path, self._hash.hexdigest(), self.size, self.ref_path, self.meta)
+
+    def abort(self):
+        with self._lock:
+            self._discard()
+
+    def _discard(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._closed = True
+        self.tmp_path.unlink(missing_ok=True)
+
+
+attachment_cache = AttachmentCache()
+
+
+async def stream_to_client(response, writer: _BlobWriter, exit_stack):
+    """Relays Zoho's download chunk by chunk, filling the disk cache on the way.
+
+    Only a complete body is committed to the cache. `exit_stack` holds the
+    open Zoho response and is closed when the relay ends for any reason.
+    """
+    complete = False
+    batch = []
+    batched = 0
+    try:
+        async for chunk in response.aiter_bytes(ATTACHMENT_CHUNK_SIZE):
+            batch.append(chunk)
+            batched += len(chunk)
+            if batched >= ATTACHMENT_WRITE_BATCH:
+                # File I/O and hashing stay off the event loop
+                await asyncio.to_thread(writer.write, b"".join(batch))
+                batch = []
+                batched = 0
+            yield chunk
+        complete = True
+    finally:
+        if complete:
+            await asyncio.to_thread(writer.commit, b"".join(batch))
+        else:
+            await asyncio.to_thread(writer.abort)
+        await exit_stack.aclose()
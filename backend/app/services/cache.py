@@ -0,0 +1,216 @@
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dotenv import load_dotenv
+from app.services.tenants import current_tenant
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Per-entity freshness in seconds; entries past their TTL are still served for
+# ZOHO_CACHE_STALE_TTL more seconds while a background refresh runs.
+ZOHO_CACHE_JOBS_TTL = float(os.getenv("ZOHO_CACHE_JOBS_TTL", "30"))
+ZOHO_CACHE_JOB_TTL = float(os.getenv("ZOHO_CACHE_JOB_TTL", "60"))
+ZOHO_CACHE_CANDIDATES_TTL = float(os.getenv("ZOHO_CACHE_CANDIDATES_TTL", "15"))
+ZOHO_CACHE_CANDIDATE_TTL = float(os.getenv("ZOHO_CACHE_CANDIDATE_TTL", "60"))
+ZOHO_CACHE_STALE_TTL = float(os.getenv("ZOHO_CACHE_STALE_TTL", "120"))
+ZOHO_CACHE_MAX_ENTRIES = int(os.getenv("ZOHO_CACHE_MAX_ENTRIES", "1000"))
+
+FRESH = "fresh"
+STALE = "stale"
+
+
+def _scoped(key):
+    """Prefixes keys with the current tenant; the default tenant keeps bare keys."""
+    tenant = current_tenant()
+    return key if tenant.is_default else (tenant.id, key)
+
+
+class TTLCache:
+    """Thread-safe LRU cache with a fresh TTL and a stale-while-revalidate window.
+
+    Keys are scoped to the current tenant, so orgs never see each other's entries.
+    """
+
+    def __init__(self, name: str, ttl: float, max_size: int = ZOHO_CACHE_MAX_ENTRIES, stale_ttl: float = ZOHO_CACHE_STALE_TTL):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def lookup(self, key):
+        """Returns (state, value) where state is FRESH, STALE or None on a miss."""
+        key = _scoped(key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, None
+            value, fresh_until, stale_until = entry
+            if now < fresh_until:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return FRESH, value
+            if now < stale_until:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                return STALE, value
+            del self._entries[key]
+            self.misses += 1
+            return None, None
+
+    def set(self, key, value):
+        key = _scoped(key)
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (value, now + self.ttl, now + self.ttl + self.stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key=None):
+        """Drops one key, or every entry when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(_scoped(key), None)
+            self.invalidations += 1
+
+    def begin_refresh(self, key):
+        """Claims the background refresh for key; False if one is already running."""
+        key = _scoped(key)
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key):
+        with self._lock:
+            self._refreshing.discard(_scoped(key))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+            }
+
+
+def cached(cache: TTLCache, key, loader):
+    """Sync read-through: stale entries are returned at once and refreshed on a thread."""
+    state, value = cache.lookup(key)
+    if state == FRESH:
+        return value
+    if state == STALE:
+        if cache.begin_refresh(key):
+            # Copy the context so the refresh runs against the same tenant
+            context = contextvars.copy_context()
+            threading.Thread(target=context.run, args=(_refresh, cache, key, loader), daemon=True).start()
+        return value
+    value = loader()
+    if value is not None:
+        cache.set(key, value)
+    return value
+
+
+def _refresh(cache: TTLCache, key, loader):
+    try:
+        value = loader()
+        if value is not None:
+            cache.set(key, value)
+    except Exception as e:
+        logger.warning("Background refresh of %s[%s] failed: %s", cache.name, key, e)
+    finally:
+        cache.end_refresh(key)
+
+
+# Keep references to background refresh tasks so they are not garbage collected
+_background_tasks = set()
+
+async def cached_async(cache: TTLCache, key, loader):
+    """asyncio read-through: stale entries are returned at once and refreshed in a task."""
+    state, value = cache.lookup(key)
+    if state == FRESH:
+        return value
+    if state == STALE:
+        schedule_refresh_async(cache, key, loader)
+        return value
+    value = await loader()
+    if value is not None:
+        cache.set(key, value)
+    return value
+
+
+def schedule_refresh_async(cache: TTLCache, key, loader):
+    """Starts a background refresh of key unless one is already running."""
+    if cache.begin_refresh(key):
+        task = asyncio.create_task(_refresh_async(cache, key, loader))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+
+async def _refresh_async(cache: TTLCache, key, loader):
+    try:
+        value = await loader()
+        if value is not None:
+            cache.set(key, value)
+    except Exception as e:
+        logger.warning("Background refresh of %s[%s] failed: %s", cache.name, key, e)
+    finally:
+        cache.end_refresh(key)
+
+
+# Caches in front of the Zoho read calls, shared by the sync and async services
+job_list_cache = TTLCache("jobs", ZOHO_CACHE_JOBS_TTL, max_size=16)
+job_cache = TTLCache("job", ZOHO_CACHE_JOB_TTL)
+candidates_cache = TTLCache("candidates", ZOHO_CACHE_CANDIDATES_TTL)
+candidate_cache = TTLCache("candidate", ZOHO_CACHE_CANDIDATE_TTL)
+attachments_cache = TTLCache("attachments", ZOHO_CACHE_CANDIDATE_TTL)
+
+ZOHO_CACHES = [job_list_cache, job_cache, candidates_cache, candidate_cache, attachments_cache]
+
+
+def invalidate_job(job_id=None):
+    """Called after a job is created or archived."""
+    job_list_cache.invalidate()
+    if job_id is not None:
+        job_cache.invalidate(job_id)
+
+
+def invalidate_candidate(job_id: str, candidate_id: str):
+    """Called after a candidate's status changes."""
+    candidates_cache.invalidate(job_id)
+    candidate_cache.invalidate(candidate_id)
+    attachments_cache.invalidate(candidate_id)
+
+
+def cache_stats():
+    caches = {cache.name: cache.stats() for cache in ZOHO_CACHES}
+    # Every fresh or stale hit is a Zoho API call (and credit) we did not spend
+    saved = sum(stats["hits"] + stats["stale_hits"] for stats in caches.values())
+    return {"zoho_calls_saved": saved, "caches": caches}
@@ -0,0 +1,223 @@
+import logging
+import re
+from typing import List, Optional
+from sqlalchemy import column, exc, func, inspect, or_, table, text
+from sqlmodel import Session, select
+from app.models.job import JobPosting
+from app.models.candidate import Candidate
+from app.services import mirror
+
+logger = logging.getLogger(__name__)
+
+# Full-text index over the mirrored candidates (name, email, phone, status
+# and job title), one entry per candidate/job association. It lives in the
+# candidate_search table and is kept current by triggers on candidate and
+# jobposting, so every mirror write (sync, webhooks, status updates) reindexes
+# the affected rows in the same transaction.
+#
+# SQLite uses an FTS5 table keyed by candidate.id; Postgres a tsvector per
+# candidate with a GIN index. Without either (an SQLite build lacking FTS5)
+# search falls back to LIKE over the candidate table.
+#
+# Alembic batch operations on candidate recreate the table and drop its
+# triggers; a migration doing that must call create_search_index again.
+
+SEARCH_TABLE = "candidate_search"
+# Columns the queries use; the table itself is created by the DDL below
+_sqlite_index = table(SEARCH_TABLE, column("rowid"), column("rank"))
+_postgres_index = table(SEARCH_TABLE, column("candidate_id"), column("document"))
+
+
+def _sqlite_digits(expression: str):
+    for separator in " -+().":
+        expression = f"replace({expression}, '{separator}', '')"
+    return expression
+
+
+# Phone numbers are also indexed as bare digits, with and without the country
+# code, so "9876543210" finds "+91 98765 43210"
+_SQLITE_NATIONAL_PHONE = "CASE WHEN {row}.phone LIKE '+% %' THEN substr({row}.phone, instr({row}.phone, ' ') + 1) ELSE '' END"
+_SQLITE_PHONE = (
+    "coalesce({row}.phone, '') || ' ' || "
+    + _sqlite_digits("coalesce({row}.phone, '')") + " || ' ' || " + _sqlite_digits(_SQLITE_NATIONAL_PHONE)
+)
+_SQLITE_VALUES = (
+    "{row}.id, coalesce({row}.first_name, '') || ' ' || coalesce({row}.last_name, ''), {row}.email, "
+    + _SQLITE_PHONE + ", {row}.status, "
+    "(SELECT title FROM jobposting WHERE jobposting.id = {row}.job_id)"
+)
+_SQLITE_INSERT = f"INSERT INTO {SEARCH_TABLE} (rowid, name, email, phone, status, job_title) SELECT " + _SQLITE_VALUES
+
+SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(name, email, phone, status, job_title, prefix='2 3')",
+    f"""CREATE TRIGGER IF NOT EXISTS candidate_search_insert AFTER INSERT ON candidate BEGIN
+        {_SQLITE_INSERT.format(row="NEW")};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS candidate_search_update AFTER UPDATE OF first_name, last_name, email, phone, status, job_id ON candidate BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = OLD.id;
+        {_SQLITE_INSERT.format(row="NEW")};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS candidate_search_delete AFTER DELETE ON candidate BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = OLD.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS candidate_search_job_title AFTER UPDATE OF title ON jobposting BEGIN
+        UPDATE {SEARCH_TABLE} SET job_title = NEW.title WHERE rowid IN (SELECT id FROM candidate WHERE job_id = NEW.id);
+    END""",
+    f"DELETE FROM {SEARCH_TABLE}",
+    _SQLITE_INSERT.format(row="candidate") + " FROM candidate",
+]
+
+# Punctuation becomes a word break, as in SQLite's unicode61 tokenizer
+_PG_DOCUMENT = (
+    "to_tsvector('simple', regexp_replace("
+    "concat_ws(' ', c.first_name, c.last_name, c.email, c.phone, regexp_replace(c.phone, '[^0-9]', '', 'g'), "
+    "regexp_replace(substring(c.phone from '^\\+[0-9]+ (.*)$'), '[^0-9]', '', 'g'), c.status, j.title), "
+    "'[^[:alnum:]]+', ' ', 'g'))"
+)
+
+POSTGRES_DDL = [
+    f"""CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} (
+        candidate_id INTEGER PRIMARY KEY REFERENCES candidate(id) ON DELETE CASCADE,
+        document TSVECTOR NOT NULL
+    )""",
+    f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING gin (document)",
+    f"""CREATE OR REPLACE FUNCTION candidate_search_refresh(candidate_ids INTEGER[]) RETURNS void AS $$
+        INSERT INTO {SEARCH_TABLE} (candidate_id, document)
+        SELECT c.id, {_PG_DOCUMENT} FROM candidate c LEFT JOIN jobposting j ON j.id = c.job_id
+        WHERE c.id = ANY(candidate_ids)
+        ON CONFLICT (candidate_id) DO UPDATE SET document = EXCLUDED.document
+    $$ LANGUAGE sql""",
+    """CREATE OR REPLACE FUNCTION candidate_search_candidate_trigger() RETURNS trigger AS $$
+    BEGIN
+        PERFORM candidate_search_refresh(ARRAY[NEW.id]);
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE OR REPLACE FUNCTION candidate_search_job_trigger() RETURNS trigger AS $$
+    BEGIN
+        PERFORM candidate_search_refresh(ARRAY(SELECT id FROM candidate WHERE job_id = NEW.id));
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS candidate_search_candidate ON candidate",
+    """CREATE TRIGGER candidate_search_candidate AFTER INSERT OR UPDATE OF first_name, last_name, email, phone, status, job_id ON candidate
+        FOR EACH ROW EXECUTE FUNCTION candidate_search_candidate_trigger()""",
+    "DROP TRIGGER IF EXISTS candidate_search_job_title ON jobposting",
+    """CREATE TRIGGER candidate_search_job_title AFTER UPDATE OF title ON jobposting
+        FOR EACH ROW EXECUTE FUNCTION candidate_search_job_trigger()""",
+    "SELECT candidate_search_refresh(ARRAY(SELECT id FROM candidate))",
+]
+
+DROP_DDL = {
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS candidate_search_insert",
+        "DROP TRIGGER IF EXISTS candidate_search_update",
+        "DROP TRIGGER IF EXISTS candidate_search_delete",
+        "DROP TRIGGER IF EXISTS candidate_search_job_title",
+        f"DROP TABLE IF EXISTS {SEARCH_TABLE}",
+    ],
+    "postgresql": [
+        "DROP TRIGGER IF EXISTS candidate_search_candidate ON candidate",
+        "DROP TRIGGER IF EXISTS candidate_search_job_title ON jobposting",
+        "DROP FUNCTION IF EXISTS candidate_search_candidate_trigger()",
+        "DROP FUNCTION IF EXISTS candidate_search_job_trigger()",
+        "DROP FUNCTION IF EXISTS candidate_search_refresh(INTEGER[])",
+        f"DROP TABLE IF EXISTS {SEARCH_TABLE}",
+    ],
+}
+
+# Backend name -> whether the candidate_search table exists, checked once per process
+_index_available = {}
+
+
+def create_search_index(connection):
+    """Creates (or rebuilds) the index and its triggers on `connection`.
+
+    Idempotent. Used by create_db_and_tables for new databases and by the
+    0004 migration for existing ones.
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        statements = SQLITE_DDL
+    elif dialect == "postgresql":
+        statements = POSTGRES_DDL
+    else:
+        logger.warning("No candidate search index for %s; search will use LIKE", dialect)
+        return
+    try:
+        for statement in statements:
+            connection.exec_driver_sql(statement)
+    except exc.OperationalError as e:
+        if "fts5" not in str(e):
+            raise
+        logger.warning("SQLite was built without FTS5; candidate search will use LIKE")
+    _index_available.clear()
+
+
+def drop_search_index(connection):
+    for statement in DROP_DDL.get(connection.dialect.name, []):
+        connection.exec_driver_sql(statement)
+    _index_available.clear()
+
+
+def _has_index(session: Session):
+    bind = session.get_bind()
+    dialect = bind.dialect.name
+    if dialect not in _index_available:
+        _index_available[dialect] = inspect(bind).has_table(SEARCH_TABLE)
+    return _index_available[dialect]
+
+
+def search_terms(query: str) -> List[str]:
+    # Same word breaks as the index, so "jane.doe@ex" searches jane, doe, ex
+    return re.findall(r"[^\W_]+", query.lower())
+
+
+def _result(candidate: Candidate, job_zoho_id: str, job_title: Optional[str]):
+    return {**mirror.candidate_to_dict(candidate, job_zoho_id), "job_title": job_title}
+
+
+def search_candidates(session: Session, query: str, status: Optional[str] = None, job_id: Optional[str] = None, limit: int = 20, offset: int = 0) -> Optional[dict]:
+    """One page of candidate/job associations matching every word of `query` as a prefix.
+
+    Best matches first. None until the mirror has completed its first sync.
+    """
+    if not mirror._is_ready(session):
+        return None
+    terms = search_terms(query)
+    if not terms:
+        return {"total": 0, "limit": limit, "offset": offset, "results": []}
+
+    statement = select(Candidate, JobPosting.zoho_id, JobPosting.title).join(JobPosting, JobPosting.id == Candidate.job_id)
+    count = select(func.count()).select_from(Candidate).join(JobPosting, JobPosting.id == Candidate.job_id)
+    dialect = session.get_bind().dialect.name
+    if _has_index(session) and dialect == "sqlite":
+        # Every term as a quoted prefix; FTS5 ANDs them
+        match = " ".join(f'"{term}"*' for term in terms)
+        statement = statement.join(_sqlite_index, _sqlite_index.c.rowid == Candidate.id)
+        count = count.join(_sqlite_index, _sqlite_index.c.rowid == Candidate.id)
+        filters = [text(f"{SEARCH_TABLE} MATCH :match").bindparams(match=match)]
+        order = [_sqlite_index.c.rank, Candidate.id]
+    elif _has_index(session) and dialect == "postgresql":
+        tsquery = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        statement = statement.join(_postgres_index, _postgres_index.c.candidate_id == Candidate.id)
+        count = count.join(_postgres_index, _postgres_index.c.candidate_id == Candidate.id)
+        filters = [_postgres_index.c.document.op("@@")(tsquery)]
+        order = [func.ts_rank(_postgres_index.c.document, tsquery).desc(), Candidate.id]
+    else:
+        columns = [Candidate.first_name, Candidate.last_name, Candidate.email, Candidate.phone, Candidate.status, JobPosting.title]
+        filters = [or_(*(func.lower(column).like(f"%{term}%") for column in columns)) for term in terms]
+        order = [Candidate.id]
+
+    if status:
+        filters.append(Candidate.status == status)
+    if job_id:
+        filters.append(JobPosting.zoho_id == job_id)
+    total = session.exec(count.where(*filters)).one()
+    rows = session.exec(statement.where(*filters).order_by(*order).limit(limit).offset(offset)).all()
+    return {
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "results": [_result(candidate, job_zoho_id, job_title) for candidate, job_zoho_id, job_title in rows],
+    }
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+from dotenv import load_dotenv
+from app.services.tenants import current_tenant
+
+load_dotenv()
+
+# Events kept for clients that reconnect with Last-Event-ID
+EVENTS_HISTORY = int(os.getenv("EVENTS_HISTORY", "1000"))
+# Per-client backlog; a client that falls this far behind is told to resync
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "500"))
+EVENTS_HEARTBEAT = float(os.getenv("EVENTS_HEARTBEAT", "15"))
+# Streams are closed after this long; EventSource reconnects and resumes from
+# Last-Event-ID. Keeps a server shutdown from waiting on idle clients forever.
+EVENTS_STREAM_TTL = float(os.getenv("EVENTS_STREAM_TTL", "300"))
+
+# Event types
+JOB_CREATED = "job.created"
+JOB_UPDATED = "job.updated"
+JOB_ARCHIVED = "job.archived"
+CANDIDATE_STATUS = "candidate.status"
+CANDIDATE_UPDATED = "candidate.updated"
+CANDIDATE_REMOVED = "candidate.removed"
+RESYNC = "resync"
+
+
+class _Subscriber:
+    def __init__(self, loop, job_id: Optional[str], tenant: str):
+        self.loop = loop
+        self.job_id = job_id
+        self.tenant = tenant
+        self.queue = asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+
+    def wants(self, event: dict):
+        if event["tenant"] != self.tenant:
+            return False
+        # The job filter only narrows candidate events; job events go to everyone
+        if self.job_id is None or not event["type"].startswith("candidate."):
+            return True
+        return event["data"].get("job_id") == self.job_id
+
+    def offer(self, event: dict):
+        # Runs on the subscriber's loop
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drop the backlog; the client refetches instead of replaying it
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"id": event["id"], "type": RESYNC, "data": {}})
+
+
+class EventBroker:
+    """In-process fan-out of job / candidate changes to SSE clients.
+
+    `publish()` may be called from any thread (request handlers, the sync
+    engine, outbox workers); each subscriber gets the event on its own event
+    loop. Events are numbered so a reconnecting client can resume from its
+    Last-Event-ID out of a bounded history, and tagged with the publishing
+    tenant so clients only see their own org's changes.
+    """
+
+    def __init__(self, history: int = EVENTS_HISTORY):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._history = deque(maxlen=history)
+        self._next_id = 1
+        self.published = 0
+        self.resyncs = 0
+
+    def publish(self, event_type: str, data: dict):
+        with self._lock:
+            event = {"id": self._next_id, "type": event_type, "data": data, "tenant": current_tenant().id}
+            self._next_id += 1
+            self._history.append(event)
+            self.published += 1
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            if subscriber.wants(event):
+                try:
+                    subscriber.loop.call_soon_threadsafe(subscriber.offer, event)
+                except RuntimeError:
+                    # Its loop is gone
+                    self._remove(subscriber)
+        return event
+
+    def subscribe(self, job_id: Optional[str] = None, last_event_id: Optional[int] = None):
+        """Registers a subscriber on the running loop and returns it with its replay backlog."""
+        subscriber = _Subscriber(asyncio.get_running_loop(), job_id, current_tenant().id)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            backlog = []
+            if last_event_id is not None:
+                oldest = self._history[0]["id"] if self._history else self._next_id
+                if last_event_id + 1 < oldest:
+                    # Missed more than we kept
+                    self.resyncs += 1
+                    backlog = [{"id": self._next_id - 1, "type": RESYNC, "data": {}}]
+                else:
+                    backlog = [event for event in self._history if event["id"] > last_event_id and subscriber.wants(event)]
+        return subscriber, backlog
+
+    def _remove(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def unsubscribe(self, subscriber):
+        self._remove(subscriber)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "published": self.published,
+                "last_event_id": self._next_id - 1,
+                "history": len(self._history),
+                "resyncs": self.resyncs,
+            }
+
+
+def format_sse(event: dict):
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+async def stream_events(subscriber, backlog, is_disconnected, heartbeat: float = EVENTS_HEARTBEAT, ttl: float = EVENTS_STREAM_TTL):
+    """Yields SSE frames for one subscriber until the client goes away or `ttl` passes."""
+    deadline = time.monotonic() + ttl
+    try:
+        # Tell EventSource how long to wait before reconnecting
+        yield "retry: 3000\n\n"
+        for event in backlog:
+            yield format_sse(event)
+        last_sent = time.monotonic()
+        while time.monotonic() < deadline and not await is_disconnected():
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), timeout=1.0)
+            except asyncio.TimeoutError:
+                if time.monotonic() - last_sent >= heartbeat:
+                    # Keeps proxies from closing an idle connection
+                    last_sent = time.monotonic()
+                    yield ": ping\n\n"
+                continue
+            last_sent = time.monotonic()
+            yield format_sse(event)
+    finally:
+        event_broker.unsubscribe(subscriber)
+
+
+event_broker = EventBroker()
+
+
+def publish(event_type: str, data: dict):
+    return event_broker.publish(event_type, data)
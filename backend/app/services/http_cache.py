@@ -0,0 +1,92 @@
+import hashlib
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from dotenv import load_dotenv
+from fastapi import Request, Response
+from app.services.metrics import TimedJSONResponse
+from app.services.serialization import serialize
+
+load_dotenv()
+
+# Seconds browsers may reuse a /jobs response without asking again. 0 means
+# they revalidate every time, which is cheap: unchanged data gets a bodyless 304.
+JOBS_CACHE_MAX_AGE = int(os.getenv("JOBS_CACHE_MAX_AGE", "0"))
+
+
+def cache_control(max_age: int = JOBS_CACHE_MAX_AGE):
+    # private: responses depend on the caller's Zoho data, so no shared caches
+    return f"private, max-age={max_age}, must-revalidate"
+
+
+def make_etag(body: bytes):
+    # Weak, so it stays valid when GZipMiddleware re-encodes the body
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def last_modified(content) -> Optional[datetime]:
+    """Zoho Modified_Time of a single job/candidate dict.
+
+    Lists get no Last-Modified: a record dropping out of a list leaves the
+    newest Modified_Time unchanged, so only the ETag can tell.
+    """
+    if not isinstance(content, dict):
+        return None
+    # Mapped records use modified_time, raw Zoho records Modified_Time
+    value = content.get("modified_time") or content.get("Modified_Time")
+    if not value:
+        return None
+    try:
+        modified = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return modified if modified.tzinfo else modified.replace(tzinfo=timezone.utc)
+
+
+def etag_matches(if_none_match: str, etag: str):
+    # Comparison is weak (RFC 9110 13.1.2): W/"x" matches "x"
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified_since(if_modified_since: str, modified: Optional[datetime]):
+    if modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one-second resolution
+    return modified.replace(microsecond=0) <= since
+
+
+def conditional_json(request: Request, content, schema=None, exclude_unset: bool = False, max_age: int = JOBS_CACHE_MAX_AGE):
+    """JSON response with ETag / Last-Modified that answers conditional GETs with 304.
+
+    `content` is serialized through `schema` (the route's response_model,
+    which FastAPI skips for a returned Response) before rendering. The ETag
+    hashes the rendered body, so it changes exactly when the payload does
+    whether the data came from the mirror, the cache or Zoho.
+    """
+    if schema is not None:
+        content = serialize(content, schema, exclude_unset)
+    response = TimedJSONResponse(content)
+    headers = {"ETag": make_etag(response.body), "Cache-Control": cache_control(max_age)}
+    modified = last_modified(content)
+    if modified is not None:
+        headers["Last-Modified"] = format_datetime(modified.astimezone(timezone.utc), usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence; If-Modified-Since is then ignored
+        unchanged = etag_matches(if_none_match, headers["ETag"])
+    else:
+        unchanged = not_modified_since(request.headers.get("if-modified-since", ""), modified)
+    if unchanged:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return response
@@ -0,0 +1,138 @@
+from datetime import date
+from typing import List, Optional
+from sqlmodel import SQLModel
+
+# Our job dict keys (see map_job) -> Zoho JobOpenings API names
+JOB_FIELD_MAP = {
+    "id": "id",
+    "title": "Posting_Title",
+    "location": "City",
+    "salary_range": "Salary",
+    "industry": "Industry",
+    "job_type": "Job_Type",
+    "target_date": "Target_Date",
+    "description": "Job_Description",
+    "client_name": "Client_Name",
+    "status": "Job_Opening_Status",
+    "modified_time": "Modified_Time",
+}
+
+SORT_KEYS = ["title", "location", "industry", "target_date", "client_name", "status", "modified_time"]
+
+
+class JobQuery(SQLModel):
+    """Filters, sort and projection accepted by GET /jobs."""
+    ids: Optional[List[str]] = None
+    status: Optional[str] = None
+    client: Optional[str] = None
+    location: Optional[str] = None
+    industry: Optional[str] = None
+    target_date_from: Optional[date] = None
+    target_date_to: Optional[date] = None
+    sort: Optional[str] = None  # e.g. "title" or "-target_date"
+    fields: Optional[List[str]] = None
+
+    @classmethod
+    def from_params(cls, ids=None, fields=None, **kwargs):
+        query = cls(
+            ids=_split(ids),
+            fields=parse_fields(fields),
+            **kwargs,
+        )
+        if query.sort and query.sort.lstrip("-") not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{query.sort}'. Use one of: {', '.join(SORT_KEYS)}")
+        return query
+
+    def is_empty(self):
+        return not any(self.model_dump().values())
+
+    def cache_key(self):
+        return tuple(sorted((key, str(value)) for key, value in self.model_dump().items() if value))
+
+
+def _split(value: Optional[str]):
+    if not value:
+        return None
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def parse_fields(fields: Optional[str]):
+    names = _split(fields)
+    if not names:
+        return None
+    unknown = [name for name in names if name not in JOB_FIELD_MAP]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    # id is always returned so rows stay addressable
+    return ["id"] + [name for name in names if name != "id"]
+
+
+def zoho_fields(query: JobQuery, default: str):
+    if not query.fields:
+        return default
+    return ",".join(JOB_FIELD_MAP[name] for name in query.fields)
+
+
+def escape_criteria_value(value: str):
+    # Parentheses, commas and backslashes are syntax in Zoho criteria
+    return "".join("\\" + char if char in "(),\\" else char for char in value)
+
+
+def zoho_criteria(query: JobQuery):
+    """Builds a Zoho search criteria string, e.g. ((City:equals:Pune)and(...))."""
+    conditions = []
+    if query.status:
+        conditions.append(f"(Job_Opening_Status:equals:{escape_criteria_value(query.status)})")
+    if query.client:
+        conditions.append(f"(Client_Name:equals:{escape_criteria_value(query.client)})")
+    if query.location:
+        conditions.append(f"(City:equals:{escape_criteria_value(query.location)})")
+    if query.industry:
+        conditions.append(f"(Industry:equals:{escape_criteria_value(query.industry)})")
+    if query.target_date_from:
+        conditions.append(f"(Target_Date:greater_equal:{query.target_date_from.isoformat()})")
+    if query.target_date_to:
+        conditions.append(f"(Target_Date:less_equal:{query.target_date_to.isoformat()})")
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return "(" + "and".join(conditions) + ")"
+
+
+def _matches(value, expected):
+    return (value or "").lower() == expected.lower()
+
+
+def apply_query(jobs: List[dict], query: JobQuery):
+    """Filters, sorts and projects job dicts in memory (used for Zoho results)."""
+    result = []
+    for job in jobs:
+        if query.ids and job.get("id") not in query.ids:
+            continue
+        if query.status and not _matches(job.get("status"), query.status):
+            continue
+        if query.client and not _matches(job.get("client_name"), query.client):
+            continue
+        if query.location and not _matches(job.get("location"), query.location):
+            continue
+        if query.industry and not _matches(job.get("industry"), query.industry):
+            continue
+        target_date = job.get("target_date")
+        if query.target_date_from and (not target_date or target_date < query.target_date_from.isoformat()):
+            continue
+        if query.target_date_to and (not target_date or target_date > query.target_date_to.isoformat()):
+            continue
+        result.append(job)
+
+    if query.sort:
+        key = query.sort.lstrip("-")
+        # Missing values sort last in either direction
+        present = [job for job in result if job.get(key) is not None]
+        missing = [job for job in result if job.get(key) is None]
+        present.sort(key=lambda job: job[key], reverse=query.sort.startswith("-"))
+        result = present + missing
+
+    if query.fields:
+        result = [{name: job.get(name) for name in query.fields} for job in result]
+    return result
@@ -0,0 +1,161 @@
+import contextvars
+import os
+import re
+import threading
+import time
+from typing import Optional
+from dotenv import load_dotenv
+
+# Before importing prometheus_client: it picks multiprocess value storage
+# from PROMETHEUS_MULTIPROC_DIR at import time, and .env may set it
+load_dotenv()
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, REGISTRY, generate_latest
+from app.services.serialization import FastJSONResponse
+
+# With several uvicorn workers, point this at an empty directory shared by
+# them so /metrics aggregates every process (prometheus_client multiprocess mode)
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+# Adds a Server-Timing header (total / zoho / db / serialize) to every response
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() in ("1", "true", "yes")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+HTTP_REQUESTS = Counter("http_requests_total", "API requests", ["method", "route", "status"])
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "API request latency", ["method", "route"], buckets=LATENCY_BUCKETS)
+# Where a request's time went; "zoho" and "db" are summed over calls, so
+# concurrent calls can add up to more than the request itself
+HTTP_SPANS = Histogram("http_request_span_seconds", "Time per request spent in each span", ["route", "span"], buckets=LATENCY_BUCKETS)
+ZOHO_REQUESTS = Counter("zoho_requests_total", "Zoho API calls", ["tenant", "method", "endpoint", "status"])
+ZOHO_LATENCY = Histogram("zoho_request_duration_seconds", "Zoho API call latency", ["tenant", "method", "endpoint"], buckets=LATENCY_BUCKETS)
+ZOHO_RETRIES = Counter("zoho_retries_total", "Zoho API calls retried after a 429, 5xx or transport error", ["tenant", "method", "endpoint"])
+ZOHO_TOKEN_REFRESHES = Counter("zoho_token_refreshes_total", "Zoho access token refreshes", ["tenant", "result"])
+DB_QUERIES = Histogram("db_query_duration_seconds", "Database statement latency", ["operation"], buckets=LATENCY_BUCKETS)
+
+# Zoho record ids are long numbers; collapse them so label cardinality stays bounded
+_RECORD_ID = re.compile(r"^\d+$")
+# Module-level actions that sit where a record id would
+_MODULE_ACTIONS = {"search", "watch", "upsert"}
+
+
+def zoho_endpoint(url: str, api_base: str):
+    """'/Job_Openings/{id}/associate' for a full Zoho URL."""
+    path = url[len(api_base):] if url.startswith(api_base) else url
+    parts = path.split("?", 1)[0].split("/")
+    for i, part in enumerate(parts):
+        # parts[0] is "" and parts[1] the module, so parts[2] is a record id
+        # whatever it looks like, unless it is a module action
+        if _RECORD_ID.match(part) or (i == 2 and part not in _MODULE_ACTIONS):
+            parts[i] = "{id}"
+    return "/".join(parts)
+
+
+class RequestTiming:
+    """Per-request span totals, shared with threadpool workers via a contextvar."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans = {}
+
+    def add(self, span: str, seconds: float):
+        with self._lock:
+            self.spans[span] = self.spans.get(span, 0.0) + seconds
+
+
+_request_timing: contextvars.ContextVar[Optional[RequestTiming]] = contextvars.ContextVar("request_timing", default=None)
+
+
+def record_span(span: str, seconds: float):
+    """Adds to the current request's span, if called while serving one."""
+    timing = _request_timing.get()
+    if timing is not None:
+        timing.add(span, seconds)
+
+
+def record_zoho_call(tenant: str, method: str, endpoint: str, status, seconds: float):
+    ZOHO_REQUESTS.labels(tenant, method, endpoint, str(status)).inc()
+    ZOHO_LATENCY.labels(tenant, method, endpoint).observe(seconds)
+    record_span("zoho", seconds)
+
+
+def instrument_engine(engine):
+    """Times every statement run on `engine` (histogram + the request's db span)."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        seconds = time.perf_counter() - started
+        DB_QUERIES.labels(statement.lstrip().split(" ", 1)[0].upper()).observe(seconds)
+        record_span("db", seconds)
+
+
+class TimedJSONResponse(FastJSONResponse):
+    """FastJSONResponse that reports its encoding time as the "serialize" span."""
+
+    def render(self, content) -> bytes:
+        started = time.perf_counter()
+        body = super().render(content)
+        record_span("serialize", time.perf_counter() - started)
+        return body
+
+
+class TimingMiddleware:
+    """ASGI middleware: request counters, latency histograms and Server-Timing.
+
+    Pure ASGI rather than BaseHTTPMiddleware so streamed responses (NDJSON,
+    SSE) pass through untouched. For streams the timing covers the time to
+    the first byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        timing = RequestTiming()
+        token = _request_timing.set(timing)
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        def route_label():
+            route = scope.get("route")
+            # Unmatched paths share one label instead of one per URL
+            return getattr(route, "path", None) or "unmatched"
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                total = time.perf_counter() - started
+                route = route_label()
+                spans = dict(timing.spans)
+                HTTP_LATENCY.labels(scope["method"], route).observe(total)
+                for span, seconds in spans.items():
+                    HTTP_SPANS.labels(route, span).observe(seconds)
+                if SERVER_TIMING_ENABLED:
+                    entries = [f"total;dur={total * 1000:.1f}"] + [f"{span};dur={seconds * 1000:.1f}" for span, seconds in spans.items()]
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [(b"server-timing", ", ".join(entries).encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            HTTP_REQUESTS.labels(scope["method"], route_label(), str(status["code"])).inc()
+            _request_timing.reset(token)
+
+
+def render_metrics():
+    """(body, content type) in the Prometheus text format."""
+    if PROMETHEUS_MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
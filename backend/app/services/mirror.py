@@ -0,0 +1,317 @@
+from datetime import date, datetime, timezone
+from typing import List, Optional
+from sqlalchemy import delete, func, nulls_last, update
+from sqlmodel import Session, select
+from app.database import bulk_upsert
+from app.models.job import JobPosting
+from app.models.candidate import Candidate
+from app.models.sync_state import SyncState
+from app.services.job_query import JobQuery
+from app.services import tenants
+
+# Local copy of Zoho JobOpenings / associated Candidates, kept current by
+# app.services.sync and by our own write paths. Read routes serve from here
+# once the first sync has completed. Only the default tenant is mirrored;
+# requests for other tenants read and write Zoho directly.
+
+
+def parse_zoho_datetime(value) -> Optional[datetime]:
+    """Zoho timestamps carry an offset; the mirror stores them as aware UTC."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _parse_date(value) -> Optional[date]:
+    if not value or isinstance(value, date):
+        return value or None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def job_columns(job: dict):
+    """Maps a job dict as returned by map_job onto JobPosting columns."""
+    return {
+        "zoho_id": job.get("id"),
+        "title": job.get("title") or "",
+        "description": job.get("description") or "",
+        "location": job.get("location") or "",
+        "industry": job.get("industry") or "IT Services",
+        "job_type": job.get("job_type") or "Full Time",
+        "salary_range": job.get("salary_range"),
+        "target_date": _parse_date(job.get("target_date")),
+        "client_name": job.get("client_name"),
+        "status": job.get("status"),
+        "modified_time": parse_zoho_datetime(job.get("modified_time")),
+    }
+
+
+def candidate_columns(candidate: dict):
+    """Maps a candidate dict as returned by map_candidate onto Candidate columns."""
+    return {
+        "zoho_id": candidate.get("id"),
+        "first_name": candidate.get("first_name"),
+        "last_name": candidate.get("last_name"),
+        "email": candidate.get("email"),
+        "phone": candidate.get("phone"),
+        "status": candidate.get("status") or "Applied",
+        "resume_url": candidate.get("resume_url"),
+        "applied_date": candidate.get("applied_date"),
+        "modified_time": parse_zoho_datetime(candidate.get("modified_time")),
+    }
+
+
+def job_to_dict(job: JobPosting):
+    # Same shape as map_job so mirror and live responses are interchangeable
+    return {
+        "id": job.zoho_id,
+        "title": job.title,
+        "location": job.location,
+        "salary_range": job.salary_range,
+        "industry": job.industry,
+        "job_type": job.job_type,
+        "target_date": job.target_date.isoformat() if job.target_date else None,
+        "description": job.description or "No description",
+        "client_name": job.client_name,
+        "status": job.status,
+        "modified_time": job.modified_time.isoformat() if job.modified_time else None,
+    }
+
+
+def candidate_to_dict(candidate: Candidate, job_zoho_id: str):
+    # Same shape as map_candidate
+    return {
+        "id": candidate.zoho_id,
+        "first_name": candidate.first_name,
+        "last_name": candidate.last_name,
+        "email": candidate.email,
+        "phone": candidate.phone,
+        "status": candidate.status,
+        "applied_date": candidate.applied_date,
+        "resume_url": candidate.resume_url,
+        "job_id": job_zoho_id,
+        "modified_time": candidate.modified_time.isoformat() if candidate.modified_time else None,
+    }
+
+
+# --- Writes -----------------------------------------------------------------
+
+def apply_jobs(session: Session, jobs: List[dict]):
+    """Upserts mirrored jobs by zoho_id in bulk. Caller commits.
+
+    Returns one (id, zoho_id, modified_time) row per job written.
+    """
+    rows = [job_columns(job) for job in jobs if job.get("id")]
+    return bulk_upsert(session, JobPosting, rows, ["zoho_id"], returning=["id", "zoho_id", "modified_time"])
+
+
+def apply_candidates(session: Session, job, candidates: List[dict]):
+    """Replaces the mirrored associations of one job with `candidates`. Caller commits."""
+    rows = [{"job_id": job.id, **candidate_columns(candidate)} for candidate in candidates if candidate.get("id")]
+    bulk_upsert(session, Candidate, rows, ["job_id", "zoho_id"])
+    # Whatever is left was disassociated in Zoho
+    session.execute(
+        delete(Candidate).where(
+            Candidate.job_id == job.id,
+            Candidate.zoho_id.not_in([row["zoho_id"] for row in rows]),
+        )
+    )
+
+
+def update_candidate_records(session: Session, zoho_id: str, candidate: dict) -> bool:
+    """Refreshes every association row of a candidate from its Zoho record.
+
+    Returns False when the candidate is not mirrored yet.
+    """
+    columns = candidate_columns(candidate)
+    columns.pop("zoho_id")
+    columns.pop("resume_url")
+    columns.pop("applied_date")
+    result = session.execute(update(Candidate).where(Candidate.zoho_id == zoho_id).values(**columns))
+    return result.rowcount > 0
+
+
+def remove_candidate(session: Session, zoho_id: str) -> List[str]:
+    """Drops every association of a candidate deleted in Zoho. Caller commits.
+
+    Returns the zoho ids of the jobs it was associated with.
+    """
+    job_ids = session.exec(
+        select(JobPosting.zoho_id).join(Candidate, Candidate.job_id == JobPosting.id).where(Candidate.zoho_id == zoho_id)
+    ).all()
+    session.execute(delete(Candidate).where(Candidate.zoho_id == zoho_id))
+    return list(job_ids)
+
+
+def changed_jobs(session: Session, jobs: List[dict]) -> List[dict]:
+    """Jobs in `jobs` that are new to the mirror or carry a different Modified_Time."""
+    incoming = {job["id"]: job for job in jobs if job.get("id")}
+    if not incoming:
+        return []
+    existing = dict(session.exec(
+        select(JobPosting.zoho_id, JobPosting.modified_time).where(JobPosting.zoho_id.in_(list(incoming)))
+    ).all())
+    return [
+        job for zoho_id, job in incoming.items()
+        if zoho_id not in existing or existing[zoho_id] != parse_zoho_datetime(job.get("modified_time"))
+    ]
+
+
+def changed_candidates(session: Session, job, candidates: List[dict]):
+    """Diffs a job's incoming associations against the mirror.
+
+    Returns (changed, removed): candidates that are new or whose status or
+    Modified_Time differ, and zoho ids that are no longer associated.
+    """
+    existing = {
+        zoho_id: (status, modified_time)
+        for zoho_id, status, modified_time in session.exec(
+            select(Candidate.zoho_id, Candidate.status, Candidate.modified_time).where(Candidate.job_id == job.id)
+        ).all()
+    }
+    changed = [
+        candidate for candidate in candidates
+        if candidate.get("id")
+        and existing.get(candidate["id"]) != (candidate.get("status") or "Applied", parse_zoho_datetime(candidate.get("modified_time")))
+    ]
+    removed = sorted(set(existing) - {candidate.get("id") for candidate in candidates})
+    return changed, removed
+
+
+def load_candidate_records(session: Session, zoho_id: str) -> List[dict]:
+    """Every mirrored association of one candidate, one dict per job."""
+    rows = session.exec(
+        select(Candidate, JobPosting.zoho_id)
+        .join(JobPosting, Candidate.job_id == JobPosting.id)
+        .where(Candidate.zoho_id == zoho_id)
+    ).all()
+    return [candidate_to_dict(candidate, job_zoho_id) for candidate, job_zoho_id in rows]
+
+
+def get_sync_state(session: Session, entity: str) -> SyncState:
+    state = session.get(SyncState, entity)
+    return state or SyncState(entity=entity)
+
+
+def mark_job_status(session: Session, zoho_id: str, status: str) -> bool:
+    if not tenants.is_default():
+        return False
+    job = session.exec(select(JobPosting).where(JobPosting.zoho_id == zoho_id)).first()
+    if job:
+        job.status = status
+        session.add(job)
+        session.commit()
+    return job is not None
+
+
+def mark_candidate_status(session: Session, job_zoho_id: str, candidate_zoho_id: str, status: str):
+    if not tenants.is_default():
+        return
+    row = session.exec(
+        select(Candidate)
+        .join(JobPosting, Candidate.job_id == JobPosting.id)
+        .where(JobPosting.zoho_id == job_zoho_id, Candidate.zoho_id == candidate_zoho_id)
+    ).first()
+    if row:
+        row.status = status
+        session.add(row)
+        session.commit()
+
+
+def mark_candidate_statuses(session: Session, job_zoho_id: str, statuses: dict):
+    """Bulk form of mark_candidate_status; `statuses` maps candidate zoho_id -> status."""
+    if not statuses or not tenants.is_default():
+        return
+    rows = session.exec(
+        select(Candidate)
+        .join(JobPosting, Candidate.job_id == JobPosting.id)
+        .where(JobPosting.zoho_id == job_zoho_id, Candidate.zoho_id.in_(list(statuses)))
+    ).all()
+    for row in rows:
+        row.status = statuses[row.zoho_id]
+        session.add(row)
+    session.commit()
+
+
+# --- Reads ------------------------------------------------------------------
+
+def _is_ready(session: Session):
+    if not tenants.is_default():
+        return False
+    state = session.get(SyncState, "jobs")
+    return state is not None and state.last_synced_at is not None
+
+
+def _format_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _job_column(name: str):
+    # Our API's "id" is the Zoho record id
+    return JobPosting.zoho_id if name == "id" else getattr(JobPosting, name)
+
+
+def _job_statement(query: JobQuery, columns):
+    statement = select(*columns).where(JobPosting.zoho_id != None)
+    if query.ids:
+        statement = statement.where(JobPosting.zoho_id.in_(query.ids))
+    if query.status:
+        statement = statement.where(func.lower(JobPosting.status) == query.status.lower())
+    if query.client:
+        statement = statement.where(func.lower(JobPosting.client_name) == query.client.lower())
+    if query.location:
+        statement = statement.where(func.lower(JobPosting.location) == query.location.lower())
+    if query.industry:
+        statement = statement.where(func.lower(JobPosting.industry) == query.industry.lower())
+    if query.target_date_from:
+        statement = statement.where(JobPosting.target_date >= query.target_date_from)
+    if query.target_date_to:
+        statement = statement.where(JobPosting.target_date <= query.target_date_to)
+    if query.sort:
+        column = _job_column(query.sort.lstrip("-"))
+        statement = statement.order_by(nulls_last(column.desc() if query.sort.startswith("-") else column.asc()))
+    return statement.order_by(JobPosting.id.desc())
+
+
+def load_jobs(session: Session, query: Optional[JobQuery] = None) -> Optional[List[dict]]:
+    """Mirrored job list, or None until the first sync has completed.
+
+    Filters and sort run in SQL; with a projection only the requested
+    columns are read, so large description text is skipped.
+    """
+    query = query or JobQuery()
+    if not _is_ready(session):
+        return None
+    if not query.fields:
+        jobs = session.exec(_job_statement(query, [JobPosting])).all()
+        return [job_to_dict(job) for job in jobs]
+    columns = [_job_column(name) for name in query.fields]
+    rows = session.exec(_job_statement(query, columns)).all()
+    return [
+        {name: _format_value(value) for name, value in zip(query.fields, row)}
+        for row in rows
+    ]
+
+
+def load_job_candidates(session: Session, job_zoho_id: str) -> Optional[List[dict]]:
+    """Mirrored candidates of a job, or None if the job is not mirrored."""
+    if not _is_ready(session):
+        return None
+    job = session.exec(select(JobPosting).where(JobPosting.zoho_id == job_zoho_id)).first()
+    if job is None:
+        return None
+    candidates = session.exec(select(Candidate).where(Candidate.job_id == job.id).order_by(Candidate.id)).all()
+    return [candidate_to_dict(candidate, job_zoho_id) for candidate in candidates]
@@ -0,0 +1,318 @@
+import logging
+import os
+import random
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import exc, func, update
+from sqlmodel import Session, select
+from dotenv import load_dotenv
+from app.database import engine
+from app.models.analytics import CandidateStatusChange, PipelineCandidate, PipelineStageStats, PipelineStatusStats
+from app.models.candidate import Candidate
+from app.models.job import JobPosting
+from app.models.outbox import JobOutbox
+from app.services.zoho_jobs import ZohoJobService
+from app.services.portal_engine import portal_engine
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_ENABLED = os.getenv("OUTBOX_ENABLED", "true").lower() in ("1", "true", "yes")
+OUTBOX_WORKERS = int(os.getenv("OUTBOX_WORKERS", "4"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "2"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", "5"))
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", "600"))
+# A claimed row whose worker died is picked up again after this many seconds
+OUTBOX_LEASE_SECONDS = float(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+# Portals every new job is posted to once it exists in Zoho, e.g. "linkedin,naukri"
+JOB_PORTALS = [name.strip() for name in os.getenv("JOB_PORTALS", "").split(",") if name.strip()]
+
+PENDING = "pending"
+IN_PROGRESS = "in_progress"
+DONE = "done"
+FAILED = "failed"
+
+ZOHO_TARGET = "zoho"
+PORTAL_PREFIX = "portal:"
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+# --- Enqueue / status -------------------------------------------------------
+
+def enqueue_job(session: Session, job: JobPosting, idempotency_key: Optional[str] = None):
+    """Persists a new job and its Zoho outbox row in one transaction.
+
+    Returns (job, created). When `idempotency_key` was already used the
+    original job is returned with created=False and nothing is written.
+    """
+    key = idempotency_key or uuid.uuid4().hex
+    existing = session.exec(select(JobOutbox).where(JobOutbox.idempotency_key == f"{key}:{ZOHO_TARGET}")).first()
+    if existing:
+        return session.get(JobPosting, existing.job_id), False
+    session.add(job)
+    session.flush()
+    session.add(JobOutbox(job_id=job.id, target=ZOHO_TARGET, idempotency_key=f"{key}:{ZOHO_TARGET}"))
+    session.commit()
+    session.refresh(job)
+    outbox_worker.wake()
+    return job, True
+
+
+def _overall_status(rows):
+    statuses = {row.status for row in rows}
+    if FAILED in statuses:
+        return FAILED
+    if statuses == {DONE}:
+        return DONE
+    if statuses <= {PENDING}:
+        return PENDING
+    return IN_PROGRESS
+
+
+def publish_status(session: Session, job_id: int):
+    """Progress of a job through the outbox, or None for an unknown job."""
+    job = session.get(JobPosting, job_id)
+    if job is None:
+        return None
+    rows = session.exec(select(JobOutbox).where(JobOutbox.job_id == job_id).order_by(JobOutbox.id)).all()
+    return {
+        "db_id": job.id,
+        "zoho_id": job.zoho_id,
+        "status": _overall_status(rows) if rows else DONE,
+        "steps": [
+            {
+                "target": row.target,
+                "status": row.status,
+                "attempts": row.attempts,
+                "next_attempt_at": row.next_attempt_at.isoformat() if row.status == PENDING else None,
+                "last_error": row.last_error,
+                "result": row.result,
+            }
+            for row in rows
+        ],
+    }
+
+
+# --- Delivery ---------------------------------------------------------------
+
+def _publish_to_zoho(row: JobOutbox, job: JobPosting):
+    if job.zoho_id:
+        # An earlier attempt got as far as Zoho and the job row
+        return job.zoho_id
+    if row.attempts > 1:
+        # The last attempt may have created the opening before failing; adopt it
+        zoho_id = ZohoJobService.find_job_created_since(job.title, row.created_at - timedelta(minutes=1))
+        if zoho_id:
+            return zoho_id
+    return ZohoJobService.create_job(job.model_dump(mode="json"))
+
+
+def _publish_to_portal(name: str, job: JobPosting):
+    # Runs on the portal engine's warm browsers; see app.services.portal_engine
+    result = portal_engine.run(name, job.model_dump(mode="json"))
+    return str(result) if result is not None else None
+
+
+def _complete_zoho(session: Session, row: JobOutbox, job: JobPosting, zoho_id: str):
+    """Records the Zoho id and queues the portal steps, atomically."""
+    job.zoho_id = zoho_id
+    job.status = "In-progress"
+    session.add(job)
+    key = row.idempotency_key.rsplit(":", 1)[0]
+    for name in JOB_PORTALS:
+        session.add(JobOutbox(job_id=job.id, target=f"{PORTAL_PREFIX}{name}", idempotency_key=f"{key}:{PORTAL_PREFIX}{name}"))
+
+
+def _adopt_mirrored_job(session: Session, job: JobPosting, zoho_id: str) -> bool:
+    """Folds the row the sync engine mirrored for `zoho_id` into `job`.
+
+    The sync can see a new opening before the outbox records its id; the
+    draft keeps its db id (clients poll /jobs/publish/{db_id}) and takes over
+    the mirrored fields and anything already attached to the mirrored row.
+    Returns False when there is no such row. Caller commits.
+    """
+    mirrored = session.exec(select(JobPosting).where(JobPosting.zoho_id == zoho_id, JobPosting.id != job.id)).first()
+    if mirrored is None:
+        return False
+    for model in (Candidate, CandidateStatusChange, PipelineCandidate, PipelineStatusStats, PipelineStageStats):
+        session.execute(update(model).where(model.job_id == mirrored.id).values(job_id=job.id))
+    fields = mirrored.model_dump(exclude={"id"})
+    session.delete(mirrored)
+    session.flush()
+    for name, value in fields.items():
+        setattr(job, name, value)
+    return True
+
+
+def _commit_done(session: Session, row: JobOutbox, result: Optional[str]):
+    row.status = DONE
+    row.result = result
+    row.last_error = None
+    row.updated_at = _utcnow()
+    session.add(row)
+    session.commit()
+
+
+def _commit_retry(session: Session, row: JobOutbox, error: Exception):
+    """Records a failed attempt: backs off, or gives up after OUTBOX_MAX_ATTEMPTS."""
+    logger.warning("Outbox %s for job %s failed (attempt %s): %s", row.target, row.job_id, row.attempts, error)
+    row.last_error = str(error)
+    if row.attempts >= OUTBOX_MAX_ATTEMPTS:
+        row.status = FAILED
+    else:
+        row.status = PENDING
+        delay = min(OUTBOX_BACKOFF_MAX, OUTBOX_BACKOFF_BASE * (2 ** (row.attempts - 1)))
+        row.next_attempt_at = _utcnow() + timedelta(seconds=random.uniform(delay / 2, delay))
+    row.updated_at = _utcnow()
+    session.add(row)
+    session.commit()
+
+
+def _deliver(row_id: int):
+    """Runs one claimed row; the worker wakes afterwards for any portal steps it queued."""
+    with Session(engine) as session:
+        row = session.get(JobOutbox, row_id)
+        job = session.get(JobPosting, row.job_id)
+        try:
+            if row.target == ZOHO_TARGET:
+                result = _publish_to_zoho(row, job)
+                try:
+                    _complete_zoho(session, row, job, result)
+                    _commit_done(session, row, result)
+                except exc.IntegrityError:
+                    # jobposting.zoho_id is unique: the sync engine mirrored the opening first
+                    session.rollback()
+                    if not _adopt_mirrored_job(session, job, result):
+                        raise
+                    _complete_zoho(session, row, job, result)
+                    _commit_done(session, row, result)
+            else:
+                result = _publish_to_portal(row.target[len(PORTAL_PREFIX):], job)
+                _commit_done(session, row, result)
+        except Exception as e:
+            # Includes a failed commit, so the row still backs off and hits the attempts cap
+            session.rollback()
+            _commit_retry(session, row, e)
+
+
+class OutboxWorker:
+    """Drains JobOutbox rows to Zoho and the job portals on a thread pool.
+
+    A dispatcher thread claims due rows with a conditional UPDATE, so several
+    API processes can share one outbox without double-delivering a row.
+    """
+
+    def __init__(self, workers: int = OUTBOX_WORKERS, poll_interval: float = OUTBOX_POLL_INTERVAL):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.delivered = 0
+        self.last_error = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pool = None
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="outbox")
+        self._thread = threading.Thread(target=self._run, name="outbox-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def wake(self):
+        """Checks the outbox now instead of at the next poll."""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.dispatch()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.exception("Outbox dispatch failed")
+            self._wake.wait(self.poll_interval)
+
+    def _claim(self, session: Session, row: JobOutbox):
+        now = _utcnow()
+        result = session.execute(
+            update(JobOutbox)
+            .where(JobOutbox.id == row.id, JobOutbox.status == row.status, JobOutbox.attempts == row.attempts)
+            .values(status=IN_PROGRESS, attempts=row.attempts + 1, claimed_at=now, updated_at=now)
+        )
+        session.commit()
+        return result.rowcount == 1
+
+    def dispatch(self):
+        """Claims every due row (up to free worker slots) and submits it."""
+        with self._lock:
+            free = self.workers - len(self._in_flight)
+        if free <= 0:
+            return 0
+        now = _utcnow()
+        with Session(engine) as session:
+            rows = session.exec(
+                select(JobOutbox)
+                .where(
+                    ((JobOutbox.status == PENDING) & (JobOutbox.next_attempt_at <= now))
+                    | ((JobOutbox.status == IN_PROGRESS) & (JobOutbox.claimed_at < now - timedelta(seconds=OUTBOX_LEASE_SECONDS)))
+                )
+                .order_by(JobOutbox.next_attempt_at)
+                .limit(free)
+            ).all()
+            claimed = [row.id for row in rows if self._claim(session, row)]
+        for row_id in claimed:
+            with self._lock:
+                self._in_flight.add(row_id)
+            self._pool.submit(self._deliver, row_id)
+        return len(claimed)
+
+    def _deliver(self, row_id: int):
+        try:
+            _deliver(row_id)
+            self.delivered += 1
+        except Exception as e:
+            self.last_error = str(e)
+            logger.exception("Outbox delivery of row %s crashed", row_id)
+        finally:
+            with self._lock:
+                self._in_flight.discard(row_id)
+            # A slot freed up; there may be more due rows
+            self._wake.set()
+
+    def stats(self):
+        counts = {PENDING: 0, IN_PROGRESS: 0, DONE: 0, FAILED: 0}
+        with Session(engine) as session:
+            for status, count in session.exec(select(JobOutbox.status, func.count()).group_by(JobOutbox.status)):
+                counts[status] = count
+        return {
+            "enabled": OUTBOX_ENABLED,
+            "workers": self.workers,
+            "in_flight": len(self._in_flight),
+            "delivered": self.delivered,
+            "rows": counts,
+            "last_error": self.last_error,
+        }
+
+
+outbox_worker = OutboxWorker()
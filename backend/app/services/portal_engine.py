@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+PORTAL_CONCURRENCY = int(os.getenv("PORTAL_CONCURRENCY", "4"))
+# Relaunch a browser after this many postings to bound leaked memory
+PORTAL_BROWSER_RECYCLE_AFTER = int(os.getenv("PORTAL_BROWSER_RECYCLE_AFTER", "50"))
+PORTAL_HEADLESS = os.getenv("PORTAL_HEADLESS", "true").lower() in ("1", "true", "yes")
+# Persisted login state (cookies, local storage), one <portal>.json per portal
+PORTAL_STATE_DIR = Path(os.getenv("PORTAL_STATE_DIR", str(Path(__file__).resolve().parents[2] / "portal_state")))
+
+
+class _BrowserSlot:
+    """One launched browser plus the per-portal contexts opened in it."""
+
+    def __init__(self, browser, generation: int):
+        self.browser = browser
+        self.generation = generation
+        self.contexts = {}
+        self.jobs = 0
+        self.active = 0
+        self.retired = False
+
+
+class PortalEngine:
+    """Runs portal postings on warm Playwright browsers.
+
+    Each portal gets its own BrowserContext (isolated cookies, seeded from
+    the saved login state) inside a shared browser. At most `concurrency`
+    postings run at once; after `recycle_after` postings the browser is
+    retired and closed once its in-flight postings finish.
+
+    Portals are expected to implement `async post_job(job, context)`, where
+    `context` is the portal's BrowserContext, and may return an external id.
+
+    Playwright objects are bound to one event loop, so the engine owns a loop
+    on a background thread; callers (e.g. the outbox workers) use `run()` /
+    `run_many()`, which schedule `post()` on it.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = PORTAL_CONCURRENCY,
+        recycle_after: int = PORTAL_BROWSER_RECYCLE_AFTER,
+        headless: bool = PORTAL_HEADLESS,
+        state_dir: Path = PORTAL_STATE_DIR,
+    ):
+        self.concurrency = concurrency
+        self.recycle_after = max(recycle_after, 1)
+        self.headless = headless
+        self.state_dir = Path(state_dir)
+        self._loop = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._playwright = None
+        self._slot: Optional[_BrowserSlot] = None
+        self._slot_lock = None
+        self._semaphore = None
+        self._generation = 0
+        self._portals = {}
+        self._save_locks = {}
+        self.postings = 0
+        self.failures = 0
+        self.browsers_launched = 0
+        self.browsers_recycled = 0
+        self.posting_seconds = 0.0
+
+    # --- Event loop ---------------------------------------------------------
+
+    def _ensure_loop(self):
+        with self._start_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="portal-engine", daemon=True)
+                self._thread.start()
+        return self._loop
+
+    def run(self, name: str, job: dict, timeout: Optional[float] = None):
+        """Blocking form of post() for use from worker threads."""
+        future = asyncio.run_coroutine_threadsafe(self.post(name, job), self._ensure_loop())
+        return future.result(timeout)
+
+    def run_many(self, postings: List[tuple], timeout: Optional[float] = None):
+        """Blocking form of post_many()."""
+        future = asyncio.run_coroutine_threadsafe(self.post_many(postings), self._ensure_loop())
+        return future.result(timeout)
+
+    # --- Browsers -----------------------------------------------------------
+
+    async def _launch(self):
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+        browser = await self._playwright.chromium.launch(headless=self.headless)
+        self._generation += 1
+        self.browsers_launched += 1
+        return _BrowserSlot(browser, self._generation)
+
+    async def _checkout(self, name: str):
+        """Returns (slot, context) for a posting to portal `name`."""
+        if self._slot_lock is None:
+            self._slot_lock = asyncio.Lock()
+        async with self._slot_lock:
+            slot = self._slot
+            if slot is None or slot.jobs >= self.recycle_after:
+                if slot is not None:
+                    slot.retired = True
+                    self.browsers_recycled += 1
+                    if slot.active == 0:
+                        await self._close_slot(slot)
+                slot = self._slot = await self._launch()
+            slot.jobs += 1
+            slot.active += 1
+            context = slot.contexts.get(name)
+            if context is None:
+                state = self._state_path(name)
+                context = await slot.browser.new_context(storage_state=str(state) if state.exists() else None)
+                slot.contexts[name] = context
+            return slot, context
+
+    async def _checkin(self, slot: _BrowserSlot):
+        slot.active -= 1
+        if slot.retired and slot.active == 0:
+            await self._close_slot(slot)
+
+    async def _close_slot(self, slot: _BrowserSlot):
+        for name, context in slot.contexts.items():
+            await self._save_state(name, context)
+        try:
+            await slot.browser.close()
+        except Exception as e:
+            logger.warning("Closing browser generation %s failed: %s", slot.generation, e)
+
+    def _state_path(self, name: str):
+        return self.state_dir / f"{name}.json"
+
+    async def _save_state(self, name: str, context):
+        # Concurrent postings to one portal must not interleave writes to its file
+        lock = self._save_locks.setdefault(name, asyncio.Lock())
+        try:
+            async with lock:
+                self.state_dir.mkdir(parents=True, exist_ok=True)
+                await context.storage_state(path=str(self._state_path(name)))
+        except Exception as e:
+            logger.warning("Saving login state for %s failed: %s", name, e)
+
+    # --- Postings -----------------------------------------------------------
+
+    def _get_portal(self, name: str):
+        portal = self._portals.get(name)
+        if portal is None:
+            from app.services.portal_manager import PortalManager
+            portal = self._portals[name] = PortalManager.get_portal(name)
+        return portal
+
+    async def post(self, name: str, job: dict):
+        """Posts `job` to one portal and returns whatever the portal returns."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        portal = self._get_portal(name)
+        async with self._semaphore:
+            slot, context = await self._checkout(name)
+            started = time.monotonic()
+            try:
+                result = await portal.post_job(job, context)
+                # Keep any refreshed session cookies for the next browser
+                await self._save_state(name, context)
+                self.postings += 1
+                return result
+            except Exception:
+                self.failures += 1
+                raise
+            finally:
+                self.posting_seconds += time.monotonic() - started
+                await self._checkin(slot)
+
+    async def post_many(self, postings: List[tuple]):
+        """Runs [(portal_name, job), ...] concurrently; results (or exceptions) in order."""
+        return await asyncio.gather(*(self.post(name, job) for name, job in postings), return_exceptions=True)
+
+    async def aclose(self):
+        if self._slot is not None:
+            slot, self._slot = self._slot, None
+            await self._close_slot(slot)
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def close(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.aclose(), self._loop).result(30)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop = None
+
+    def stats(self) -> Dict:
+        slot = self._slot
+        return {
+            "concurrency": self.concurrency,
+            "recycle_after": self.recycle_after,
+            "postings": self.postings,
+            "failures": self.failures,
+            "avg_posting_seconds": round(self.posting_seconds / (self.postings + self.failures), 3) if self.postings + self.failures else 0.0,
+            "browsers_launched": self.browsers_launched,
+            "browsers_recycled": self.browsers_recycled,
+            "browser_generation": slot.generation if slot else None,
+            "browser_jobs": slot.jobs if slot else 0,
+            "active": slot.active if slot else 0,
+            "contexts": sorted(slot.contexts) if slot else [],
+        }
+
+
+portal_engine = PortalEngine()
@@ -1,30 +1,76 @@
-from app.automation.portals.mock_portal import MockPortal
-from app.automation.portals.linkedin import LinkedInPortal
-from app.automation.portals.naukri import NaukriPortal
-from app.automation.portals.indeed import IndeedPortal
-from app.automation.base import BasePortal
-from typing import Dict, Type
+import threading
+from importlib import import_module
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, Dict, Type
+
+if TYPE_CHECKING:
+    from app.automation.base import BasePortal
+
+# Third-party packages can add portals by declaring an entry point, e.g.
+#   [project.entry-points."anti_recruiter.portals"]
+#   monster = "monster_portal:MonsterPortal"
+PORTAL_ENTRY_POINT_GROUP = "anti_recruiter.portals"
+
+# Built-in portals as "module:Class"; nothing is imported until first use
+BUILTIN_PORTALS = {
+    "mock": "app.automation.portals.mock_portal:MockPortal",
+    "linkedin": "app.automation.portals.linkedin:LinkedInPortal",
+    "naukri": "app.automation.portals.naukri:NaukriPortal",
+    "indeed": "app.automation.portals.indeed:IndeedPortal",
+}
 
 class PortalManager:
-    _portals: Dict[str, Type[BasePortal]] = {}
+    _portals: Dict[str, Type["BasePortal"]] = {}
+    _paths: Dict[str, str] = dict(BUILTIN_PORTALS)
+    _discovered = False
+    _lock = threading.Lock()
 
     @classmethod
-    def register_portal(cls, portal_cls: Type[BasePortal]):
+    def register_portal(cls, portal_cls: Type["BasePortal"]):
         cls._portals[portal_cls.name] = portal_cls
 
     @classmethod
-    def get_portal(cls, name: str) -> BasePortal:
-        portal_cls = cls._portals.get(name)
+    def register_path(cls, name: str, path: str):
+        """Registers a portal by "module:Class" without importing it."""
+        cls._paths[name] = path
+
+    @classmethod
+    def _discover(cls):
+        # Reads installed package metadata only; the portal modules stay unimported
+        if cls._discovered:
+            return
+        with cls._lock:
+            if not cls._discovered:
+                for entry_point in entry_points(group=PORTAL_ENTRY_POINT_GROUP):
+                    cls._paths.setdefault(entry_point.name, entry_point.value)
+                cls._discovered = True
+
+    @classmethod
+    def _load(cls, name: str):
+        cls._discover()
+        path = cls._paths.get(name)
+        if not path:
+            return None
+        with cls._lock:
+            portal_cls = cls._portals.get(name)
+            if portal_cls is None:
+                module_name, _, attr = path.partition(":")
+                portal_cls = getattr(import_module(module_name), attr)
+                cls._portals[name] = portal_cls
+        return portal_cls
+
+    @classmethod
+    def get_portal(cls, name: str) -> "BasePortal":
+        portal_cls = cls._portals.get(name) or cls._load(name)
         if not portal_cls:
             raise ValueError(f"Portal {name} not found")
         return portal_cls()
 
     @classmethod
     def list_portals(cls):
-        return list(cls._portals.keys())
+        cls._discover()
+        return sorted(set(cls._paths) | set(cls._portals))
 
-# Register plugins
-PortalManager.register_portal(MockPortal)
-PortalManager.register_portal(LinkedInPortal)
-PortalManager.register_portal(NaukriPortal)
-PortalManager.register_portal(IndeedPortal)
+    @classmethod
+    def loaded_portals(cls):
+        return sorted(cls._portals)
@@ -0,0 +1,39 @@
+import json
+from functools import lru_cache
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # stdlib json, several times slower on large lists
+    orjson = None
+
+
+def dumps(content) -> bytes:
+    """Compact UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema):
+    return TypeAdapter(schema)
+
+
+def serialize(content, schema, exclude_unset: bool = False):
+    """`content` validated against `schema` and dumped to JSON-ready data.
+
+    What FastAPI does with response_model, for routes that build their own
+    Response (ETags, streaming) and so bypass it. Fields not in the schema
+    are dropped.
+    """
+    adapter = _adapter(schema)
+    return adapter.dump_python(adapter.validate_python(content), mode="json", exclude_unset=exclude_unset)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson (see dumps)."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
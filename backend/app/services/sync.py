@@ -0,0 +1,183 @@
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from sqlmodel import Session, select
+from dotenv import load_dotenv
+from app.database import engine
+from app.models.job import JobPosting
+from app.services import analytics, events, mirror
+from app.services.zoho_jobs import ZohoJobService, map_candidate
+from app.services.zoho_scheduler import background_priority
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+ZOHO_SYNC_ENABLED = os.getenv("ZOHO_SYNC_ENABLED", "true").lower() in ("1", "true", "yes")
+# With Zoho notifications configured (app.services.webhooks) polling is only a safety net
+ZOHO_WEBHOOKS_CONFIGURED = bool(os.getenv("ZOHO_WEBHOOK_TOKEN") or os.getenv("ZOHO_WEBHOOK_SECRET"))
+ZOHO_SYNC_INTERVAL = float(os.getenv("ZOHO_SYNC_INTERVAL", "900" if ZOHO_WEBHOOKS_CONFIGURED else "60"))
+# Every Nth cycle re-lists everything to catch new associations and drift
+ZOHO_SYNC_FULL_EVERY = int(os.getenv("ZOHO_SYNC_FULL_EVERY", "30"))
+# A cycle with more changes than this (e.g. the first one) sends one resync event instead
+ZOHO_SYNC_MAX_EVENTS = int(os.getenv("ZOHO_SYNC_MAX_EVENTS", "200"))
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+class ZohoSyncEngine:
+    """Background thread that mirrors Zoho JobOpenings and associated candidates.
+
+    Incremental cycles only ask Zoho for records modified since the last
+    watermark (If-Modified-Since); candidate associations are re-read for jobs
+    that changed, or for every job when an unknown candidate shows up.
+
+    Changes made in Zoho directly are diffed against the mirror and published
+    to app.services.events once the cycle has committed.
+    """
+
+    def __init__(self, interval: float = ZOHO_SYNC_INTERVAL, full_every: int = ZOHO_SYNC_FULL_EVERY):
+        self.interval = interval
+        self.full_every = max(full_every, 1)
+        self.cycles = 0
+        self.last_error = None
+        self.last_run_at = None
+        self.events_published = 0
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._run_lock = threading.Lock()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="zoho-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.exception("Zoho sync failed")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def wake(self):
+        """Runs the next incremental cycle now instead of after the interval."""
+        self._wake.set()
+
+    def run_once(self, full: bool = None):
+        with self._run_lock, background_priority():
+            if full is None:
+                full = self.cycles % self.full_every == 0
+            started_at = _utcnow()
+            changes = []
+            self.last_error = None
+            with Session(engine) as session:
+                changed_jobs = self._sync_jobs(session, full, started_at, changes)
+                self._sync_candidates(session, changed_jobs, full, started_at, changes)
+                # Keeps the analytics request path to the few changes made since
+                analytics.refresh(session)
+            self.cycles += 1
+            self.last_run_at = started_at
+            self._publish(changes)
+
+    def _publish(self, changes):
+        if len(changes) > ZOHO_SYNC_MAX_EVENTS:
+            # Cheaper for clients to refetch than to apply this many deltas
+            events.publish(events.RESYNC, {"reason": "sync", "changes": len(changes)})
+            self.events_published += 1
+            return
+        for event_type, data in changes:
+            events.publish(event_type, data)
+        self.events_published += len(changes)
+
+    def _sync_jobs(self, session: Session, full: bool, started_at: datetime, changes: list):
+        state = mirror.get_sync_state(session, "jobs")
+        since = None if full else state.last_modified
+        watermark = state.last_modified
+
+        changed = []
+        for page in ZohoJobService.iter_job_pages(modified_since=since):
+            changes.extend((events.JOB_UPDATED, {"job_id": job["id"], "job": job}) for job in mirror.changed_jobs(session, page))
+            rows = mirror.apply_jobs(session, page)
+            session.commit()
+            changed.extend(rows)
+            for row in rows:
+                if row.modified_time and (watermark is None or row.modified_time > watermark):
+                    watermark = row.modified_time
+
+        state.last_modified = watermark
+        state.last_synced_at = started_at
+        session.add(state)
+        session.commit()
+        return changed
+
+    def _sync_candidates(self, session: Session, changed_jobs, full: bool, started_at: datetime, changes: list):
+        state = mirror.get_sync_state(session, "candidates")
+        refresh_all = full or state.last_modified is None
+
+        if not refresh_all:
+            for item in ZohoJobService.iter_modified_candidates(state.last_modified):
+                candidate = map_candidate(item, None)
+                if not mirror.update_candidate_records(session, item.get("id"), candidate):
+                    # New applicant: we don't know which job it belongs to
+                    refresh_all = True
+                    continue
+                for record in mirror.load_candidate_records(session, item.get("id")):
+                    changes.append((events.CANDIDATE_UPDATED, {"job_id": record["job_id"], "candidate": record}))
+            session.commit()
+
+        if refresh_all:
+            jobs = session.exec(select(JobPosting).where(JobPosting.zoho_id != None)).all()
+        else:
+            jobs = changed_jobs
+
+        failed = []
+        for job in jobs:
+            try:
+                candidates = ZohoJobService._fetch_associated_candidates(job.zoho_id)
+            except Exception as e:
+                # Leave the job's mirror as it is rather than read the failure as "no candidates"
+                logger.warning("Skipping candidates of job %s: %s", job.zoho_id, e)
+                failed.append(job.zoho_id)
+                continue
+            changed, removed = mirror.changed_candidates(session, job, candidates)
+            changes.extend((events.CANDIDATE_UPDATED, {"job_id": job.zoho_id, "candidate": candidate}) for candidate in changed)
+            changes.extend((events.CANDIDATE_REMOVED, {"job_id": job.zoho_id, "candidate_id": zoho_id}) for zoho_id in removed)
+            mirror.apply_candidates(session, job, candidates)
+            session.commit()
+
+        # Zoho compares If-Modified-Since against its own clock; use our cycle start.
+        # After a failed fetch, clear it so the next cycle re-reads every job's candidates.
+        state.last_modified = None if failed else started_at
+        state.last_synced_at = started_at
+        session.add(state)
+        session.commit()
+        if failed:
+            self.last_error = f"Candidates of {len(failed)} job(s) could not be fetched: {', '.join(failed[:10])}"
+
+    def stats(self):
+        return {
+            "enabled": ZOHO_SYNC_ENABLED,
+            "interval": self.interval,
+            "cycles": self.cycles,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_error": self.last_error,
+            "events_published": self.events_published,
+        }
+
+
+sync_engine = ZohoSyncEngine()
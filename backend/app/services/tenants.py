@@ -0,0 +1,185 @@
+import contextvars
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Optional
+from urllib.parse import parse_qs
+from dotenv import load_dotenv
+from fastapi.responses import JSONResponse
+
+load_dotenv()
+
+DEFAULT_TENANT = "default"
+# JSON object of extra Zoho orgs keyed by tenant id, e.g.
+#   {"acme-in": {"dc": "in", "client_id": "...", "client_secret": "...",
+#                "refresh_token": "...", "rate_limit_per_minute": 60}}
+# Requests pick one with the X-Tenant header (or ?tenant= for EventSource);
+# without one they use the org configured by the plain ZOHO_* variables.
+ZOHO_TENANTS_FILE = os.getenv("ZOHO_TENANTS_FILE")
+TENANT_HEADER = "x-tenant"
+
+# Zoho data centres by their domain suffix
+ZOHO_DOMAINS = {
+    "com": "zoho.com",
+    "eu": "zoho.eu",
+    "in": "zoho.in",
+    "com.au": "zoho.com.au",
+    "jp": "zoho.jp",
+    "ca": "zohocloud.ca",
+    "sa": "zoho.sa",
+    "com.cn": "zoho.com.cn",
+}
+
+
+class UnknownTenant(Exception):
+    pass
+
+
+class ZohoTenant:
+    """Credentials, data centre and quotas of one Zoho Recruit org."""
+
+    def __init__(
+        self,
+        tenant_id: str,
+        client_id: Optional[str] = None,
+        client_secret: Optional[str] = None,
+        refresh_token: Optional[str] = None,
+        redirect_uri: Optional[str] = None,
+        dc: str = "com",
+        api_base: Optional[str] = None,
+        accounts_url: Optional[str] = None,
+        token_url: Optional[str] = None,
+        rate_limit_per_minute: Optional[float] = None,
+        burst: Optional[float] = None,
+        pool_size: Optional[int] = None,
+    ):
+        if dc not in ZOHO_DOMAINS:
+            raise ValueError(f"Unknown Zoho data centre '{dc}' for tenant {tenant_id}. Use one of: {', '.join(ZOHO_DOMAINS)}")
+        domain = ZOHO_DOMAINS[dc]
+        self.id = tenant_id
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.refresh_token = refresh_token
+        self.redirect_uri = redirect_uri
+        self.api_base = (api_base or f"https://recruit.{domain}/recruit/v2").rstrip("/")
+        self.accounts_url = (accounts_url or f"https://accounts.{domain}").rstrip("/")
+        self.token_url = token_url or f"{self.accounts_url}/oauth/v2/token"
+        # None means the process-wide default from the matching ZOHO_* setting
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self.burst = burst
+        self.pool_size = pool_size
+
+    @property
+    def is_default(self):
+        return self.id == DEFAULT_TENANT
+
+
+def _default_tenant():
+    # ZOHO_API_BASE / ZOHO_ACCOUNTS_URL also point it at scripts/fake_zoho.py
+    return ZohoTenant(
+        DEFAULT_TENANT,
+        client_id=os.getenv("ZOHO_CLIENT_ID"),
+        client_secret=os.getenv("ZOHO_CLIENT_SECRET"),
+        refresh_token=os.getenv("ZOHO_REFRESH_TOKEN"),
+        redirect_uri=os.getenv("ZOHO_REDIRECT_URI"),
+        api_base=os.getenv("ZOHO_API_BASE", "https://recruit.zoho.com/recruit/v2"),
+        accounts_url=os.getenv("ZOHO_ACCOUNTS_URL", "https://accounts.zoho.com"),
+        token_url=os.getenv("ZOHO_TOKEN_URL"),
+    )
+
+
+def load_tenants(path: Optional[str] = ZOHO_TENANTS_FILE):
+    tenants = {DEFAULT_TENANT: _default_tenant()}
+    if not path:
+        return tenants
+    with open(path) as f:
+        config = json.load(f)
+    for tenant_id, settings in config.items():
+        if tenant_id == DEFAULT_TENANT:
+            raise ValueError(f"'{DEFAULT_TENANT}' is the org from the ZOHO_* variables; pick another tenant id")
+        tenants[tenant_id] = ZohoTenant(tenant_id, **settings)
+    return tenants
+
+
+TENANTS = load_tenants()
+
+_tenant: contextvars.ContextVar[ZohoTenant] = contextvars.ContextVar("zoho_tenant", default=TENANTS[DEFAULT_TENANT])
+
+
+def get_tenant(tenant_id: Optional[str]) -> ZohoTenant:
+    tenant = TENANTS.get(tenant_id or DEFAULT_TENANT)
+    if tenant is None:
+        raise UnknownTenant(f"Unknown tenant '{tenant_id}'")
+    return tenant
+
+
+def current_tenant() -> ZohoTenant:
+    return _tenant.get()
+
+
+def is_default():
+    return _tenant.get().is_default
+
+
+@contextmanager
+def use_tenant(tenant_id: Optional[str]):
+    """Runs Zoho calls inside the block against `tenant_id`'s org."""
+    token = _tenant.set(get_tenant(tenant_id))
+    try:
+        yield
+    finally:
+        _tenant.reset(token)
+
+
+class TenantRegistry:
+    """One lazily built object per tenant (token manager, HTTP pool, scheduler).
+
+    The default tenant keeps the module-level singleton it had before
+    tenants existed, so single-org deployments behave exactly as before.
+    """
+
+    def __init__(self, factory, default):
+        self._factory = factory
+        self._items = {DEFAULT_TENANT: default}
+        self._lock = threading.Lock()
+
+    def get(self, tenant: Optional[ZohoTenant] = None):
+        tenant = tenant or current_tenant()
+        item = self._items.get(tenant.id)
+        if item is None:
+            with self._lock:
+                item = self._items.get(tenant.id)
+                if item is None:
+                    item = self._items[tenant.id] = self._factory(tenant)
+        return item
+
+    def items(self):
+        with self._lock:
+            return list(self._items.items())
+
+
+class TenantMiddleware:
+    """ASGI middleware selecting the request's tenant from X-Tenant or ?tenant=."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        tenant_id = None
+        for name, value in scope["headers"]:
+            if name == TENANT_HEADER.encode():
+                tenant_id = value.decode()
+                break
+        if tenant_id is None:
+            tenant_id = (parse_qs(scope.get("query_string", b"").decode()).get("tenant") or [None])[0]
+        try:
+            token = _tenant.set(get_tenant(tenant_id))
+        except UnknownTenant as e:
+            return await JSONResponse({"detail": str(e)}, status_code=400)(scope, receive, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _tenant.reset(token)
@@ -0,0 +1,286 @@
+import hashlib
+import hmac
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from sqlmodel import Session
+from dotenv import load_dotenv
+from app.database import engine
+from app.services import events, mirror
+from app.services.cache import attachments_cache, candidate_cache, invalidate_candidate, invalidate_job
+from app.services.sync import sync_engine
+from app.services.zoho_jobs import ZohoJobService, map_candidate
+from app.services.zoho_scheduler import background_priority
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Shared secret set as the `token` of the Zoho notification channel
+# (see scripts/zoho_watch.py). Zoho echoes it in every notification.
+ZOHO_WEBHOOK_TOKEN = os.getenv("ZOHO_WEBHOOK_TOKEN")
+# Alternatively, an HMAC-SHA256 of the raw body (hex) in X-Webhook-Signature,
+# for workflow webhooks sent through a relay that can sign them
+ZOHO_WEBHOOK_SECRET = os.getenv("ZOHO_WEBHOOK_SECRET")
+ZOHO_WEBHOOKS_ENABLED = bool(ZOHO_WEBHOOK_TOKEN or ZOHO_WEBHOOK_SECRET)
+# Apply once notifications have been quiet this long, or at most this late
+ZOHO_WEBHOOK_DEBOUNCE = float(os.getenv("ZOHO_WEBHOOK_DEBOUNCE", "1"))
+ZOHO_WEBHOOK_MAX_DELAY = float(os.getenv("ZOHO_WEBHOOK_MAX_DELAY", "5"))
+# Redeliveries of a notification (same channel and server_time) within this window are ignored
+ZOHO_WEBHOOK_DEDUPE_SECONDS = float(os.getenv("ZOHO_WEBHOOK_DEDUPE_SECONDS", "600"))
+
+JOBS_MODULE = "JobOpenings"
+CANDIDATES_MODULE = "Candidates"
+MODULE_ALIASES = {
+    "jobopenings": JOBS_MODULE,
+    "job_openings": JOBS_MODULE,
+    "candidates": CANDIDATES_MODULE,
+}
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+
+def verify(body: bytes, token: Optional[str], signature: Optional[str]) -> bool:
+    """Checks a notification against the configured token or HMAC secret."""
+    if ZOHO_WEBHOOK_TOKEN and token and hmac.compare_digest(token, ZOHO_WEBHOOK_TOKEN):
+        return True
+    if ZOHO_WEBHOOK_SECRET and signature:
+        expected = hmac.new(ZOHO_WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(signature.lower().removeprefix("sha256="), expected)
+    return False
+
+
+def parse_notification(payload: dict):
+    """Normalizes a Zoho notification (or workflow webhook) to (module, operation, ids).
+
+    Notifications carry `module`, `operation` and `ids`; workflow webhooks
+    are configured to send `module`, `operation` and a single `id`.
+    """
+    module = MODULE_ALIASES.get(str(payload.get("module", "")).lower())
+    if module is None:
+        raise ValueError(f"Unsupported module: {payload.get('module')}")
+    operation = str(payload.get("operation") or UPDATE).lower()
+    if operation not in (INSERT, UPDATE, DELETE):
+        raise ValueError(f"Unsupported operation: {operation}")
+    ids = payload.get("ids") or payload.get("id") or []
+    if isinstance(ids, str):
+        ids = ids.split(",")
+    ids = [str(record_id).strip() for record_id in ids if str(record_id).strip()]
+    if not ids:
+        raise ValueError("Notification has no record ids")
+    return module, operation, ids
+
+
+def redelivery_key(payload: dict) -> Optional[str]:
+    """Identity of one Zoho notification, the same on each redelivery.
+
+    Notifications carry the channel_id and the server_time of the change.
+    Workflow webhooks carry neither and send the same body for every edit of
+    a record, so they have no key and are only coalesced while pending.
+    """
+    channel_id, server_time = payload.get("channel_id"), payload.get("server_time")
+    if not channel_id or not server_time:
+        return None
+    ids = payload.get("ids") or payload.get("id") or ""
+    return f"{channel_id}:{server_time}:{payload.get('module')}:{payload.get('operation')}:{ids}"
+
+
+def _merge(current: Optional[str], operation: str):
+    # A delete wins; an insert followed by updates is still an insert
+    if current == DELETE or operation == DELETE:
+        return DELETE
+    if current == INSERT:
+        return INSERT
+    return operation
+
+
+class ZohoWebhookProcessor:
+    """Applies Zoho change notifications to the mirror, caches and event stream.
+
+    Redelivered notifications are dropped and the rest coalesced per record
+    id: a burst of edits to one candidate becomes one fetch. Once the burst goes quiet
+    (debounce) or has waited `max_delay`, the changed records are fetched
+    from Zoho in batches of 100 on a background thread.
+    """
+
+    def __init__(self, debounce: float = ZOHO_WEBHOOK_DEBOUNCE, max_delay: float = ZOHO_WEBHOOK_MAX_DELAY, dedupe_seconds: float = ZOHO_WEBHOOK_DEDUPE_SECONDS):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.dedupe_seconds = dedupe_seconds
+        self._lock = threading.Lock()
+        self._pending = {JOBS_MODULE: {}, CANDIDATES_MODULE: {}}
+        self._first_at = None
+        self._last_at = None
+        self._seen = OrderedDict()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.received = 0
+        self.duplicates = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.jobs_applied = 0
+        self.candidates_applied = 0
+        self.last_error = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="zoho-webhooks", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _is_duplicate(self, key: str, now: float):
+        while self._seen and next(iter(self._seen.values())) < now - self.dedupe_seconds:
+            self._seen.popitem(last=False)
+        if key in self._seen:
+            return True
+        self._seen[key] = now
+        return False
+
+    def submit(self, module: str, operation: str, ids, dedupe_key: Optional[str] = None) -> bool:
+        """Queues a verified notification; returns False if it added nothing.
+
+        That is a redelivery of `dedupe_key` (see redelivery_key), or a
+        notification whose records are all still pending with the same
+        operation. Once a batch is flushed the same records queue again.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.received += 1
+            pending = self._pending[module]
+            repeat = all(pending.get(record_id) == _merge(pending.get(record_id), operation) for record_id in ids)
+            if (dedupe_key is not None and self._is_duplicate(dedupe_key, now)) or repeat:
+                self.duplicates += 1
+                return False
+            for record_id in ids:
+                if record_id in pending:
+                    self.coalesced += 1
+                pending[record_id] = _merge(pending.get(record_id), operation)
+            if self._first_at is None:
+                self._first_at = now
+            self._last_at = now
+        self._wake.set()
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            # Debounce: wait for the burst to settle, bounded by max_delay
+            while not self._stop.is_set():
+                with self._lock:
+                    if self._first_at is None:
+                        break
+                    due = min(self._last_at + self.debounce, self._first_at + self.max_delay)
+                delay = due - time.monotonic()
+                if delay <= 0:
+                    break
+                self._stop.wait(delay)
+            try:
+                self.flush()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.exception("Applying Zoho notifications failed")
+                # The batch is dropped; an incremental sync picks the changes up
+                sync_engine.wake()
+
+    def flush(self):
+        """Applies everything queued so far."""
+        with self._lock:
+            jobs, candidates = self._pending[JOBS_MODULE], self._pending[CANDIDATES_MODULE]
+            self._pending = {JOBS_MODULE: {}, CANDIDATES_MODULE: {}}
+            self._first_at = self._last_at = None
+            self._wake.clear()
+        if not jobs and not candidates:
+            return
+        self.flushes += 1
+        with background_priority(), Session(engine) as session:
+            changes = []
+            if jobs:
+                changes.extend(self._apply_jobs(session, jobs))
+            if candidates:
+                changes.extend(self._apply_candidates(session, candidates))
+        for event_type, data in changes:
+            events.publish(event_type, data)
+
+    def _apply_jobs(self, session: Session, operations: dict):
+        changes = []
+        live = [job_id for job_id, operation in operations.items() if operation != DELETE]
+        jobs = ZohoJobService.get_jobs_by_ids(live) if live else []
+        changed = mirror.changed_jobs(session, jobs)
+        mirror.apply_jobs(session, jobs)
+        session.commit()
+        for job in changed:
+            event_type = events.JOB_CREATED if operations.get(job["id"]) == INSERT else events.JOB_UPDATED
+            changes.append((event_type, {"job_id": job["id"], "job": job}))
+
+        # Not returned (or deleted outright): gone from Zoho
+        found = {job["id"] for job in jobs}
+        for job_id in operations:
+            if job_id not in found and mirror.mark_job_status(session, job_id, "Deleted"):
+                changes.append((events.JOB_ARCHIVED, {"job_id": job_id, "status": "Deleted"}))
+        for job_id in operations:
+            invalidate_job(job_id)
+        self.jobs_applied += len(operations)
+        return changes
+
+    def _apply_candidates(self, session: Session, operations: dict):
+        changes = []
+        live = [candidate_id for candidate_id, operation in operations.items() if operation != DELETE]
+        records = ZohoJobService.get_candidates_by_ids(live) if live else []
+        found = set()
+        unknown = False
+        for item in records:
+            candidate_id = item.get("id")
+            found.add(candidate_id)
+            if not mirror.update_candidate_records(session, candidate_id, map_candidate(item, None)):
+                unknown = True
+                continue
+            for record in mirror.load_candidate_records(session, candidate_id):
+                invalidate_candidate(record["job_id"], candidate_id)
+                changes.append((events.CANDIDATE_UPDATED, {"job_id": record["job_id"], "candidate": record}))
+        for candidate_id in operations:
+            if candidate_id not in found:
+                for job_id in mirror.remove_candidate(session, candidate_id):
+                    invalidate_candidate(job_id, candidate_id)
+                    changes.append((events.CANDIDATE_REMOVED, {"job_id": job_id, "candidate_id": candidate_id}))
+            candidate_cache.invalidate(candidate_id)
+            # Uploading a resume also touches the candidate record
+            attachments_cache.invalidate(candidate_id)
+        session.commit()
+        if unknown:
+            # New applicants: the notification doesn't say which job they were
+            # associated with, so let the sync engine pick them up now
+            sync_engine.wake()
+        self.candidates_applied += len(operations)
+        return changes
+
+    def stats(self):
+        with self._lock:
+            pending = sum(len(records) for records in self._pending.values())
+        return {
+            "enabled": ZOHO_WEBHOOKS_ENABLED,
+            "received": self.received,
+            "duplicates": self.duplicates,
+            "coalesced": self.coalesced,
+            "pending": pending,
+            "flushes": self.flushes,
+            "jobs_applied": self.jobs_applied,
+            "candidates_applied": self.candidates_applied,
+            "last_error": self.last_error,
+        }
+
+
+webhook_processor = ZohoWebhookProcessor()
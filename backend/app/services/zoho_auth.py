@@ -1,88 +1,230 @@
+import json
 import os
+import tempfile
+import threading
+import time
 import requests
+from contextlib import contextmanager
 from urllib.parse import urlencode
 from dotenv import load_dotenv
+from app.services import metrics
+from app.services.tenants import DEFAULT_TENANT, TENANTS, TenantRegistry, current_tenant
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to a per-process token cache
+    fcntl = None
 
 load_dotenv()
 
-# TODO: These should be loaded from environment variables
-ZOHO_CLIENT_ID = os.getenv("ZOHO_CLIENT_ID")
-ZOHO_CLIENT_SECRET = os.getenv("ZOHO_CLIENT_SECRET")
-ZOHO_REDIRECT_URI = os.getenv("ZOHO_REDIRECT_URI") 
-ZOHO_REFRESH_TOKEN = os.getenv("ZOHO_REFRESH_TOKEN")
+# Client credentials, accounts server and token URL come from the tenant
+# (app.services.tenants); the default tenant reads the ZOHO_* variables.
+
+# Access tokens are shared by every worker process on the host through this
+# file; other tenants use the same path suffixed with their id
+ZOHO_TOKEN_FILE = os.getenv("ZOHO_TOKEN_FILE", os.path.join(tempfile.gettempdir(), "anti_recruiter_zoho_token.json"))
+# Refresh this many seconds before Zoho's expires_in runs out
+ZOHO_TOKEN_REFRESH_MARGIN = int(os.getenv("ZOHO_TOKEN_REFRESH_MARGIN", "300"))
+
+
+class SharedTokenFile:
+    """Access token + expiry persisted in a JSON file guarded by an flock.
+
+    Holding `lock()` serialises refreshes across worker processes; threads
+    inside one process are serialised by ZohoTokenManager's own lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @contextmanager
+    def lock(self):
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def read(self):
+        if fcntl is None:
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def write(self, access_token: str, expires_at: float):
+        if fcntl is None:
+            return
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"access_token": access_token, "expires_at": expires_at}, f)
+        os.replace(tmp_path, self.path)
+
+
+class ZohoTokenManager:
+    """Holds the access token and makes sure only one refresh is in flight.
+
+    Concurrent callers that need a new token wait on the in-flight refresh
+    and reuse its result instead of each POSTing to the token endpoint.
+    """
+
+    def __init__(self, refresh_token=None, token_file: str = ZOHO_TOKEN_FILE, refresh_margin: int = ZOHO_TOKEN_REFRESH_MARGIN):
+        self.storage = {
+            "access_token": None,
+            "refresh_token": refresh_token,
+            "expires_at": 0.0,
+        }
+        self.refresh_margin = refresh_margin
+        self.shared = SharedTokenFile(token_file)
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, now=None):
+        now = now or time.time()
+        return bool(self.storage["access_token"]) and now < self.storage["expires_at"] - self.refresh_margin
+
+    def _is_valid(self, now=None):
+        now = now or time.time()
+        return bool(self.storage["access_token"]) and now < self.storage["expires_at"]
+
+    def store(self, tokens: dict):
+        expires_in = tokens.get("expires_in") or 3600
+        self.storage["access_token"] = tokens.get("access_token")
+        self.storage["expires_at"] = time.time() + float(expires_in)
+        # Zoho might provide a new refresh token, though rare for refresh_token grant
+        if tokens.get("refresh_token"):
+            self.storage["refresh_token"] = tokens.get("refresh_token")
+        self.shared.write(self.storage["access_token"], self.storage["expires_at"])
+
+    def _adopt_shared(self, stale_token=None):
+        """Use the token another process wrote, if it is fresh and not the rejected one."""
+        shared = self.shared.read()
+        token = shared.get("access_token")
+        expires_at = shared.get("expires_at", 0)
+        if token and token != stale_token and time.time() < expires_at - self.refresh_margin:
+            self.storage["access_token"] = token
+            self.storage["expires_at"] = expires_at
+            return token
+        return None
+
+    def peek(self):
+        """Returns the cached token if it needs no refresh, without blocking."""
+        if self._is_fresh():
+            return self.storage["access_token"]
+        return None
+
+    def get(self, refresh_fn, force_refresh=False, stale_token=None):
+        if force_refresh:
+            # The token the caller got a 401 with; default to whatever we hold now
+            stale_token = stale_token or self.storage["access_token"]
+        elif self._is_fresh():
+            return self.storage["access_token"]
+        elif self._is_valid() and self._lock.locked():
+            # Proactive refresh already running elsewhere, current token still works
+            return self.storage["access_token"]
+
+        with self._lock:
+            # Someone may have refreshed while we waited for the lock
+            if self._is_fresh() and self.storage["access_token"] != stale_token:
+                return self.storage["access_token"]
+            with self.shared.lock():
+                token = self._adopt_shared(stale_token)
+                if token:
+                    return token
+                return refresh_fn()
 
-ZOHO_AUTH_URL = "https://accounts.zoho.com/oauth/v2/auth"
-ZOHO_TOKEN_URL = "https://accounts.zoho.com/oauth/v2/token"
 
-# Simple in-memory storage for MVP. In prod, use DB.
-_token_storage = {
-    "access_token": None,
-    "refresh_token": ZOHO_REFRESH_TOKEN
-}
+_token_manager = ZohoTokenManager(refresh_token=TENANTS[DEFAULT_TENANT].refresh_token)
+_token_managers = TenantRegistry(
+    lambda tenant: ZohoTokenManager(refresh_token=tenant.refresh_token, token_file=f"{ZOHO_TOKEN_FILE}.{tenant.id}"),
+    _token_manager,
+)
 
 class ZohoAuthService:
     @staticmethod
     def get_auth_url():
+        tenant = current_tenant()
         params = {
             "scope": "ZohoRecruit.modules.ALL,ZohoRecruit.settings.ALL",
-            "client_id": ZOHO_CLIENT_ID,
+            "client_id": tenant.client_id,
             "response_type": "code",
             "access_type": "offline",
-            "redirect_uri": ZOHO_REDIRECT_URI,
+            "redirect_uri": tenant.redirect_uri,
             "prompt": "consent" # Ensure refresh token is provided
         }
-        return f"{ZOHO_AUTH_URL}?{urlencode(params)}"
+        return f"{tenant.accounts_url}/oauth/v2/auth?{urlencode(params)}"
 
     @staticmethod
     def refresh_access_token():
-        """Refreshes the access token using the system refresh token"""
-        refresh_token = os.getenv("ZOHO_REFRESH_TOKEN") or _token_storage.get("refresh_token")
+        """Refreshes the current tenant's access token using its refresh token.
+
+        Callers should go through get_access_token, which serialises refreshes.
+        """
+        tenant = current_tenant()
+        token_manager = _token_managers.get(tenant)
+        refresh_token = tenant.refresh_token or token_manager.storage.get("refresh_token")
         if not refresh_token:
-            raise Exception("ZOHO_REFRESH_TOKEN not found in environment or storage.")
+            raise Exception(f"No Zoho refresh token configured for tenant {tenant.id}.")
 
         data = {
             "grant_type": "refresh_token",
-            "client_id": ZOHO_CLIENT_ID,
-            "client_secret": ZOHO_CLIENT_SECRET,
+            "client_id": tenant.client_id,
+            "client_secret": tenant.client_secret,
             "refresh_token": refresh_token,
         }
-        response = requests.post(ZOHO_TOKEN_URL, data=data)
+        try:
+            response = requests.post(tenant.token_url, data=data, timeout=30)
+        except requests.RequestException:
+            metrics.ZOHO_TOKEN_REFRESHES.labels(tenant.id, "error").inc()
+            raise
         if response.status_code == 200:
             tokens = response.json()
-            _token_storage["access_token"] = tokens.get("access_token")
-            # Zoho might provide a new refresh token, though rare for refresh_token grant
-            if tokens.get("refresh_token"):
-                _token_storage["refresh_token"] = tokens.get("refresh_token")
+            if not tokens.get("access_token"):
+                # Zoho reports errors such as rate limiting with a 200 + {"error": ...}
+                metrics.ZOHO_TOKEN_REFRESHES.labels(tenant.id, "failed").inc()
+                raise Exception(f"Failed to refresh Zoho token: {response.text}")
+            token_manager.store(tokens)
+            metrics.ZOHO_TOKEN_REFRESHES.labels(tenant.id, "success").inc()
             return tokens.get("access_token")
         else:
+            metrics.ZOHO_TOKEN_REFRESHES.labels(tenant.id, "failed").inc()
             raise Exception(f"Failed to refresh Zoho token: {response.text}")
 
     @staticmethod
     def exchange_code_for_token(code: str):
+        tenant = current_tenant()
         data = {
             "grant_type": "authorization_code",
-            "client_id": ZOHO_CLIENT_ID,
-            "client_secret": ZOHO_CLIENT_SECRET,
-            "redirect_uri": ZOHO_REDIRECT_URI,
+            "client_id": tenant.client_id,
+            "client_secret": tenant.client_secret,
+            "redirect_uri": tenant.redirect_uri,
             "code": code,
         }
-        response = requests.post(ZOHO_TOKEN_URL, data=data)
+        response = requests.post(tenant.token_url, data=data, timeout=30)
         if response.status_code == 200:
             tokens = response.json()
-            _token_storage["access_token"] = tokens.get("access_token")
-            _token_storage["refresh_token"] = tokens.get("refresh_token")
+            _token_managers.get(tenant).store(tokens)
             return tokens
         else:
             raise Exception(f"Failed to exchange token: {response.text}")
 
     @staticmethod
-    def get_access_token(force_refresh=False):
-        """Returns valid access token, refreshing if necessary"""
-        if force_refresh:
-            _token_storage["access_token"] = None
-            
-        token = _token_storage.get("access_token")
-        if not token:
-            # Try to refresh using the refresh token
-            return ZohoAuthService.refresh_access_token()
-        return token
+    def peek_access_token():
+        """Returns the cached access token if it is still fresh, else None"""
+        return _token_managers.get().peek()
+
+    @staticmethod
+    def get_access_token(force_refresh=False, stale_token=None):
+        """Returns valid access token, refreshing if necessary.
+
+        With force_refresh, `stale_token` is the token Zoho just rejected; if a
+        concurrent caller already replaced it, the new token is returned as is.
+        """
+        return _token_managers.get().get(ZohoAuthService.refresh_access_token, force_refresh, stale_token)
@@ -0,0 +1,173 @@
+import os
+import threading
+import time
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+from app.services.tenants import TenantRegistry
+
+load_dotenv()
+
+# Connection pool / timeout tuning for outbound Zoho calls
+ZOHO_HTTP_POOL_SIZE = int(os.getenv("ZOHO_HTTP_POOL_SIZE", "10"))
+ZOHO_HTTP_POOL_TIMEOUT = float(os.getenv("ZOHO_HTTP_POOL_TIMEOUT", "10"))
+ZOHO_HTTP_CONNECT_TIMEOUT = float(os.getenv("ZOHO_HTTP_CONNECT_TIMEOUT", "5"))
+ZOHO_HTTP_READ_TIMEOUT = float(os.getenv("ZOHO_HTTP_READ_TIMEOUT", "30"))
+
+
+class ZohoHttpClient:
+    """Shared keep-alive session for Zoho calls with a bounded connection pool.
+
+    At most `pool_size` requests are in flight at once; callers beyond that
+    wait up to `pool_timeout` seconds for a free slot.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = ZOHO_HTTP_POOL_SIZE,
+        pool_timeout: float = ZOHO_HTTP_POOL_TIMEOUT,
+        connect_timeout: float = ZOHO_HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = ZOHO_HTTP_READ_TIMEOUT,
+    ):
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self.timeout = (connect_timeout, read_timeout)
+
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True)
+        self._session = requests.Session()
+        self._session.mount("https://", self._adapter)
+        self._session.mount("http://", self._adapter)
+
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._in_flight = 0
+        self._pool_waits = 0
+        self._pool_wait_seconds = 0.0
+        self._pool_timeouts = 0
+
+    def _acquire_slot(self):
+        if self._slots.acquire(blocking=False):
+            return
+        started = time.perf_counter()
+        acquired = self._slots.acquire(timeout=self.pool_timeout)
+        waited = time.perf_counter() - started
+        with self._lock:
+            self._pool_waits += 1
+            self._pool_wait_seconds += waited
+            if not acquired:
+                self._pool_timeouts += 1
+        if not acquired:
+            raise Exception(f"Zoho connection pool exhausted after waiting {waited:.1f}s")
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        self._acquire_slot()
+        with self._lock:
+            self._requests += 1
+            self._in_flight += 1
+        try:
+            return self._session.request(method, url, **kwargs)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def _connections_opened(self):
+        # urllib3 keeps one pool per host; num_connections counts fresh TCP/TLS handshakes
+        pools = self._adapter.poolmanager.pools
+        opened = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+        return opened
+
+    def stats(self):
+        opened = self._connections_opened()
+        with self._lock:
+            return {
+                "pool_size": self.pool_size,
+                "requests": self._requests,
+                "in_flight": self._in_flight,
+                "connections_opened": opened,
+                "connections_reused": max(self._requests - opened, 0),
+                "pool_waits": self._pool_waits,
+                "pool_wait_seconds": round(self._pool_wait_seconds, 3),
+                "pool_timeouts": self._pool_timeouts,
+            }
+
+    def close(self):
+        self._session.close()
+
+
+class AsyncZohoHttpClient:
+    """asyncio counterpart of ZohoHttpClient, backed by a pooled httpx.AsyncClient.
+
+    The underlying client is created lazily on first use so it binds to the
+    running event loop, and closed from the app lifespan.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = ZOHO_HTTP_POOL_SIZE,
+        pool_timeout: float = ZOHO_HTTP_POOL_TIMEOUT,
+        connect_timeout: float = ZOHO_HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = ZOHO_HTTP_READ_TIMEOUT,
+    ):
+        self.pool_size = pool_size
+        self._limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self._timeout = httpx.Timeout(read_timeout, connect=connect_timeout, pool=pool_timeout)
+        self._client = None
+        self._requests = 0
+        self._in_flight = 0
+        self._pool_timeouts = 0
+
+    def _get_client(self):
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(limits=self._limits, timeout=self._timeout)
+        return self._client
+
+    async def request(self, method, url, stream: bool = False, **kwargs):
+        """With `stream` the body is left unread for the caller (e.g. file
+        downloads), who must aclose() the response."""
+        client = self._get_client()
+        self._requests += 1
+        self._in_flight += 1
+        try:
+            if stream:
+                return await client.send(client.build_request(method, url, **kwargs), stream=True)
+            return await client.request(method, url, **kwargs)
+        except httpx.PoolTimeout:
+            self._pool_timeouts += 1
+            raise Exception("Zoho connection pool exhausted")
+        finally:
+            self._in_flight -= 1
+
+    def stats(self):
+        return {
+            "pool_size": self.pool_size,
+            "requests": self._requests,
+            "in_flight": self._in_flight,
+            "pool_timeouts": self._pool_timeouts,
+        }
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Process-wide clients shared by every ZohoJobService / AsyncZohoJobService call
+zoho_http = ZohoHttpClient()
+async_zoho_http = AsyncZohoHttpClient()
+
+# Other tenants get their own pools so one org's traffic cannot starve another's
+zoho_http_clients = TenantRegistry(lambda tenant: ZohoHttpClient(pool_size=tenant.pool_size or ZOHO_HTTP_POOL_SIZE), zoho_http)
+async_zoho_http_clients = TenantRegistry(lambda tenant: AsyncZohoHttpClient(pool_size=tenant.pool_size or ZOHO_HTTP_POOL_SIZE), async_zoho_http)
+
+
+async def close_async_clients():
+    for _, client in async_zoho_http_clients.items():
+        await client.aclose()
@@ -1,186 +1,486 @@
+import contextvars
+import logging
+import os
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from app.services.zoho_auth import ZohoAuthService
+from app.services.cache import (
+    cached,
+    job_list_cache,
+    job_cache,
+    candidates_cache,
+    candidate_cache,
+    invalidate_job,
+    invalidate_candidate,
+)
+from app.services.zoho_http import zoho_http_clients
+from app.services.tenants import current_tenant
+from app.services import events, zoho_retry
+from app.services.job_query import escape_criteria_value
 
-ZOHO_API_BASE = "https://recruit.zoho.com/recruit/v2"
+logger = logging.getLogger(__name__)
+
+
+# Zoho caps per_page at 200
+ZOHO_PAGE_SIZE = int(os.getenv("ZOHO_PAGE_SIZE", "200"))
+
+JOB_LIST_FIELDS = "id,Posting_Title,City,Job_Opening_Status,Salary,Industry,Job_Type,Target_Date,Job_Description,Client_Name,Modified_Time"
+
+
+# Zoho fields the candidate views show beyond the association list
+CANDIDATE_DETAIL_FIELDS = [
+    "City",
+    "Current_Job_Title",
+    "Current_Employer",
+    "Experience_in_Years",
+    "Highest_Qualification_Held",
+    "Skill_Set",
+    "Additional_Info",
+    "Modified_Time",
+]
+
+# What GET /jobs/{id}/candidates/{candidate_id} returns of the Candidate record
+CANDIDATE_PROFILE_FIELDS = [
+    "id",
+    "First_Name",
+    "Last_Name",
+    "Email",
+    "Phone",
+    "Mobile",
+    "Application_Status",
+    "Candidate_Stage",
+] + CANDIDATE_DETAIL_FIELDS
+
+CANDIDATE_SYNC_FIELDS = "id,First_Name,Last_Name,Email,Phone,Mobile,Application_Status,Candidate_Stage,Modified_Time"
+
+
+# Payload builders / response mappers shared by the sync and async services
+
+def api_url(path: str):
+    """Zoho Recruit URL for `path` in the current tenant's data centre."""
+    return f"{current_tenant().api_base}{path}"
+
+def build_auth_headers(token: str):
+    if not token:
+        raise Exception("No active Zoho token. Please login.")
+    return {
+        "Authorization": f"Zoho-oauthtoken {token}",
+        "Content-Type": "application/json"
+    }
+
+def token_from_headers(headers: dict):
+    return headers["Authorization"].split(" ", 1)[1]
+
+def build_job_payload(job_data: dict):
+    # Map our simple form data to Zoho's Expected Payload
+    return {
+        "data": [
+            {
+                "Posting_Title": job_data.get("title"),
+                "Job_Opening_Name": job_data.get("title"),
+                "Client_Name": "My company",
+                "City": job_data.get("location"),
+                "Salary": job_data.get("salary_range"),
+                "Work_Experience": job_data.get("experience_required"),
+                "Job_Description": job_data.get("description"),
+                "Industry": job_data.get("industry"),
+                "Job_Type": job_data.get("job_type"),
+                "Target_Date": job_data.get("target_date"), # Ensure ISO format YYYY-MM-DD
+                "Job_Opening_Status": "In-progress",
+            }
+        ]
+    }
+
+def parse_create_response(response):
+    if response.status_code in [200, 201]:
+        data = response.json()
+        if data.get('data') and data['data'][0]['status'] == 'success':
+            return data['data'][0]['details']['id'] # Return Zoho Record ID
+    raise Exception(f"Zoho Create Failed: {response.text}")
+
+def build_archive_payload():
+    return {
+        "data": [
+            {
+                "Job_Opening_Status": "Cancelled" # Or "Archived" if custom, using Cancelled as standard
+            }
+        ]
+    }
+
+def build_candidate_status_payloads(candidate_id: str, status: str):
+    # We update both the candidate record and the association status (the one used in Kanban)
+    payload = {
+        "data": [
+            {
+                "Application_Status": status,
+                "Candidate_Stage": status # Sync both fields for safety
+            }
+        ]
+    }
+    payload_assoc = {
+        "data": [
+            {
+                "id": candidate_id,
+                "Status": status # For association records, the field is often simply 'Status'
+            }
+        ]
+    }
+    return payload, payload_assoc
+
+# Zoho accepts at most 100 records per multi-record write
+ZOHO_BULK_LIMIT = 100
+
+def build_bulk_status_payloads(updates):
+    """Multi-record versions of build_candidate_status_payloads; `updates` is [(candidate_id, status)]."""
+    payload = {
+        "data": [
+            {"id": candidate_id, "Application_Status": status, "Candidate_Stage": status}
+            for candidate_id, status in updates
+        ]
+    }
+    payload_assoc = {
+        "data": [{"id": candidate_id, "Status": status} for candidate_id, status in updates]
+    }
+    return payload, payload_assoc
+
+def parse_bulk_results(response, count: int):
+    """Per-record (ok, error) list for a multi-record write, in request order."""
+    if response.status_code not in [200, 201, 202]:
+        return [(False, f"{response.status_code} - {response.text}")] * count
+    records = response.json().get("data", [])
+    results = []
+    for index in range(count):
+        record = records[index] if index < len(records) else {}
+        if record.get("status") == "success":
+            results.append((True, None))
+        else:
+            results.append((False, record.get("message") or record.get("code") or "No result from Zoho"))
+    return results
+
+def parse_archive_response(response):
+    if response.status_code == 200:
+        data = response.json()
+        if data.get("data") and data["data"][0]["status"] == "success":
+            return True
+    raise Exception(f"Failed to archive job in Zoho: {response.text}")
+
+def parse_single_record(response):
+    if response.status_code == 200:
+        data = response.json()
+        if data.get("data"):
+            return data["data"][0]
+    return None
+
+def parse_job_page(response):
+    """Returns (jobs, more_records) for one page of /JobOpenings."""
+    if response.status_code == 200:
+        data = response.json()
+        jobs = [map_job(item) for item in data.get("data", [])]
+        return jobs, bool(data.get("info", {}).get("more_records"))
+    if response.status_code in [204, 304]: # Zoho 'No Content' / nothing modified since
+        return [], False
+    raise Exception(f"Zoho API Error: {response.status_code} - {response.text}")
+
+def parse_associated_candidates(response, job_id: str):
+    """Candidates associated with a job. Raises on errors rather than
+    returning an empty list, which the mirror would take as every
+    candidate having been removed."""
+    if response.status_code == 200:
+        data = response.json()
+        return [map_candidate(item, job_id) for item in data.get("data", [])]
+    if response.status_code == 204: # No candidates associated
+        return []
+    raise Exception(f"Zoho API Error: {response.status_code} - {response.text}")
+
+def modified_since_headers(modified_since):
+    # Zoho only returns records changed after this ISO 8601 timestamp
+    if modified_since is None:
+        return {}
+    if modified_since.tzinfo is None:
+        # Databases without timezone support hand back naive UTC
+        modified_since = modified_since.replace(tzinfo=timezone.utc)
+    return {"If-Modified-Since": modified_since.isoformat(timespec="seconds")}
+
+def job_page_params(page: int, per_page: int):
+    # Include Client_Name and Job_Opening_Status
+    return {"fields": JOB_LIST_FIELDS, "page": page, "per_page": per_page}
+
+def map_job(item: dict):
+    return {
+        "id": item.get("id"),
+        "title": item.get("Posting_Title"),
+        "location": item.get("City"),
+        "salary_range": item.get("Salary"),
+        "industry": item.get("Industry"),
+        "job_type": item.get("Job_Type"),
+        "target_date": item.get("Target_Date"),
+        "description": item.get("Job_Description") or "No description",
+        "client_name": item.get("Client_Name").get("name") if isinstance(item.get("Client_Name"), dict) else item.get("Client_Name"),
+        "status": item.get("Job_Opening_Status"),
+        "modified_time": item.get("Modified_Time"),
+    }
+
+def map_job_detail(item: dict):
+    return {**map_job(item), "experience_required": item.get("Work_Experience")}
+
+def map_created_job(job_data: dict, zoho_id: str):
+    # What map_job would return for the record build_job_payload creates
+    return {
+        "id": zoho_id,
+        "title": job_data.get("title"),
+        "location": job_data.get("location"),
+        "salary_range": job_data.get("salary_range"),
+        "industry": job_data.get("industry"),
+        "job_type": job_data.get("job_type"),
+        "target_date": job_data.get("target_date"),
+        "description": job_data.get("description") or "No description",
+        "client_name": "My company",
+        "status": "In-progress",
+        "modified_time": None,
+    }
+
+def map_candidate(item: dict, job_id: str):
+    return {
+        "id": item.get("id"),
+        "first_name": item.get("First_Name"),
+        "last_name": item.get("Last_Name"),
+        "email": item.get("Email"),
+        "phone": item.get("Phone") or item.get("Mobile"),
+        "status": item.get("Application_Status") or item.get("Candidate_Stage") or "Applied",
+        "applied_date": (item.get("Created_Time") or "").split('T')[0],
+        "resume_url": item.get("resume_url"), # Note: Resume handle might require extra API calls
+        "job_id": job_id,
+        "modified_time": item.get("Modified_Time"),
+    }
+
+def map_candidate_profile(item: dict):
+    return {field: item.get(field) for field in CANDIDATE_PROFILE_FIELDS}
+
+def map_attachment(item: dict, candidate_id: str):
+    category = item.get("Category") or item.get("Attachment_Type")
+    if isinstance(category, dict):
+        category = category.get("name")
+    try:
+        size = int(item.get("Size") or 0) or None
+    except ValueError:
+        size = None
+    return {
+        "id": item.get("id"),
+        "candidate_id": candidate_id,
+        "file_name": item.get("File_Name"),
+        "size": size,
+        "category": category,
+        "modified_time": item.get("Modified_Time"),
+    }
 
 class ZohoJobService:
     @staticmethod
-    def _get_headers(force_refresh=False):
-        token = ZohoAuthService.get_access_token(force_refresh=force_refresh)
-        if not token:
-            raise Exception("No active Zoho token. Please login.")
-        return {
-            "Authorization": f"Zoho-oauthtoken {token}",
-            "Content-Type": "application/json"
-        }
+    def _get_headers(force_refresh=False, stale_token=None):
+        token = ZohoAuthService.get_access_token(force_refresh=force_refresh, stale_token=stale_token)
+        return build_auth_headers(token)
 
     @staticmethod
     def _make_request(method, url, **kwargs):
-        # Initial attempt
-        headers = ZohoJobService._get_headers()
-        response = requests.request(method, url, headers=headers, **kwargs)
-        
-        # If unauthorized, refresh and retry once
-        if response.status_code == 401:
-            headers = ZohoJobService._get_headers(force_refresh=True)
-            response = requests.request(method, url, headers=headers, **kwargs)
-            
-        return response
+        """Sends one Zoho call under the shared retry policy (see app.services.zoho_retry)."""
+        extra_headers = kwargs.pop("headers", None)
+        http = zoho_http_clients.get(current_tenant())
+        return zoho_retry.send(
+            method, url,
+            lambda headers: http.request(method, url, headers=headers, **kwargs),
+            ZohoJobService._get_headers, token_from_headers, requests.RequestException,
+            extra_headers=extra_headers,
+        )
 
     @staticmethod
     def create_job(job_data: dict):
-        url = f"{ZOHO_API_BASE}/JobOpenings"
-        # Map our simple form data to Zoho's Expected Payload
-        payload = {
-            "data": [
-                {
-                    "Posting_Title": job_data.get("title"),
-                    "Job_Opening_Name": job_data.get("title"),
-                    "Client_Name": "My company",
-                    "City": job_data.get("location"),
-                    "Salary": job_data.get("salary_range"),
-                    "Work_Experience": job_data.get("experience_required"),
-                    "Job_Description": job_data.get("description"),
-                    "Industry": job_data.get("industry"),
-                    "Job_Type": job_data.get("job_type"),
-                    "Target_Date": job_data.get("target_date"), # Ensure ISO format YYYY-MM-DD
-                    "Job_Opening_Status": "In-progress",
-                }
-            ]
-        }
+        url = api_url("/JobOpenings")
+        payload = build_job_payload(job_data)
         
         response = ZohoJobService._make_request("POST", url, json=payload)
-        if response.status_code in [200, 201]:
-             data = response.json()
-             if data.get('data') and data['data'][0]['status'] == 'success':
-                  return data['data'][0]['details']['id'] # Return Zoho Record ID
-        
-        raise Exception(f"Zoho Create Failed: {response.text}")
+        zoho_id = parse_create_response(response)
+        invalidate_job()
+        events.publish(events.JOB_CREATED, {"job": map_created_job(job_data, zoho_id)})
+        return zoho_id
+
+    @staticmethod
+    def find_job_created_since(title: str, since):
+        """Zoho id of an opening titled `title` created at or after `since`, if any.
+
+        Used before retrying a create whose outcome is unknown (timeout, 5xx),
+        so the retry adopts the opening Zoho already made instead of duplicating it.
+        """
+        url = api_url("/JobOpenings/search")
+        response = ZohoJobService._make_request("GET", url, params={"criteria": f"(Posting_Title:equals:{escape_criteria_value(title)})"})
+        if response.status_code != 200:
+            return None
+        for item in response.json().get("data", []):
+            created = item.get("Created_Time")
+            if created and datetime.fromisoformat(created) >= since:
+                return item.get("id")
+        return None
 
     @staticmethod
     def get_jobs():
-        url = f"{ZOHO_API_BASE}/JobOpenings"
-        # Include Client_Name and Job_Opening_Status
-        params = {"fields": "id,Posting_Title,City,Job_Opening_Status,Salary,Industry,Job_Type,Target_Date,Job_Description,Client_Name"} 
-        response = ZohoJobService._make_request("GET", url, params=params)
-        
-        if response.status_code == 200:
+        return cached(job_list_cache, "all", ZohoJobService._fetch_jobs)
+
+    @staticmethod
+    def _fetch_jobs():
+        jobs = []
+        for page in ZohoJobService.iter_job_pages():
+            jobs.extend(page)
+        return jobs
+
+    @staticmethod
+    def _fetch_job_page(page: int, per_page: int, modified_since=None):
+        url = api_url("/JobOpenings")
+        response = ZohoJobService._make_request(
+            "GET", url, params=job_page_params(page, per_page), headers=modified_since_headers(modified_since)
+        )
+        return parse_job_page(response)
+
+    @staticmethod
+    def iter_job_pages(per_page: int = ZOHO_PAGE_SIZE, prefetch: bool = True, modified_since=None):
+        """Yields lists of jobs page by page, following info.more_records.
+
+        With prefetch, the next page is requested on a worker thread while the
+        caller consumes the current one. `modified_since` limits the listing to
+        openings changed after that datetime.
+        """
+        # Run worker fetches in the caller's context so they keep its scheduler priority
+        context = contextvars.copy_context()
+        fetch = lambda page: context.run(ZohoJobService._fetch_job_page, page, per_page, modified_since)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            page = 1
+            future = pool.submit(fetch, page)
+            while future is not None:
+                jobs, more_records = future.result()
+                future = None
+                if more_records and prefetch:
+                    future = pool.submit(fetch, page + 1)
+                yield jobs
+                if more_records and not prefetch:
+                    future = pool.submit(fetch, page + 1)
+                page += 1
+
+    @staticmethod
+    def iter_jobs(per_page: int = ZOHO_PAGE_SIZE, prefetch: bool = True):
+        for page in ZohoJobService.iter_job_pages(per_page, prefetch):
+            yield from page
+
+    @staticmethod
+    def iter_modified_candidates(modified_since=None, per_page: int = ZOHO_PAGE_SIZE):
+        """Yields raw Candidates records changed after `modified_since`."""
+        url = api_url("/Candidates")
+        page = 1
+        while True:
+            params = {"fields": CANDIDATE_SYNC_FIELDS, "page": page, "per_page": per_page}
+            response = ZohoJobService._make_request("GET", url, params=params, headers=modified_since_headers(modified_since))
+            if response.status_code in [204, 304]:
+                return
+            if response.status_code != 200:
+                raise Exception(f"Zoho API Error: {response.status_code} - {response.text}")
             data = response.json()
-            jobs = []
-            for item in data.get("data", []):
-                jobs.append({
-                    "id": item.get("id"),
-                    "title": item.get("Posting_Title"),
-                    "location": item.get("City"),
-                    "salary_range": item.get("Salary"),
-                    "industry": item.get("Industry"),
-                    "job_type": item.get("Job_Type"),
-                    "target_date": item.get("Target_Date"),
-                    "description": item.get("Job_Description") or "No description",
-                    "client_name": item.get("Client_Name").get("name") if isinstance(item.get("Client_Name"), dict) else item.get("Client_Name"),
-                    "status": item.get("Job_Opening_Status"),
-                })
-            return jobs
-        if response.status_code == 204: # Zoho 'No Content'
-            return []
-        raise Exception(f"Zoho API Error: {response.status_code} - {response.text}")
+            yield from data.get("data", [])
+            if not data.get("info", {}).get("more_records"):
+                return
+            page += 1
+
+    @staticmethod
+    def get_jobs_by_ids(job_ids):
+        """Current JobOpenings records (mapped) for the given ids, 100 per call; deleted ids are absent."""
+        jobs = []
+        for start in range(0, len(job_ids), ZOHO_BULK_LIMIT):
+            params = {"ids": ",".join(job_ids[start:start + ZOHO_BULK_LIMIT]), "fields": JOB_LIST_FIELDS}
+            response = ZohoJobService._make_request("GET", api_url("/JobOpenings"), params=params)
+            jobs.extend(parse_job_page(response)[0])
+        return jobs
+
+    @staticmethod
+    def get_candidates_by_ids(candidate_ids):
+        """Raw Candidates records (sync fields only) for the given ids, 100 per call."""
+        records = []
+        for start in range(0, len(candidate_ids), ZOHO_BULK_LIMIT):
+            params = {"ids": ",".join(candidate_ids[start:start + ZOHO_BULK_LIMIT]), "fields": CANDIDATE_SYNC_FIELDS}
+            response = ZohoJobService._make_request("GET", api_url("/Candidates"), params=params)
+            if response.status_code == 200:
+                records.extend(response.json().get("data", []))
+            elif response.status_code != 204:
+                raise Exception(f"Zoho API Error: {response.status_code} - {response.text}")
+        return records
+
+    @staticmethod
+    def watch_notifications(channel_id: str, notify_url: str, token: str, events, expiry=None):
+        """Subscribes (or renews) a Zoho notification channel posting to `notify_url`."""
+        watch = {"channel_id": channel_id, "events": list(events), "notify_url": notify_url, "token": token}
+        if expiry is not None:
+            watch["channel_expiry"] = expiry.isoformat(timespec="seconds")
+        response = ZohoJobService._make_request("POST", api_url("/actions/watch"), json={"watch": [watch]})
+        if response.status_code not in (200, 201):
+            raise Exception(f"Failed to enable Zoho notifications: {response.status_code} - {response.text}")
+        return response.json()
 
     @staticmethod
     def archive_job(job_id: str):
-        url = f"{ZOHO_API_BASE}/JobOpenings/{job_id}"
-        payload = {
-            "data": [
-                {
-                    "Job_Opening_Status": "Cancelled" # Or "Archived" if custom, using Cancelled as standard
-                }
-            ]
-        }
-        response = ZohoJobService._make_request("PUT", url, json=payload)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("data") and data["data"][0]["status"] == "success":
-                return True
-        raise Exception(f"Failed to archive job in Zoho: {response.text}")
+        url = api_url(f"/JobOpenings/{job_id}")
+        response = ZohoJobService._make_request("PUT", url, json=build_archive_payload())
+        parse_archive_response(response)
+        invalidate_job(job_id)
+        events.publish(events.JOB_ARCHIVED, {"job_id": job_id, "status": "Cancelled"})
+        return True
 
     @staticmethod
     def get_job_details(job_id: str):
-        url = f"{ZOHO_API_BASE}/JobOpenings/{job_id}"
+        return cached(job_cache, job_id, lambda: ZohoJobService._fetch_job_details(job_id))
+
+    @staticmethod
+    def _fetch_job_details(job_id: str):
+        url = api_url(f"/JobOpenings/{job_id}")
         response = ZohoJobService._make_request("GET", url)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("data"):
-                return data["data"][0]
-        return None
+        return parse_single_record(response)
 
     @staticmethod
     def get_associated_candidates(job_id: str):
+        return cached(candidates_cache, job_id, lambda: ZohoJobService._fetch_associated_candidates(job_id))
+
+    @staticmethod
+    def _fetch_associated_candidates(job_id: str):
         # Use the correct related list endpoint for associated candidates
-        url = f"{ZOHO_API_BASE}/Job_Openings/{job_id}/associate"
+        url = api_url(f"/Job_Openings/{job_id}/associate")
         response = ZohoJobService._make_request("GET", url)
-        
-        if response.status_code == 200:
-            data = response.json()
-            candidates = []
-            for item in data.get("data", []):
-                candidates.append({
-                    "id": item.get("id"),
-                    "first_name": item.get("First_Name"),
-                    "last_name": item.get("Last_Name"),
-                    "email": item.get("Email"),
-                    "phone": item.get("Phone") or item.get("Mobile"),
-                    "status": item.get("Application_Status") or item.get("Candidate_Stage") or "Applied",
-                    "applied_date": item.get("Created_Time", "").split('T')[0],
-                    "resume_url": item.get("resume_url"), # Note: Resume handle might require extra API calls
-                    "job_id": job_id
-                })
-            return candidates
-        return []
+        return parse_associated_candidates(response, job_id)
 
     @staticmethod
     def get_candidate_details(candidate_id: str):
-        url = f"{ZOHO_API_BASE}/Candidates/{candidate_id}"
+        return cached(candidate_cache, candidate_id, lambda: ZohoJobService._fetch_candidate_details(candidate_id))
+
+    @staticmethod
+    def _fetch_candidate_details(candidate_id: str):
+        url = api_url(f"/Candidates/{candidate_id}")
         response = ZohoJobService._make_request("GET", url)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("data"):
-                # Return raw Zoho data, mapping can be done in router or frontend if needed
-                return data["data"][0]
-        return None
+        # Return raw Zoho data, mapping can be done in router or frontend if needed
+        return parse_single_record(response)
 
     @staticmethod
     def update_candidate_status(job_id: str, candidate_id: str, status: str):
         # For associated candidates, the most reliable way is often updating via the association endpoint
         # or updating the 'Application_Status' if that's what we're filtering on.
         # We'll try updating both the association status and the candidate record.
+        payload, payload_assoc = build_candidate_status_payloads(candidate_id, status)
         
         # 1. Update Candidate record
-        url = f"{ZOHO_API_BASE}/Candidates/{candidate_id}"
-        payload = {
-            "data": [
-                {
-                    "Application_Status": status,
-                    "Candidate_Stage": status # Sync both fields for safety
-                }
-            ]
-        }
+        url = api_url(f"/Candidates/{candidate_id}")
         res1 = ZohoJobService._make_request("PUT", url, json=payload)
-        print(f"DEBUG: Candidate update response: {res1.status_code} - {res1.text}")
+        if res1.status_code != 200:
+            logger.warning("Candidate %s record update failed: %s %s", candidate_id, res1.status_code, res1.text)
 
         # 2. Update Association status (this is often the one used in Kanban)
-        # Zoho association update payload typically looks like this
-        url_assoc = f"{ZOHO_API_BASE}/Job_Openings/{job_id}/associate"
-        payload_assoc = {
-            "data": [
-                {
-                    "id": candidate_id,
-                    "Status": status # For association records, the field is often simply 'Status'
-                }
-            ]
-        }
+        url_assoc = api_url(f"/Job_Openings/{job_id}/associate")
         response_assoc = ZohoJobService._make_request("PUT", url_assoc, json=payload_assoc)
-        print(f"DEBUG: Association update response: {response_assoc.status_code} - {response_assoc.text}")
         
         if response_assoc.status_code == 200:
+             invalidate_candidate(job_id, candidate_id)
+             events.publish(events.CANDIDATE_STATUS, {"job_id": job_id, "updates": [{"candidate_id": candidate_id, "status": status}]})
              return True
 
         raise Exception(f"Failed to update status in Zoho: {response_assoc.text}")
@@ -0,0 +1,394 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+import httpx
+from app.services.zoho_auth import ZohoAuthService
+from app.services.cache import (
+    STALE,
+    cached_async,
+    schedule_refresh_async,
+    job_list_cache,
+    job_cache,
+    candidates_cache,
+    candidate_cache,
+    attachments_cache,
+    invalidate_job,
+    invalidate_candidate,
+)
+from app.services.zoho_http import async_zoho_http_clients
+from app.services.tenants import current_tenant
+from app.services import events, zoho_retry
+from app.services.job_query import JobQuery, JOB_FIELD_MAP, apply_query, zoho_criteria, zoho_fields
+from app.services.zoho_jobs import (
+    api_url,
+    ZOHO_PAGE_SIZE,
+    JOB_LIST_FIELDS,
+    build_auth_headers,
+    token_from_headers,
+    build_job_payload,
+    map_created_job,
+    build_archive_payload,
+    build_candidate_status_payloads,
+    build_bulk_status_payloads,
+    parse_bulk_results,
+    ZOHO_BULK_LIMIT,
+    CANDIDATE_DETAIL_FIELDS,
+    parse_create_response,
+    parse_archive_response,
+    parse_single_record,
+    parse_associated_candidates,
+    parse_job_page,
+    job_page_params,
+    map_job,
+    map_attachment,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Max concurrent Zoho calls when hydrating a job's candidates
+ZOHO_FANOUT_CONCURRENCY = int(os.getenv("ZOHO_FANOUT_CONCURRENCY", "5"))
+
+
+class AsyncZohoJobService:
+    """asyncio version of ZohoJobService used by the API routes.
+
+    ZohoJobService stays the sync entry point for scripts.
+    """
+
+    @staticmethod
+    async def _get_headers(force_refresh=False, stale_token=None):
+        token = None if force_refresh else ZohoAuthService.peek_access_token()
+        if not token:
+            # Refresh is a blocking call, keep it off the event loop
+            token = await asyncio.to_thread(ZohoAuthService.get_access_token, force_refresh, stale_token)
+        return build_auth_headers(token)
+
+    @staticmethod
+    async def _make_request(method, url, **kwargs):
+        """Sends one Zoho call under the shared retry policy (see app.services.zoho_retry)."""
+        extra_headers = kwargs.pop("headers", None)
+        http = async_zoho_http_clients.get(current_tenant())
+        return await zoho_retry.send_async(
+            method, url,
+            lambda headers: http.request(method, url, headers=headers, **kwargs),
+            AsyncZohoJobService._get_headers, token_from_headers, httpx.TransportError,
+            extra_headers=extra_headers,
+        )
+
+    @staticmethod
+    @asynccontextmanager
+    async def _stream_request(method, url, **kwargs):
+        """_make_request for large bodies: yields the response before its body is read.
+
+        Retries and the 401 refresh only apply until the response is handed
+        over; errors while the caller reads the body are not retried.
+        """
+        http = async_zoho_http_clients.get(current_tenant())
+        response = await zoho_retry.send_async(
+            method, url,
+            lambda headers: http.request(method, url, headers=headers, stream=True, **kwargs),
+            AsyncZohoJobService._get_headers, token_from_headers, httpx.TransportError,
+            stream=True,
+        )
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    @staticmethod
+    async def create_job(job_data: dict):
+        url = api_url("/JobOpenings")
+        response = await AsyncZohoJobService._make_request("POST", url, json=build_job_payload(job_data))
+        zoho_id = parse_create_response(response)
+        invalidate_job()
+        events.publish(events.JOB_CREATED, {"job": map_created_job(job_data, zoho_id)})
+        return zoho_id
+
+    @staticmethod
+    async def get_jobs():
+        return await cached_async(job_list_cache, "all", AsyncZohoJobService._fetch_jobs)
+
+    @staticmethod
+    async def _fetch_jobs():
+        jobs = []
+        async for page in AsyncZohoJobService.iter_job_pages():
+            jobs.extend(page)
+        return jobs
+
+    @staticmethod
+    async def _fetch_job_page(page: int, per_page: int):
+        url = api_url("/JobOpenings")
+        response = await AsyncZohoJobService._make_request("GET", url, params=job_page_params(page, per_page))
+        return parse_job_page(response)
+
+    @staticmethod
+    async def iter_job_pages(per_page: int = ZOHO_PAGE_SIZE, prefetch: bool = True):
+        """Yields lists of jobs page by page; with prefetch the next page is
+        requested in a task while the caller consumes the current one."""
+        page = 1
+        pending = asyncio.ensure_future(AsyncZohoJobService._fetch_job_page(page, per_page))
+        try:
+            while pending is not None:
+                jobs, more_records = await pending
+                pending = None
+                if more_records and prefetch:
+                    pending = asyncio.ensure_future(AsyncZohoJobService._fetch_job_page(page + 1, per_page))
+                yield jobs
+                if more_records and not prefetch:
+                    pending = asyncio.ensure_future(AsyncZohoJobService._fetch_job_page(page + 1, per_page))
+                page += 1
+        finally:
+            # Consumer stopped early (e.g. client disconnected)
+            if pending is not None:
+                pending.cancel()
+
+    @staticmethod
+    async def stream_job_pages():
+        """Like iter_job_pages, but served from the job list cache when possible.
+
+        A full uncached pass fills the cache once the last page arrives.
+        """
+        state, cached_jobs = job_list_cache.lookup("all")
+        if state is not None:
+            if state == STALE:
+                schedule_refresh_async(job_list_cache, "all", AsyncZohoJobService._fetch_jobs)
+            yield cached_jobs
+            return
+
+        jobs = []
+        async for page in AsyncZohoJobService.iter_job_pages():
+            jobs.extend(page)
+            yield page
+        job_list_cache.set("all", jobs)
+
+    @staticmethod
+    async def find_jobs(query: JobQuery):
+        """Filtered / sorted / projected job list, cached per distinct query."""
+        return await cached_async(job_list_cache, query.cache_key(), lambda: AsyncZohoJobService._fetch_matching_jobs(query))
+
+    @staticmethod
+    async def _fetch_matching_jobs(query: JobQuery):
+        if query.ids:
+            return apply_query(await AsyncZohoJobService._fetch_jobs_by_ids(query), query)
+        criteria = zoho_criteria(query)
+        if criteria:
+            # Zoho's search endpoint takes criteria but not fields / sort_by
+            url = api_url("/JobOpenings/search")
+            params = {"criteria": criteria}
+        else:
+            url = api_url("/JobOpenings")
+            params = {"fields": zoho_fields(query, JOB_LIST_FIELDS)}
+            if query.sort:
+                params["sort_by"] = JOB_FIELD_MAP[query.sort.lstrip("-")]
+                params["sort_order"] = "desc" if query.sort.startswith("-") else "asc"
+
+        jobs = []
+        page = 1
+        while True:
+            response = await AsyncZohoJobService._make_request(
+                "GET", url, params={**params, "page": page, "per_page": ZOHO_PAGE_SIZE}
+            )
+            page_jobs, more_records = parse_job_page(response)
+            jobs.extend(page_jobs)
+            if not more_records:
+                break
+            page += 1
+        # Zoho matching is coarser than ours (and projection is local), so re-apply
+        return apply_query(jobs, query)
+
+    @staticmethod
+    async def _fetch_jobs_by_ids(query: JobQuery):
+        """The query's ids straight from Zoho, 100 per call, instead of scanning the list.
+
+        Other filters and the sort are applied locally by the caller, so the
+        projection is only pushed down when there are none.
+        """
+        local = zoho_criteria(query) or query.sort
+        fields = JOB_LIST_FIELDS if local else zoho_fields(query, JOB_LIST_FIELDS)
+        url = api_url("/JobOpenings")
+        chunks = [query.ids[start:start + ZOHO_BULK_LIMIT] for start in range(0, len(query.ids), ZOHO_BULK_LIMIT)]
+        responses = await asyncio.gather(*[
+            AsyncZohoJobService._make_request("GET", url, params={"ids": ",".join(chunk), "fields": fields})
+            for chunk in chunks
+        ])
+        return [job for response in responses for job in parse_job_page(response)[0]]
+
+    @staticmethod
+    async def archive_job(job_id: str):
+        url = api_url(f"/JobOpenings/{job_id}")
+        response = await AsyncZohoJobService._make_request("PUT", url, json=build_archive_payload())
+        parse_archive_response(response)
+        invalidate_job(job_id)
+        events.publish(events.JOB_ARCHIVED, {"job_id": job_id, "status": "Cancelled"})
+        return True
+
+    @staticmethod
+    async def get_job_details(job_id: str):
+        return await cached_async(job_cache, job_id, lambda: AsyncZohoJobService._fetch_job_details(job_id))
+
+    @staticmethod
+    async def _fetch_job_details(job_id: str):
+        url = api_url(f"/JobOpenings/{job_id}")
+        response = await AsyncZohoJobService._make_request("GET", url)
+        return parse_single_record(response)
+
+    @staticmethod
+    async def get_associated_candidates(job_id: str):
+        return await cached_async(candidates_cache, job_id, lambda: AsyncZohoJobService._fetch_associated_candidates(job_id))
+
+    @staticmethod
+    async def _fetch_associated_candidates(job_id: str):
+        url = api_url(f"/Job_Openings/{job_id}/associate")
+        response = await AsyncZohoJobService._make_request("GET", url)
+        return parse_associated_candidates(response, job_id)
+
+    @staticmethod
+    async def get_candidate_details(candidate_id: str):
+        return await cached_async(candidate_cache, candidate_id, lambda: AsyncZohoJobService._fetch_candidate_details(candidate_id))
+
+    @staticmethod
+    async def _fetch_candidate_details(candidate_id: str):
+        url = api_url(f"/Candidates/{candidate_id}")
+        response = await AsyncZohoJobService._make_request("GET", url)
+        return parse_single_record(response)
+
+    @staticmethod
+    async def get_candidate_attachments(candidate_id: str):
+        return await cached_async(attachments_cache, candidate_id, lambda: AsyncZohoJobService._fetch_candidate_attachments(candidate_id))
+
+    @staticmethod
+    async def _fetch_candidate_attachments(candidate_id: str):
+        url = api_url(f"/Candidates/{candidate_id}/Attachments")
+        response = await AsyncZohoJobService._make_request("GET", url)
+        if response.status_code == 200:
+            return [map_attachment(item, candidate_id) for item in response.json().get("data", [])]
+        if response.status_code == 204:
+            return []
+        raise Exception(f"Failed to list attachments in Zoho: {response.text}")
+
+    @staticmethod
+    def stream_attachment(candidate_id: str, attachment_id: str):
+        """Async context manager yielding Zoho's download response, body unread."""
+        url = api_url(f"/Candidates/{candidate_id}/Attachments/{attachment_id}")
+        return AsyncZohoJobService._stream_request("GET", url)
+
+    @staticmethod
+    async def update_candidate_status(job_id: str, candidate_id: str, status: str):
+        payload, payload_assoc = build_candidate_status_payloads(candidate_id, status)
+
+        # 1. Update Candidate record
+        url = api_url(f"/Candidates/{candidate_id}")
+        res1 = await AsyncZohoJobService._make_request("PUT", url, json=payload)
+        if res1.status_code != 200:
+            logger.warning("Candidate %s record update failed: %s %s", candidate_id, res1.status_code, res1.text)
+
+        # 2. Update Association status (this is often the one used in Kanban)
+        url_assoc = api_url(f"/Job_Openings/{job_id}/associate")
+        response_assoc = await AsyncZohoJobService._make_request("PUT", url_assoc, json=payload_assoc)
+
+        if response_assoc.status_code == 200:
+            invalidate_candidate(job_id, candidate_id)
+            events.publish(events.CANDIDATE_STATUS, {"job_id": job_id, "updates": [{"candidate_id": candidate_id, "status": status}]})
+            return True
+
+        raise Exception(f"Failed to update status in Zoho: {response_assoc.text}")
+
+    @staticmethod
+    async def bulk_update_candidate_status(job_id: str, updates):
+        """Moves many candidates at once; `updates` is [(candidate_id, status)].
+
+        Each chunk of up to 100 records costs one candidate PUT and one
+        association PUT, sent concurrently. Returns one result per update so a
+        rejected record doesn't fail the batch.
+        """
+        chunks = [updates[i:i + ZOHO_BULK_LIMIT] for i in range(0, len(updates), ZOHO_BULK_LIMIT)]
+        chunk_results = await asyncio.gather(
+            *[AsyncZohoJobService._bulk_update_chunk(job_id, chunk) for chunk in chunks]
+        )
+        results = [result for results in chunk_results for result in results]
+        moved = [{"candidate_id": result["candidate_id"], "status": result["status"]} for result in results if result["success"]]
+        if moved:
+            # One event for the whole batch
+            events.publish(events.CANDIDATE_STATUS, {"job_id": job_id, "updates": moved})
+        return results
+
+    @staticmethod
+    async def _bulk_update_chunk(job_id: str, chunk):
+        payload, payload_assoc = build_bulk_status_payloads(chunk)
+        res_candidates, res_assoc = await asyncio.gather(
+            AsyncZohoJobService._make_request("PUT", api_url("/Candidates"), json=payload),
+            AsyncZohoJobService._make_request("PUT", api_url(f"/Job_Openings/{job_id}/associate"), json=payload_assoc),
+        )
+        candidate_results = parse_bulk_results(res_candidates, len(chunk))
+        assoc_results = parse_bulk_results(res_assoc, len(chunk))
+
+        results = []
+        for (candidate_id, status), (record_ok, record_error), (assoc_ok, assoc_error) in zip(chunk, candidate_results, assoc_results):
+            # As with the single update, the association status is what the Kanban shows
+            if assoc_ok:
+                invalidate_candidate(job_id, candidate_id)
+            results.append({
+                "candidate_id": candidate_id,
+                "status": status,
+                "success": assoc_ok,
+                "error": assoc_error,
+                "candidate_record_error": None if record_ok else record_error,
+            })
+        return results
+
+    @staticmethod
+    async def get_candidate_details_batch(candidate_ids):
+        """Full Candidate records keyed by id, fetched with as few calls as possible.
+
+        Cached records are reused; the rest are requested 100 at a time with
+        Zoho's ids= parameter, at most ZOHO_FANOUT_CONCURRENCY in parallel.
+        """
+        records = {}
+        missing = []
+        for candidate_id in candidate_ids:
+            state, record = candidate_cache.lookup(candidate_id)
+            if state is not None:
+                records[candidate_id] = record
+            else:
+                missing.append(candidate_id)
+
+        semaphore = asyncio.Semaphore(ZOHO_FANOUT_CONCURRENCY)
+
+        async def fetch_chunk(chunk):
+            async with semaphore:
+                response = await AsyncZohoJobService._make_request(
+                    "GET", api_url("/Candidates"), params={"ids": ",".join(chunk)}
+                )
+            if response.status_code == 200:
+                return response.json().get("data", [])
+            if response.status_code == 204:
+                return []
+            # ids= not accepted for this org; fall back to one call per record
+            return await asyncio.gather(*[fetch_one(candidate_id) for candidate_id in chunk])
+
+        async def fetch_one(candidate_id):
+            async with semaphore:
+                return await AsyncZohoJobService._fetch_candidate_details(candidate_id)
+
+        chunks = [missing[i:i + ZOHO_BULK_LIMIT] for i in range(0, len(missing), ZOHO_BULK_LIMIT)]
+        for chunk_records in await asyncio.gather(*[fetch_chunk(chunk) for chunk in chunks]):
+            for record in chunk_records:
+                if record:
+                    records[record["id"]] = record
+                    candidate_cache.set(record["id"], record)
+        return records
+
+    @staticmethod
+    async def hydrate_candidates(candidates):
+        """Merges the detail fields the UI needs into association-list candidates."""
+        records = await AsyncZohoJobService.get_candidate_details_batch([c["id"] for c in candidates])
+        hydrated = []
+        for candidate in candidates:
+            record = records.get(candidate["id"]) or {}
+            hydrated.append({
+                **candidate,
+                "details": {field: record.get(field) for field in CANDIDATE_DETAIL_FIELDS},
+            })
+        return hydrated
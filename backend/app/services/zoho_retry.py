@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import time
+from app.services.tenants import current_tenant
+from app.services.zoho_scheduler import zoho_schedulers
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+# The policy every Zoho call goes through, whichever transport sends it
+# (requests in ZohoJobService, httpx in AsyncZohoJobService, streamed
+# downloads): the tenant's scheduler admits each attempt, a 401 refreshes
+# the token and resends once, and 429s, 5xx and transport errors are retried
+# after Retry-After or backoff, as ZohoScheduler.retry_delay decides.
+# send() and send_async() only differ in how they wait.
+
+# ZohoCall.received: resend with a refreshed token
+REFRESH = "refresh"
+
+
+class ZohoCall:
+    """Retry state of one logical Zoho call: metrics, logging and decisions."""
+
+    def __init__(self, method: str, url: str, log_body: bool = True):
+        self.method = method
+        self.url = url
+        self.tenant = current_tenant()
+        self.scheduler = zoho_schedulers.get(self.tenant)
+        self.endpoint = metrics.zoho_endpoint(url, self.tenant.api_base)
+        # Streamed bodies are unread when the response arrives
+        self.log_body = log_body
+        self.refreshed = False
+        self.attempt = 0
+        self._started = 0.0
+
+    def sending(self):
+        self._started = time.perf_counter()
+
+    def failed(self, error: Exception) -> float:
+        """Seconds before retrying a transport error; re-raises it when the call should give up."""
+        metrics.record_zoho_call(self.tenant.id, self.method, self.endpoint, "error", time.perf_counter() - self._started)
+        logger.warning("Zoho %s %s failed: %s", self.method, self.endpoint, error)
+        delay = self.scheduler.retry_delay(self.method, self.attempt)
+        if delay is None:
+            raise error
+        return self._retrying(delay)
+
+    def received(self, response):
+        """Records the response and says what to do with it.
+
+        Returns REFRESH to resend with a fresh token, a delay in seconds to
+        retry, or None when `response` is the outcome.
+        """
+        metrics.record_zoho_call(self.tenant.id, self.method, self.endpoint, response.status_code, time.perf_counter() - self._started)
+        if self.log_body and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Zoho %s %s -> %s: %s", self.method, self.url, response.status_code, response.text[:2000])
+        if response.status_code == 401 and not self.refreshed:
+            self.refreshed = True
+            return REFRESH
+        delay = self.scheduler.retry_delay(self.method, self.attempt, response)
+        return None if delay is None else self._retrying(delay)
+
+    def _retrying(self, delay: float) -> float:
+        metrics.ZOHO_RETRIES.labels(self.tenant.id, self.method, self.endpoint).inc()
+        logger.info("Zoho %s %s retry %d in %.2fs", self.method, self.endpoint, self.attempt + 1, delay)
+        self.attempt += 1
+        return delay
+
+
+def send(method: str, url: str, attempt, get_headers, token_from_headers, errors, extra_headers=None):
+    """Runs `attempt(headers)` under the retry policy; blocking.
+
+    `get_headers(force_refresh, stale_token)` returns the auth headers. The
+    rejected token is passed on a 401 so concurrent 401s share one refresh.
+    """
+    call = ZohoCall(method, url)
+    extra_headers = extra_headers or {}
+    headers = {**get_headers(), **extra_headers}
+    while True:
+        call.scheduler.acquire()
+        call.sending()
+        try:
+            response = attempt(headers)
+        except errors as e:
+            delay = call.failed(e)
+        else:
+            delay = call.received(response)
+            if delay is None:
+                return response
+            response.close()
+            if delay == REFRESH:
+                headers = {**get_headers(True, token_from_headers(headers)), **extra_headers}
+                continue
+        time.sleep(delay)
+
+
+async def send_async(method: str, url: str, attempt, get_headers, token_from_headers, errors, extra_headers=None, stream: bool = False):
+    """send() for coroutines: `attempt(headers)` and `get_headers` are awaited.
+
+    With `stream` the response body is left unread for the caller, who must
+    close it; failures while reading it are not retried.
+    """
+    call = ZohoCall(method, url, log_body=not stream)
+    extra_headers = extra_headers or {}
+    headers = {**await get_headers(), **extra_headers}
+    while True:
+        await call.scheduler.acquire_async()
+        call.sending()
+        try:
+            response = await attempt(headers)
+        except errors as e:
+            delay = call.failed(e)
+        else:
+            delay = call.received(response)
+            if delay is None:
+                return response
+            await response.aclose()
+            if delay == REFRESH:
+                headers = {**await get_headers(True, token_from_headers(headers)), **extra_headers}
+                continue
+        await asyncio.sleep(delay)
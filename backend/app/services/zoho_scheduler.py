@@ -0,0 +1,242 @@
+import asyncio
+import contextvars
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from dotenv import load_dotenv
+from app.services.tenants import TenantRegistry
+
+load_dotenv()
+
+# Size the bucket to the org's Zoho API credit allowance
+ZOHO_RATE_LIMIT_PER_MINUTE = float(os.getenv("ZOHO_RATE_LIMIT_PER_MINUTE", "100"))
+ZOHO_RATE_BURST = float(os.getenv("ZOHO_RATE_BURST", "20"))
+# Share of the bucket that only interactive requests may use
+ZOHO_INTERACTIVE_RESERVE = float(os.getenv("ZOHO_INTERACTIVE_RESERVE", "0.25"))
+ZOHO_MAX_RETRIES = int(os.getenv("ZOHO_MAX_RETRIES", "4"))
+ZOHO_BACKOFF_BASE = float(os.getenv("ZOHO_BACKOFF_BASE", "0.5"))
+ZOHO_BACKOFF_MAX = float(os.getenv("ZOHO_BACKOFF_MAX", "30"))
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+PRIORITIES = [INTERACTIVE, BACKGROUND]
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+
+_priority = contextvars.ContextVar("zoho_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def background_priority():
+    """Marks Zoho calls made inside the block (e.g. sync cycles) as background work."""
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority():
+    return _priority.get()
+
+
+class ZohoScheduler:
+    """Token bucket in front of every Zoho call, plus the retry/backoff policy.
+
+    Background callers may not take the last `interactive_reserve` share of
+    the bucket, so dashboard reads keep flowing while a sync is running. A
+    429 (or an exhausted X-RATELIMIT-REMAINING) pauses everyone until Zoho's
+    Retry-After / reset time.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float = ZOHO_RATE_LIMIT_PER_MINUTE,
+        burst: float = ZOHO_RATE_BURST,
+        interactive_reserve: float = ZOHO_INTERACTIVE_RESERVE,
+        max_retries: int = ZOHO_MAX_RETRIES,
+    ):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst
+        self.reserve = burst * interactive_reserve
+        self.max_retries = max_retries
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._waiting = {priority: 0 for priority in PRIORITIES}
+        self._acquired = {priority: 0 for priority in PRIORITIES}
+        self._throttled = {priority: 0 for priority in PRIORITIES}
+        self._throttle_seconds = {priority: 0.0 for priority in PRIORITIES}
+        self._retries = 0
+        self._rate_limited = 0
+        self._server_errors = 0
+        self._transport_errors = 0
+        self._last_remaining = None
+
+    # --- Token bucket -------------------------------------------------------
+
+    def _try_acquire(self, priority: str):
+        """Takes a token and returns 0, or returns how long to wait before retrying."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if now < self._paused_until:
+                return self._paused_until - now
+            floor = self.reserve if priority == BACKGROUND else 0.0
+            if self._tokens - 1 >= floor:
+                self._tokens -= 1
+                self._acquired[priority] += 1
+                return 0.0
+            return (floor + 1 - self._tokens) / self.rate
+
+    def _begin_wait(self, priority: str):
+        with self._lock:
+            self._waiting[priority] += 1
+            self._throttled[priority] += 1
+
+    def _end_wait(self, priority: str, waited: float):
+        with self._lock:
+            self._waiting[priority] -= 1
+            self._throttle_seconds[priority] += waited
+
+    def acquire(self):
+        priority = current_priority()
+        wait = self._try_acquire(priority)
+        if not wait:
+            return
+        started = time.monotonic()
+        self._begin_wait(priority)
+        try:
+            while wait:
+                time.sleep(wait)
+                wait = self._try_acquire(priority)
+        finally:
+            self._end_wait(priority, time.monotonic() - started)
+
+    async def acquire_async(self):
+        priority = current_priority()
+        wait = self._try_acquire(priority)
+        if not wait:
+            return
+        started = time.monotonic()
+        self._begin_wait(priority)
+        try:
+            while wait:
+                await asyncio.sleep(wait)
+                wait = self._try_acquire(priority)
+        finally:
+            self._end_wait(priority, time.monotonic() - started)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    # --- Retry policy -------------------------------------------------------
+
+    def _backoff(self, attempt: int):
+        # Full jitter: uniform in [0, base * 2^attempt], capped
+        return random.uniform(0, min(ZOHO_BACKOFF_MAX, ZOHO_BACKOFF_BASE * (2 ** attempt)))
+
+    def _retry_after(self, headers):
+        value = headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    def _observe_rate_headers(self, headers):
+        remaining = headers.get("X-RATELIMIT-REMAINING")
+        if remaining is None:
+            return
+        try:
+            self._last_remaining = int(remaining)
+        except ValueError:
+            return
+        reset = headers.get("X-RATELIMIT-RESET")
+        if self._last_remaining <= 0 and reset:
+            try:
+                # Zoho sends the reset time as epoch milliseconds
+                self.pause(max(int(reset) / 1000.0 - time.time(), 0.0))
+            except ValueError:
+                pass
+
+    def retry_delay(self, method: str, attempt: int, response=None):
+        """Seconds to wait before retrying, or None if the outcome is final.
+
+        `response` is None when the request failed at the transport level.
+        Non-idempotent calls (POST) are only retried on 429, where Zoho has
+        rejected the request without processing it.
+        """
+        # Counters are shared by the requests threads and the event loop
+        if response is not None:
+            self._observe_rate_headers(response.headers)
+            status = response.status_code
+            if status not in RETRYABLE_STATUS:
+                return None
+            if status == 429:
+                with self._lock:
+                    self._rate_limited += 1
+            else:
+                with self._lock:
+                    self._server_errors += 1
+                if method.upper() not in IDEMPOTENT_METHODS:
+                    return None
+        else:
+            with self._lock:
+                self._transport_errors += 1
+            if method.upper() not in IDEMPOTENT_METHODS:
+                return None
+
+        if attempt >= self.max_retries:
+            return None
+        with self._lock:
+            self._retries += 1
+        delay = self._retry_after(response.headers) if response is not None else None
+        if delay is None:
+            delay = self._backoff(attempt)
+        if response is not None and response.status_code == 429:
+            # Everyone backs off, not just this caller
+            self.pause(delay)
+        return delay
+
+    def stats(self):
+        with self._lock:
+            return {
+                "rate_per_minute": round(self.rate * 60, 2),
+                "burst": self.capacity,
+                "tokens": round(self._tokens, 2),
+                "paused_for": round(max(self._paused_until - time.monotonic(), 0.0), 2),
+                "queue_depth": dict(self._waiting),
+                "acquired": dict(self._acquired),
+                "throttled": dict(self._throttled),
+                "throttle_seconds": {key: round(value, 3) for key, value in self._throttle_seconds.items()},
+                "retries": self._retries,
+                "rate_limited": self._rate_limited,
+                "server_errors": self._server_errors,
+                "transport_errors": self._transport_errors,
+                "zoho_ratelimit_remaining": self._last_remaining,
+            }
+
+
+zoho_scheduler = ZohoScheduler()
+
+# Each tenant spends its own org's API credits, so each gets its own bucket
+zoho_schedulers = TenantRegistry(
+    lambda tenant: ZohoScheduler(
+        rate_per_minute=tenant.rate_limit_per_minute or ZOHO_RATE_LIMIT_PER_MINUTE,
+        burst=tenant.burst or ZOHO_RATE_BURST,
+    ),
+    zoho_scheduler,
+)
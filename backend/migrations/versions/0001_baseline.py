@@ -0,0 +1,46 @@
+"""Baseline schema: user, jobposting
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+The original app never created a candidate table (the model was not
+importable); 0002 adds it.
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "user",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("username", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("password_hash", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "jobposting",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("zoho_id", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("description", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("location", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("industry", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("job_type", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("salary_range", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("experience_required", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("target_date", sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+def downgrade():
+    op.drop_table("jobposting")
+    op.drop_table("user")
@@ -0,0 +1,106 @@
+"""Candidate mirror table, Zoho mirror columns, sync state and job outbox
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+Databases created with create_all before migrations existed may already
+have some of these columns and tables, so each step checks first.
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def _columns(table):
+    return {column["name"] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade():
+    job_columns = _columns("jobposting")
+    with op.batch_alter_table("jobposting") as batch:
+        batch.alter_column("target_date", existing_type=sa.Date(), nullable=True)
+        if "client_name" not in job_columns:
+            batch.add_column(sa.Column("client_name", sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        if "status" not in job_columns:
+            batch.add_column(sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        if "modified_time" not in job_columns:
+            batch.add_column(sa.Column("modified_time", sqlmodel.sql.sqltypes.UTCDateTime(), nullable=True))
+
+    tables = _tables()
+    if "candidate" not in tables:
+        op.create_table(
+            "candidate",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("zoho_id", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("job_id", sa.Integer(), nullable=False),
+            sa.Column("first_name", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("last_name", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("email", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("phone", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("resume_url", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("applied_date", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("modified_time", sqlmodel.sql.sqltypes.UTCDateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["job_id"], ["jobposting.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    else:
+        # Created by create_all once the candidate model became importable
+        candidate_columns = _columns("candidate")
+        with op.batch_alter_table("candidate") as batch:
+            for name in ["first_name", "last_name", "email", "applied_date"]:
+                batch.alter_column(name, existing_type=sqlmodel.sql.sqltypes.AutoString(), nullable=True)
+            if "modified_time" not in candidate_columns:
+                batch.add_column(sa.Column("modified_time", sqlmodel.sql.sqltypes.UTCDateTime(), nullable=True))
+
+    if "syncstate" not in tables:
+        op.create_table(
+            "syncstate",
+            sa.Column("entity", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("last_modified", sqlmodel.sql.sqltypes.UTCDateTime(), nullable=True),
+            sa.Column("last_synced_at", sqlmodel.sql.sqltypes.UTCDateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("entity"),
+        )
+    if "joboutbox" not in tables:
+        op.create_table(
+            "joboutbox",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("job_id", sa.Integer(), nullable=False),
+            sa.Column("target", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("idempotency_key", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("next_attempt_at", sqlmodel.sql.sqltypes.UTCDateTime(), nullable=False),
+            sa.Column("claimed_at", sqlmodel.sql.sqltypes.UTCDateTime(), nullable=True),
+            sa.Column("last_error", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("result", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("created_at", sqlmodel.sql.sqltypes.UTCDateTime(), nullable=False),
+            sa.Column("updated_at", sqlmodel.sql.sqltypes.UTCDateTime(), nullable=False),
+            sa.ForeignKeyConstraint(["job_id"], ["jobposting.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_joboutbox_idempotency_key", "joboutbox", ["idempotency_key"], unique=True)
+        op.create_index("ix_joboutbox_job_id", "joboutbox", ["job_id"])
+        op.create_index("ix_joboutbox_status", "joboutbox", ["status"])
+        op.create_index("ix_joboutbox_next_attempt_at", "joboutbox", ["next_attempt_at"])
+
+
+def downgrade():
+    op.drop_table("joboutbox")
+    op.drop_table("syncstate")
+    op.drop_table("candidate")
+    with op.batch_alter_table("jobposting") as batch:
+        batch.drop_column("modified_time")
+        batch.drop_column("status")
+        batch.drop_column("client_name")
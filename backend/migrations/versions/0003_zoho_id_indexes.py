@@ -0,0 +1,44 @@
+"""Indexes and unique constraints on Zoho ids
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+jobposting.zoho_id becomes unique. Candidates are unique per
+(job_id, zoho_id), not per zoho_id, since one candidate can be associated
+with several jobs. (job_id, status) backs the per-job pipeline queries.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows saved one by one before this revision may repeat a Zoho id; keep the newest
+    op.execute(
+        "DELETE FROM candidate WHERE zoho_id IS NOT NULL AND id NOT IN "
+        "(SELECT MAX(id) FROM candidate WHERE zoho_id IS NOT NULL GROUP BY job_id, zoho_id)"
+    )
+    op.execute(
+        "UPDATE jobposting SET zoho_id = NULL WHERE zoho_id IS NOT NULL AND id NOT IN "
+        "(SELECT MAX(id) FROM jobposting WHERE zoho_id IS NOT NULL GROUP BY zoho_id)"
+    )
+
+    op.create_index("ix_jobposting_zoho_id", "jobposting", ["zoho_id"], unique=True)
+    op.create_index("ix_candidate_zoho_id", "candidate", ["zoho_id"])
+    op.create_index("ix_candidate_job_status", "candidate", ["job_id", "status"])
+    with op.batch_alter_table("candidate") as batch:
+        batch.create_unique_constraint("uq_candidate_job_zoho", ["job_id", "zoho_id"])
+
+
+def downgrade():
+    with op.batch_alter_table("candidate") as batch:
+        batch.drop_constraint("uq_candidate_job_zoho", type_="unique")
+    op.drop_index("ix_candidate_job_status", table_name="candidate")
+    op.drop_index("ix_candidate_zoho_id", table_name="candidate")
+    op.drop_index("ix_jobposting_zoho_id", table_name="jobposting")
@@ -0,0 +1,26 @@
+"""Candidate search index
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+Full-text index over the mirrored candidates, maintained by triggers (see
+app.services.candidate_search): FTS5 on SQLite, a GIN-indexed tsvector
+table on Postgres. Existing candidates are indexed on upgrade.
+"""
+from alembic import op
+from app.services.candidate_search import create_search_index, drop_search_index
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_search_index(op.get_bind())
+
+
+def downgrade():
+    drop_search_index(op.get_bind())
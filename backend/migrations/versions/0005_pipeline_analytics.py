@@ -0,0 +1,88 @@
+"""Candidate status history and pipeline aggregates
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+Triggers on candidate log every status change to candidatestatuschange;
+app.services.analytics folds the log into the pipeline* tables. Existing
+candidates are logged as entering their current status at their last
+Zoho modification, so the first refresh counts them.
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from app.services.analytics import create_status_log, drop_status_log
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "candidatestatuschange",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("candidate_zoho_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("from_status", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("to_status", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("changed_at", sqlmodel.sql.sqltypes.UTCDateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_candidatestatuschange_job_id", "candidatestatuschange", ["job_id"])
+    op.create_index("ix_candidatestatuschange_job_candidate", "candidatestatuschange", ["job_id", "candidate_zoho_id"])
+    op.create_table(
+        "pipelinecandidate",
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("candidate_zoho_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("entered_at", sqlmodel.sql.sqltypes.UTCDateTime(), nullable=False),
+        sa.Column("furthest_stage", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("job_id", "candidate_zoho_id"),
+    )
+    op.create_table(
+        "pipelinestatusstats",
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("current", sa.Integer(), nullable=False),
+        sa.Column("entered", sa.Integer(), nullable=False),
+        sa.Column("exited", sa.Integer(), nullable=False),
+        sa.Column("seconds_in_status", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("job_id", "status"),
+    )
+    op.create_table(
+        "pipelinestagestats",
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("stage", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("reached", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("job_id", "stage"),
+    )
+    op.create_table(
+        "analyticsstate",
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("last_change_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+    bind = op.get_bind()
+    now = "strftime('%Y-%m-%d %H:%M:%f000', 'now')" if bind.dialect.name == "sqlite" else "now()"
+    op.execute(
+        "INSERT INTO candidatestatuschange (job_id, candidate_zoho_id, from_status, to_status, changed_at) "
+        f"SELECT job_id, zoho_id, NULL, status, coalesce(modified_time, {now}) FROM candidate "
+        "WHERE zoho_id IS NOT NULL ORDER BY id"
+    )
+    create_status_log(bind)
+
+
+def downgrade():
+    drop_status_log(op.get_bind())
+    op.drop_table("analyticsstate")
+    op.drop_table("pipelinestagestats")
+    op.drop_table("pipelinestatusstats")
+    op.drop_table("pipelinecandidate")
+    op.drop_index("ix_candidatestatuschange_job_candidate", table_name="candidatestatuschange")
+    op.drop_index("ix_candidatestatuschange_job_id", table_name="candidatestatuschange")
+    op.drop_table("candidatestatuschange")
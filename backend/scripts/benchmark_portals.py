@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+# Add the parent directory to sys.path to import app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.portal_engine import PortalEngine
+from app.services.portal_manager import PortalManager
+
+# Compares launching a browser per posting (the old behaviour) with the
+# pooled PortalEngine, posting to MockPortal.
+#
+#   python scripts/benchmark_portals.py --jobs 20 --concurrency 4
+
+def sample_job(index: int):
+    return {
+        "title": f"Benchmark Engineer {index}",
+        "description": "Dummy posting used to benchmark portal automation.",
+        "location": "Bangalore, India",
+        "industry": "IT Services",
+        "job_type": "Full Time",
+        "target_date": date.today().isoformat(),
+    }
+
+async def run_cold(portal_name: str, jobs: int):
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as playwright:
+        for index in range(jobs):
+            browser = await playwright.chromium.launch(headless=True)
+            context = await browser.new_context()
+            await PortalManager.get_portal(portal_name).post_job(sample_job(index), context)
+            await browser.close()
+
+def run_pooled(portal_name: str, jobs: int, concurrency: int, recycle_after: int):
+    engine = PortalEngine(concurrency=concurrency, recycle_after=recycle_after, state_dir=tempfile.mkdtemp())
+    try:
+        results = engine.run_many([(portal_name, sample_job(index)) for index in range(jobs)])
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            print(f"⚠️  {len(errors)} postings failed, first error: {errors[0]}")
+        return engine.stats()
+    finally:
+        engine.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark portal posting throughput")
+    parser.add_argument("--portal", default="mock")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--recycle-after", type=int, default=50)
+    parser.add_argument("--skip-cold", action="store_true", help="Only run the pooled engine")
+    args = parser.parse_args()
+
+    print(f"--- Posting {args.jobs} jobs to '{args.portal}' ---")
+
+    if not args.skip_cold:
+        started = time.perf_counter()
+        asyncio.run(run_cold(args.portal, args.jobs))
+        cold = time.perf_counter() - started
+        print(f"Browser per posting : {cold:7.2f}s  ({args.jobs / cold:.2f} jobs/s)")
+
+    started = time.perf_counter()
+    stats = run_pooled(args.portal, args.jobs, args.concurrency, args.recycle_after)
+    pooled = time.perf_counter() - started
+    print(f"Pooled engine       : {pooled:7.2f}s  ({args.jobs / pooled:.2f} jobs/s, concurrency {args.concurrency})")
+    print(f"Browsers launched   : {stats['browsers_launched']} (recycled {stats['browsers_recycled']})")
+    print(f"Avg posting time    : {stats['avg_posting_seconds']:.3f}s")
+    if not args.skip_cold:
+        print(f"Speed-up            : {cold / pooled:.1f}x")
+
+if __name__ == "__main__":
+    main()
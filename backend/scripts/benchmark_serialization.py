@@ -0,0 +1,142 @@
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.models.schemas import CandidateProfile
+from app.services.serialization import FastJSONResponse, orjson
+from app.services.zoho_jobs import map_candidate_profile
+
+# Compares serializing large candidate lists the old way (full Zoho records,
+# response_model=List[dict], stdlib JSONResponse) with the slim response
+# schemas and the orjson response class. Reports CPU time per request and
+# payload bytes, raw and gzipped.
+#
+#   python scripts/benchmark_serialization.py --candidates 2000 --runs 20
+
+# Fields of a Zoho Candidate record besides the ones the UI shows
+ZOHO_SYSTEM_FIELDS = [
+    "Salutation", "Secondary_Email", "Street", "State", "Zip_Code", "Country", "Fax", "Website",
+    "Current_Salary", "Expected_Salary", "Skype_ID", "Twitter", "LinkedIn__s", "Facebook__s",
+    "Source", "Origin", "Rating", "Is_Locked", "Is_Unqualified", "Is_Attachment_Present",
+    "Email_Opt_Out", "Candidate_ID", "Candidate_Status", "No_of_Applications", "Last_Activity_Time",
+    "Last_Mailed_Time", "Updated_On", "Career_Page_Invite_Status", "Source_Tracking",
+    "Associated_Tags", "Educational_Details", "Experience_Details",
+]
+
+
+def _person(rng: random.Random):
+    return {"name": f"Recruiter {rng.randint(1, 20)}", "id": str(rng.randint(10**17, 10**18)), "email": "recruiter@example.com"}
+
+
+def make_record(rng: random.Random, index: int):
+    record = {
+        "id": str(10**17 + index),
+        "First_Name": f"Candidate{index}",
+        "Last_Name": rng.choice(["Rao", "Shah", "Iyer", "Singh", "Das"]),
+        "Email": f"candidate{index}@example.com",
+        "Phone": f"+91 98{rng.randint(10**7, 10**8 - 1)}",
+        "Mobile": None,
+        "Application_Status": rng.choice(["Applied", "Screening", "Interview", "Offered"]),
+        "Candidate_Stage": "New",
+        "City": rng.choice(["Bengaluru", "Pune", "Mumbai", "Delhi"]),
+        "Current_Job_Title": "Software Engineer",
+        "Current_Employer": "Acme Corp",
+        "Experience_in_Years": rng.randint(0, 15),
+        "Highest_Qualification_Held": "B.Tech",
+        "Skill_Set": "Python, FastAPI, SQL, React, AWS",
+        "Additional_Info": "Open to relocation. " * rng.randint(1, 5),
+        "Modified_Time": "2026-01-02T10:00:00+05:30",
+        "Created_Time": "2026-01-01T09:00:00+05:30",
+        "Owner": _person(rng),
+        "Created_By": _person(rng),
+        "Modified_By": _person(rng),
+        "$approval": {"delegate": False, "approve": False, "reject": False, "resubmit": False},
+        "$currency_symbol": "$",
+        "$editable": True,
+        "$review_process": {"approve": False, "reject": False, "resubmit": False},
+    }
+    for field in ZOHO_SYSTEM_FIELDS:
+        record[field] = rng.choice([None, "", f"{field} value {rng.randint(1, 999)}"])
+    record["Educational_Details"] = [{"Institute_School": "IIT", "Degree": "B.Tech", "Duration": {"from": "2010-07", "to": "2014-05"}}]
+    record["Experience_Details"] = [{"Company": "Acme Corp", "Occupation_Title": "Engineer", "Summary": "Backend services. " * 10}]
+    return record
+
+
+def build_app(records: List[dict]):
+    slim = [map_candidate_profile(record) for record in records]
+    app = FastAPI()
+
+    @app.get("/before", response_model=List[dict], response_class=JSONResponse)
+    def before():
+        return records
+
+    @app.get("/slim", response_model=List[CandidateProfile], response_class=JSONResponse)
+    def slim_stdlib():
+        return slim
+
+    @app.get("/after", response_model=List[CandidateProfile], response_class=FastJSONResponse)
+    def after():
+        return slim
+
+    return app
+
+
+def measure(client: TestClient, path: str, runs: int):
+    client.get(path)  # warm up
+    cpu = []
+    for _ in range(runs):
+        started = time.process_time()
+        response = client.get(path)
+        cpu.append(time.process_time() - started)
+        response.raise_for_status()
+    body = response.content
+    return {
+        "cpu_ms": round(sorted(cpu)[len(cpu) // 2] * 1000, 2),
+        "bytes": len(body),
+        "gzip_bytes": len(gzip.compress(body, 6)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response serialization of large candidate lists")
+    parser.add_argument("--candidates", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    records = [make_record(rng, index) for index in range(args.candidates)]
+    client = TestClient(build_app(records))
+
+    results = {
+        "full records, dict, json": measure(client, "/before", args.runs),
+        "slim schema, json": measure(client, "/slim", args.runs),
+        "slim schema, orjson": measure(client, "/after", args.runs),
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.candidates} candidates, median of {args.runs} runs (orjson {'installed' if orjson else 'MISSING'})\n")
+    print(f"{'variant':<28}{'cpu ms':>10}{'bytes':>12}{'gzip bytes':>12}")
+    baseline = results["full records, dict, json"]
+    for name, result in results.items():
+        print(f"{name:<28}{result['cpu_ms']:>10}{result['bytes']:>12}{result['gzip_bytes']:>12}")
+    after = results["slim schema, orjson"]
+    print(f"\nCPU {baseline['cpu_ms'] / after['cpu_ms']:.1f}x less, payload {baseline['bytes'] / after['bytes']:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+# Measures API startup cost: import time of app.main (python -X importtime)
+# and wall time until `uvicorn app.main:app` answers its first request.
+# Also reports whether portal / Playwright modules were imported at startup.
+#
+#   python scripts/benchmark_startup.py --runs 5
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( +)(\S.*)$")
+
+def _env():
+    env = os.environ.copy()
+    # Keep background workers from talking to Zoho while we measure
+    env.setdefault("ZOHO_SYNC_ENABLED", "false")
+    env.setdefault("OUTBOX_ENABLED", "false")
+    env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'anti_recruiter_startup_bench.db')}")
+    return env
+
+def measure_imports(top: int):
+    """Returns (app_main_seconds, [(cumulative_us, module)], heavy_modules_loaded).
+
+    The module list holds the direct imports of app.main, slowest first.
+    """
+    probe = (
+        "import sys, app.main; "
+        "print('HEAVY=' + ','.join(sorted({m.split('.')[0] for m in sys.modules "
+        "if m.startswith(('playwright', 'app.automation'))})))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True,
+    )
+    # importtime prints children before their parent, indented two more spaces per level
+    children = []
+    total = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        if depth == 3:
+            children.append((cumulative, name))
+        elif depth == 1:
+            if name == "app.main":
+                total = cumulative
+                modules = children
+            children = []
+    heavy = result.stdout.strip().split("HEAVY=", 1)[-1]
+    modules.sort(reverse=True)
+    return total / 1_000_000, modules[:top], [name for name in heavy.split(",") if name]
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def measure_uvicorn(timeout: float = 60):
+    """Seconds from spawning uvicorn until GET / returns 200."""
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.02)
+        raise RuntimeError("uvicorn did not become ready")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API import and startup time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to list")
+    args = parser.parse_args()
+
+    imports = [measure_imports(args.top) for _ in range(args.runs)]
+    totals = sorted(total for total, _, _ in imports)
+    _, slowest, heavy = imports[-1]
+    print(f"--- import app.main ({args.runs} runs) ---")
+    print(f"median {totals[len(totals) // 2] * 1000:.0f} ms, min {totals[0] * 1000:.0f} ms")
+    print("slowest imports made by app.main:")
+    for cumulative, name in slowest:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    print(f"portal / Playwright modules loaded at startup: {', '.join(heavy) if heavy else 'none'}")
+
+    ready = sorted(measure_uvicorn() for _ in range(args.runs))
+    print(f"--- uvicorn app.main:app ({args.runs} runs) ---")
+    print(f"ready in median {ready[len(ready) // 2] * 1000:.0f} ms, min {ready[0] * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
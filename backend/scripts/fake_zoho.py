@@ -0,0 +1,427 @@
+import argparse
+import asyncio
+import os
+import random
+import re
+import secrets
+import sys
+import time
+from collections import Counter, deque
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from urllib.parse import parse_qsl
+
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+# Offline stand-in for the parts of Zoho Recruit this service calls: the
+# JobOpenings, Job_Openings/{id}/associate, Candidates and candidate
+# Attachments endpoints plus the OAuth token endpoint. Latency, random 5xx errors, random 429s and a
+# per-minute request limit are configurable, so the API can be benchmarked
+# (scripts/load_test.py) without touching a real org.
+#
+#   python scripts/fake_zoho.py --port 8900 --latency 80 --error-rate 0.01
+#
+# Point the API at it with
+#   ZOHO_API_BASE=http://127.0.0.1:8900/recruit/v2 ZOHO_ACCOUNTS_URL=http://127.0.0.1:8900
+#
+# GET /__stats returns Zoho calls per endpoint and status; POST /__reset
+# clears them; POST /__config changes the fault settings of a running server.
+
+API_PREFIX = "/recruit/v2"
+STATUSES = ["Applied", "In Review", "Qualified", "Submitted to client", "Interview-Scheduled", "Offer made", "Hired", "Rejected"]
+CITIES = ["Bangalore", "Pune", "Hyderabad", "Chennai", "Remote"]
+INDUSTRIES = ["IT Services", "Fintech", "Healthcare", "Retail"]
+CLIENTS = ["Acme", "Globex", "Initech", "Umbrella"]
+CRITERION = re.compile(r"\((\w+):(equals|greater_equal|less_equal):([^()]*)\)")
+
+
+class FakeZohoConfig:
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, throttle_rate=0.0, rpm=0, token_ttl=3600):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rpm = rpm
+        self.token_ttl = token_ttl
+
+    def update(self, values: dict):
+        for name, value in values.items():
+            if hasattr(self, name):
+                setattr(self, name, type(getattr(self, name))(value))
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+class FakeZohoError(Exception):
+    def __init__(self, status: int, code: str, message: str, headers: Optional[dict] = None):
+        self.status = status
+        self.body = {"code": code, "message": message, "status": "error"}
+        self.headers = headers or {}
+
+
+def _now():
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _stamp(value: datetime):
+    return value.isoformat()
+
+
+def _parse_since(value: Optional[str]):
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class FakeZohoStore:
+    """In-memory Zoho org: job openings, candidates and their associations."""
+
+    def __init__(self, jobs: int, candidates_per_job: int, seed: int = 42, resume_kb: int = 200):
+        rng = random.Random(seed)
+        created = _now() - timedelta(days=30)
+        self.jobs = {}
+        self.candidates = {}
+        self.associations = {}
+        # One resume per candidate; contents are generated on download
+        self.attachments = {}
+        self.resume_size = resume_kb * 1024
+        self._next_id = 900000000
+        for index in range(jobs):
+            job_id = self._new_id()
+            self.jobs[job_id] = {
+                "id": job_id,
+                "Posting_Title": f"Engineer {index + 1}",
+                "City": rng.choice(CITIES),
+                "Job_Opening_Status": "In-progress" if rng.random() < 0.8 else "Cancelled",
+                "Salary": f"{rng.randint(10, 40)}L",
+                "Industry": rng.choice(INDUSTRIES),
+                "Job_Type": "Full Time",
+                "Target_Date": (date.today() + timedelta(days=rng.randint(1, 90))).isoformat(),
+                "Job_Description": "Lorem ipsum dolor sit amet. " * 40,
+                "Client_Name": {"name": rng.choice(CLIENTS), "id": "1"},
+                "Created_Time": _stamp(created),
+                "Modified_Time": _stamp(created),
+            }
+            self.associations[job_id] = []
+            for number in range(candidates_per_job):
+                candidate_id = self._new_id()
+                self.candidates[candidate_id] = {
+                    "id": candidate_id,
+                    "First_Name": f"Candidate{number}",
+                    "Last_Name": f"J{index}",
+                    "Email": f"c{candidate_id}@example.com",
+                    "Phone": f"+91-98{candidate_id[-8:]}",
+                    "Application_Status": rng.choice(STATUSES),
+                    "City": rng.choice(CITIES),
+                    "Current_Job_Title": "Developer",
+                    "Current_Employer": rng.choice(CLIENTS),
+                    "Experience_in_Years": rng.randint(0, 15),
+                    "Highest_Qualification_Held": "B.Tech",
+                    "Skill_Set": "Python, SQL",
+                    "Created_Time": _stamp(created),
+                    "Modified_Time": _stamp(created),
+                }
+                self.associations[job_id].append(candidate_id)
+                self.attachments[candidate_id] = [{
+                    "id": self._new_id(),
+                    "File_Name": f"Candidate{number}_J{index}_Resume.pdf",
+                    "Size": str(self.resume_size),
+                    "Category": {"name": "Resume", "id": "1"},
+                    "Created_Time": _stamp(created),
+                    "Modified_Time": _stamp(created),
+                }]
+
+    def _new_id(self):
+        self._next_id += 1
+        return str(self._next_id)
+
+    def create_job(self, record: dict):
+        job_id = self._new_id()
+        now = _stamp(_now())
+        self.jobs[job_id] = {**record, "id": job_id, "Created_Time": now, "Modified_Time": now}
+        self.associations[job_id] = []
+        return job_id
+
+    def attachment_content(self, attachment_id: str):
+        line = f"%PDF-1.4 fake resume {attachment_id}\n".encode()
+        return (line * (self.resume_size // len(line) + 1))[:self.resume_size]
+
+    def update(self, records: dict, record_id: str, fields: dict):
+        record = records.get(record_id)
+        if record is None:
+            return False
+        record.update({key: value for key, value in fields.items() if key != "id"})
+        record["Modified_Time"] = _stamp(_now())
+        return True
+
+
+def _project(record: dict, fields: Optional[str]):
+    if not fields:
+        return record
+    wanted = set(fields.split(",")) | {"id"}
+    return {key: value for key, value in record.items() if key in wanted}
+
+
+def _page(records, request: Request, fields: Optional[str] = None):
+    page = int(request.query_params.get("page", 1))
+    per_page = min(int(request.query_params.get("per_page", 200)), 200)
+    chunk = records[(page - 1) * per_page:page * per_page]
+    if not chunk:
+        return Response(status_code=204)
+    return {
+        "data": [_project(record, fields) for record in chunk],
+        "info": {"page": page, "per_page": per_page, "count": len(chunk), "more_records": page * per_page < len(records)},
+    }
+
+
+def _modified_since(records, request: Request):
+    since = _parse_since(request.headers.get("If-Modified-Since"))
+    if since is None:
+        return records
+    return [record for record in records if _parse_since(record["Modified_Time"]) > since]
+
+
+def _write_results(ids_ok):
+    return {
+        "data": [
+            {"status": "success", "code": "SUCCESS", "details": {"id": record_id}, "message": "record updated"}
+            if ok else
+            {"status": "error", "code": "INVALID_DATA", "details": {"id": record_id}, "message": "the related id given seems to be invalid"}
+            for record_id, ok in ids_ok
+        ]
+    }
+
+
+def _matches(record: dict, field: str, operator: str, value: str):
+    actual = record.get(field)
+    if isinstance(actual, dict):
+        actual = actual.get("name")
+    actual = str(actual or "")
+    if operator == "equals":
+        return actual.lower() == value.replace("\\", "").lower()
+    if operator == "greater_equal":
+        return actual >= value
+    return actual <= value
+
+
+def create_app(store: FakeZohoStore, config: FakeZohoConfig) -> FastAPI:
+    app = FastAPI(title="Fake Zoho Recruit")
+    calls = Counter()
+    statuses = Counter()
+    tokens = {}
+    window = deque()
+    stats = {"token_refreshes": 0, "throttled": 0, "injected_errors": 0}
+
+    @app.exception_handler(FakeZohoError)
+    async def zoho_error(request: Request, exc: FakeZohoError):
+        return JSONResponse(exc.body, status_code=exc.status, headers=exc.headers)
+
+    @app.middleware("http")
+    async def count_calls(request: Request, call_next):
+        response = await call_next(request)
+        endpoint = getattr(request.state, "endpoint", None)
+        if endpoint:
+            calls[endpoint] += 1
+            statuses[f"{endpoint} {response.status_code}"] += 1
+        return response
+
+    async def zoho_call(request: Request):
+        """Applied to every Zoho route: bookkeeping, latency, auth and faults."""
+        route = request.scope.get("route")
+        request.state.endpoint = f"{request.method} {route.path if route else request.url.path}"
+        if config.latency_ms or config.jitter_ms:
+            await asyncio.sleep(max(0.0, config.latency_ms + random.uniform(-config.jitter_ms, config.jitter_ms)) / 1000)
+
+        if config.rpm:
+            now = time.monotonic()
+            while window and window[0] <= now - 60:
+                window.popleft()
+            if len(window) >= config.rpm:
+                stats["throttled"] += 1
+                reset = int((window[0] + 60 - now) + 1)
+                raise FakeZohoError(429, "TOO_MANY_REQUESTS", "API limit exceeded", {"Retry-After": str(reset), "X-RATELIMIT-REMAINING": "0"})
+            window.append(now)
+
+        if request.url.path.startswith(API_PREFIX):
+            header = request.headers.get("Authorization", "")
+            token = header.split(" ", 1)[1] if " " in header else ""
+            if tokens.get(token, 0) < time.time():
+                raise FakeZohoError(401, "INVALID_TOKEN", "invalid oauth token")
+
+        if config.throttle_rate and random.random() < config.throttle_rate:
+            stats["throttled"] += 1
+            raise FakeZohoError(429, "TOO_MANY_REQUESTS", "API limit exceeded", {"Retry-After": "1"})
+        if config.error_rate and random.random() < config.error_rate:
+            stats["injected_errors"] += 1
+            raise FakeZohoError(500, "INTERNAL_ERROR", "injected error")
+
+    zoho = [Depends(zoho_call)]
+
+    # --- OAuth --------------------------------------------------------------
+
+    @app.post("/oauth/v2/token", dependencies=zoho)
+    async def issue_token(request: Request):
+        form = dict(parse_qsl((await request.body()).decode()))
+        if form.get("grant_type") not in ("refresh_token", "authorization_code"):
+            return {"error": "invalid_code"}
+        stats["token_refreshes"] += 1
+        token = secrets.token_hex(16)
+        tokens[token] = time.time() + config.token_ttl
+        return {"access_token": token, "expires_in": config.token_ttl, "api_domain": str(request.base_url).rstrip("/"), "token_type": "Bearer"}
+
+    # --- JobOpenings --------------------------------------------------------
+
+    @app.get(API_PREFIX + "/JobOpenings", dependencies=zoho)
+    async def list_jobs(request: Request, ids: Optional[str] = None, fields: Optional[str] = None, sort_by: Optional[str] = None, sort_order: str = "asc"):
+        jobs = list(store.jobs.values())
+        if ids:
+            wanted = set(ids.split(","))
+            jobs = [job for job in jobs if job["id"] in wanted]
+        jobs = _modified_since(jobs, request)
+        if request.headers.get("If-Modified-Since") and not jobs:
+            return Response(status_code=304)
+        if sort_by:
+            jobs.sort(key=lambda job: str(job.get(sort_by) or ""), reverse=sort_order == "desc")
+        return _page(jobs, request, fields)
+
+    @app.get(API_PREFIX + "/JobOpenings/search", dependencies=zoho)
+    async def search_jobs(request: Request, criteria: str = ""):
+        conditions = CRITERION.findall(criteria)
+        jobs = [job for job in store.jobs.values() if all(_matches(job, *condition) for condition in conditions)]
+        return _page(jobs, request)
+
+    @app.get(API_PREFIX + "/JobOpenings/{job_id}", dependencies=zoho)
+    async def get_job(job_id: str):
+        job = store.jobs.get(job_id)
+        return {"data": [job]} if job else Response(status_code=204)
+
+    @app.post(API_PREFIX + "/JobOpenings", dependencies=zoho)
+    async def create_job(request: Request):
+        body = await request.json()
+        ids = [store.create_job(record) for record in body.get("data", [])]
+        return JSONResponse({"data": [{"status": "success", "code": "SUCCESS", "details": {"id": job_id}} for job_id in ids]}, status_code=201)
+
+    @app.put(API_PREFIX + "/JobOpenings/{job_id}", dependencies=zoho)
+    async def update_job(job_id: str, request: Request):
+        body = await request.json()
+        ok = all(store.update(store.jobs, job_id, record) for record in body.get("data", []))
+        return _write_results([(job_id, ok)])
+
+    @app.get(API_PREFIX + "/Job_Openings/{job_id}/associate", dependencies=zoho)
+    async def list_associations(job_id: str, request: Request):
+        candidates = [store.candidates[candidate_id] for candidate_id in store.associations.get(job_id, [])]
+        return _page(candidates, request)
+
+    @app.put(API_PREFIX + "/Job_Openings/{job_id}/associate", dependencies=zoho)
+    async def update_associations(job_id: str, request: Request):
+        body = await request.json()
+        associated = set(store.associations.get(job_id, []))
+        results = []
+        for record in body.get("data", []):
+            ok = record.get("id") in associated and store.update(store.candidates, record["id"], {"Application_Status": record.get("Status")})
+            results.append((record.get("id"), ok))
+        return _write_results(results)
+
+    @app.post(API_PREFIX + "/actions/watch", dependencies=zoho)
+    async def watch(request: Request):
+        body = await request.json()
+        return {"watch": [{"status": "success", "code": "SUCCESS", "message": "Successfully subscribed for actions-watch of the given module", "details": {"channel_id": item.get("channel_id")}} for item in body.get("watch", [])]}
+
+    # --- Candidates ---------------------------------------------------------
+
+    @app.get(API_PREFIX + "/Candidates", dependencies=zoho)
+    async def list_candidates(request: Request, ids: Optional[str] = None, fields: Optional[str] = None):
+        if ids:
+            wanted = ids.split(",")
+            found = [store.candidates[candidate_id] for candidate_id in wanted if candidate_id in store.candidates]
+            return {"data": [_project(record, fields) for record in found]} if found else Response(status_code=204)
+        candidates = _modified_since(list(store.candidates.values()), request)
+        if request.headers.get("If-Modified-Since") and not candidates:
+            return Response(status_code=304)
+        return _page(candidates, request, fields)
+
+    @app.get(API_PREFIX + "/Candidates/{candidate_id}", dependencies=zoho)
+    async def get_candidate(candidate_id: str):
+        candidate = store.candidates.get(candidate_id)
+        return {"data": [candidate]} if candidate else Response(status_code=204)
+
+    @app.get(API_PREFIX + "/Candidates/{candidate_id}/Attachments", dependencies=zoho)
+    async def list_attachments(candidate_id: str):
+        attachments = store.attachments.get(candidate_id)
+        return {"data": attachments, "info": {"more_records": False}} if attachments else Response(status_code=204)
+
+    @app.get(API_PREFIX + "/Candidates/{candidate_id}/Attachments/{attachment_id}", dependencies=zoho)
+    async def download_attachment(candidate_id: str, attachment_id: str):
+        for attachment in store.attachments.get(candidate_id, []):
+            if attachment["id"] == attachment_id:
+                return Response(
+                    store.attachment_content(attachment_id),
+                    media_type="application/pdf",
+                    headers={"Content-Disposition": f'attachment; filename="{attachment["File_Name"]}"'},
+                )
+        raise FakeZohoError(400, "INVALID_DATA", "the related id given seems to be invalid")
+
+    @app.put(API_PREFIX + "/Candidates", dependencies=zoho)
+    async def update_candidates(request: Request):
+        body = await request.json()
+        return _write_results([(record.get("id"), store.update(store.candidates, record.get("id"), record)) for record in body.get("data", [])])
+
+    @app.put(API_PREFIX + "/Candidates/{candidate_id}", dependencies=zoho)
+    async def update_candidate(candidate_id: str, request: Request):
+        body = await request.json()
+        ok = all(store.update(store.candidates, candidate_id, record) for record in body.get("data", []))
+        return _write_results([(candidate_id, ok)])
+
+    # --- Test controls (not Zoho) -------------------------------------------
+
+    @app.get("/__stats")
+    async def read_stats():
+        return {"total": sum(calls.values()), "calls": dict(calls), "statuses": dict(statuses), **stats, "config": config.as_dict()}
+
+    @app.post("/__reset")
+    async def reset_stats():
+        calls.clear()
+        statuses.clear()
+        for name in stats:
+            stats[name] = 0
+        return {"reset": True}
+
+    @app.post("/__config")
+    async def update_config(request: Request):
+        config.update(await request.json())
+        return config.as_dict()
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an offline Zoho Recruit stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--candidates", type=int, default=20, help="Candidates associated with each job")
+    parser.add_argument("--latency", type=float, default=0, help="Added latency per call in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="+/- random latency in ms")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of calls answered with a 500")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="Fraction of calls answered with a 429")
+    parser.add_argument("--rpm", type=int, default=0, help="Requests per minute before 429s (0 = unlimited)")
+    parser.add_argument("--token-ttl", type=int, default=3600, help="Access token lifetime in seconds")
+    parser.add_argument("--resume-kb", type=int, default=200, help="Size of each candidate's resume attachment")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    store = FakeZohoStore(args.jobs, args.candidates, args.seed, args.resume_kb)
+    config = FakeZohoConfig(args.latency, args.jitter, args.error_rate, args.throttle_rate, args.rpm, args.token_ttl)
+    print(f"Fake Zoho on http://{args.host}:{args.port}{API_PREFIX} ({len(store.jobs)} jobs, {len(store.candidates)} candidates)", file=sys.stderr)
+    uvicorn.run(create_app(store, config), host=args.host, port=args.port, log_level=os.getenv("FAKE_ZOHO_LOG_LEVEL", "warning"))
+
+if __name__ == "__main__":
+    main()
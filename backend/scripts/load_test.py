@@ -0,0 +1,329 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+
+# Load test for the /jobs API against the offline Zoho stand-in
+# (scripts/fake_zoho.py). Starts the fake and `uvicorn app.main:app`
+# pointed at it, then drives each /jobs route and reports throughput,
+# latency percentiles and Zoho calls per request.
+#
+#   python scripts/load_test.py --requests 200 --concurrency 20 --latency 80
+#   python scripts/load_test.py --save baseline.json
+#   python scripts/load_test.py --baseline baseline.json   # exit 1 on regression
+#
+# --mirror lets the sync engine fill the local mirror before measuring, so
+# reads are served from the database as in production.
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SCENARIOS = [
+    "list_jobs",
+    "list_jobs_filtered",
+    "job_detail",
+    "candidates",
+    "candidates_details",
+    "candidate_detail",
+    "update_status",
+    "bulk_status",
+    "create_job",
+    "publish_status",
+    "archive_job",
+]
+
+STATUSES = ["In Review", "Qualified", "Submitted to client", "Interview-Scheduled", "Offer made"]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(url: str, process, timeout: float = 60):
+    started = time.monotonic()
+    while time.monotonic() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with {process.returncode}")
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.05)
+    raise RuntimeError(f"{url} did not become ready")
+
+
+def start_servers(args, workdir: str):
+    """Spawns the fake Zoho and the API; returns (api_url, zoho_url, processes)."""
+    zoho_port, api_port = _free_port(), _free_port()
+    zoho_url = f"http://127.0.0.1:{zoho_port}"
+    fake = subprocess.Popen(
+        [
+            sys.executable, os.path.join(BACKEND_DIR, "scripts", "fake_zoho.py"),
+            "--port", str(zoho_port), "--jobs", str(args.jobs), "--candidates", str(args.candidates),
+            "--latency", str(args.latency), "--jitter", str(args.jitter),
+            "--error-rate", str(args.error_rate), "--throttle-rate", str(args.throttle_rate), "--rpm", str(args.zoho_rpm),
+        ],
+        cwd=BACKEND_DIR, stderr=subprocess.DEVNULL,
+    )
+    _wait_ready(f"{zoho_url}/__stats", fake)
+
+    env = os.environ.copy()
+    env.update(
+        ZOHO_API_BASE=f"{zoho_url}/recruit/v2",
+        ZOHO_ACCOUNTS_URL=zoho_url,
+        ZOHO_CLIENT_ID="load-test",
+        ZOHO_CLIENT_SECRET="load-test",
+        ZOHO_REFRESH_TOKEN="load-test",
+        ZOHO_TOKEN_FILE=os.path.join(workdir, "token.json"),
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'load_test.db')}",
+        ZOHO_SYNC_ENABLED="true" if args.mirror else "false",
+        # Our own Zoho budget would otherwise dominate; --zoho-rpm models Zoho's
+        ZOHO_RATE_LIMIT_PER_MINUTE=str(args.api_rpm),
+        JOB_PORTALS="",
+    )
+    env.pop("ZOHO_WEBHOOK_TOKEN", None)
+    env.pop("ZOHO_WEBHOOK_SECRET", None)
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(api_port), "--workers", str(args.workers),
+         "--log-level", "warning", "--timeout-graceful-shutdown", "2"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    api_url = f"http://127.0.0.1:{api_port}"
+    _wait_ready(f"{api_url}/", api)
+    return api_url, zoho_url, [api, fake]
+
+
+def wait_for_mirror(api_url: str, timeout: float = 120):
+    started = time.monotonic()
+    while time.monotonic() - started < timeout:
+        sync = httpx.get(f"{api_url}/stats/sync").json()
+        if sync.get("cycles"):
+            return
+        time.sleep(0.2)
+    raise RuntimeError("The sync engine did not finish its first cycle")
+
+
+class Fixture:
+    """Job / candidate ids the scenarios pick from, read once from the fake."""
+
+    def __init__(self, zoho_url: str):
+        jobs = httpx.get(f"{zoho_url}/recruit/v2/JobOpenings", headers=self._auth(zoho_url), params={"per_page": 200}).json()["data"]
+        self.job_ids = [job["id"] for job in jobs]
+        self.candidates = {}
+        for job_id in self.job_ids[:20]:
+            response = httpx.get(f"{zoho_url}/recruit/v2/Job_Openings/{job_id}/associate", headers=self._auth(zoho_url))
+            if response.status_code == 200:
+                self.candidates[job_id] = [candidate["id"] for candidate in response.json()["data"]]
+        self.active_jobs = [job_id for job_id in self.candidates if self.candidates[job_id]]
+        self.archivable = list(self.job_ids[20:]) or list(self.job_ids)
+        self.created = []
+
+    _token = None
+
+    @classmethod
+    def _auth(cls, zoho_url: str):
+        if cls._token is None:
+            cls._token = httpx.post(f"{zoho_url}/oauth/v2/token", data={"grant_type": "refresh_token"}).json()["access_token"]
+        return {"Authorization": f"Zoho-oauthtoken {cls._token}"}
+
+    def job(self):
+        return random.choice(self.active_jobs)
+
+    def candidate(self):
+        job_id = self.job()
+        return job_id, random.choice(self.candidates[job_id])
+
+
+def build_request(name: str, fixture: Fixture):
+    """(method, path, json_body) for one request of scenario `name`."""
+    if name == "list_jobs":
+        return "GET", "/jobs/", None
+    if name == "list_jobs_filtered":
+        return "GET", "/jobs/?status=In-progress&sort=-target_date&fields=id,title,status,location", None
+    if name == "job_detail":
+        return "GET", f"/jobs/{fixture.job()}", None
+    if name == "candidates":
+        return "GET", f"/jobs/{fixture.job()}/candidates", None
+    if name == "candidates_details":
+        return "GET", f"/jobs/{fixture.job()}/candidates/details", None
+    if name == "candidate_detail":
+        job_id, candidate_id = fixture.candidate()
+        return "GET", f"/jobs/{job_id}/candidates/{candidate_id}", None
+    if name == "update_status":
+        job_id, candidate_id = fixture.candidate()
+        return "PATCH", f"/jobs/{job_id}/candidates/{candidate_id}/status", {"status": random.choice(STATUSES)}
+    if name == "bulk_status":
+        job_id = fixture.job()
+        chosen = random.sample(fixture.candidates[job_id], min(10, len(fixture.candidates[job_id])))
+        return "PATCH", f"/jobs/{job_id}/candidates/status", {"updates": [{"candidate_id": candidate_id, "status": random.choice(STATUSES)} for candidate_id in chosen]}
+    if name == "create_job":
+        body = {
+            "title": f"Load test {uuid.uuid4().hex[:8]}",
+            "description": "Created by scripts/load_test.py",
+            "location": "Pune",
+            "target_date": "2030-01-01",
+        }
+        return "POST", "/jobs/", body
+    if name == "publish_status":
+        db_id = random.choice(fixture.created) if fixture.created else 1
+        return "GET", f"/jobs/publish/{db_id}", None
+    if name == "archive_job":
+        return "PATCH", f"/jobs/{random.choice(fixture.archivable)}/archive", None
+    raise ValueError(f"Unknown scenario {name}")
+
+
+def _percentile(values, fraction: float):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_scenario(name: str, api_url: str, zoho_url: str, fixture: Fixture, requests: int, concurrency: int):
+    async with httpx.AsyncClient(base_url=api_url, timeout=60, limits=httpx.Limits(max_connections=concurrency)) as client:
+        await client.post(f"{zoho_url}/__reset")
+        latencies = []
+        errors = 0
+        remaining = iter(range(requests))
+
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                method, path, body = build_request(name, fixture)
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, path, json=body)
+                    ok = response.status_code < 400
+                    if ok and name == "create_job":
+                        fixture.created.append(response.json()["db_id"])
+                except httpx.HTTPError:
+                    ok = False
+                latencies.append(time.perf_counter() - started)
+                if not ok:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        zoho = (await client.get(f"{zoho_url}/__stats")).json()
+
+    return {
+        "scenario": name,
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 1),
+        "max_ms": round(max(latencies) * 1000, 1) if latencies else 0.0,
+        "zoho_calls": zoho["total"],
+        "zoho_calls_per_request": round(zoho["total"] / requests, 2) if requests else 0.0,
+        "zoho_throttled": zoho["throttled"],
+    }
+
+
+def print_report(results):
+    header = f"{'scenario':<20} {'req':>6} {'err':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'zoho/req':>9}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result['scenario']:<20} {result['requests']:>6} {result['errors']:>5} {result['rps']:>8} "
+            f"{result['p50_ms']:>8} {result['p95_ms']:>8} {result['p99_ms']:>8} {result['max_ms']:>8} {result['zoho_calls_per_request']:>9}"
+        )
+
+
+def compare(results, baseline_path: str, tolerance: float):
+    """Regressions against a saved run: p95 latency or Zoho calls per request up by more than `tolerance`."""
+    with open(baseline_path) as f:
+        baseline = {result["scenario"]: result for result in json.load(f)["results"]}
+    regressions = []
+    for result in results:
+        before = baseline.get(result["scenario"])
+        if before is None:
+            continue
+        for metric in ("p95_ms", "zoho_calls_per_request"):
+            # Small absolute differences are noise, not regressions
+            floor = 5.0 if metric == "p95_ms" else 0.05
+            if result[metric] > before[metric] * (1 + tolerance) and result[metric] - before[metric] > floor:
+                regressions.append(f"{result['scenario']}: {metric} {before[metric]} -> {result[metric]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the /jobs API against a fake Zoho Recruit")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--jobs", type=int, default=50, help="Jobs in the fake org")
+    parser.add_argument("--candidates", type=int, default=20, help="Candidates per job in the fake org")
+    parser.add_argument("--latency", type=float, default=50, help="Fake Zoho latency per call in ms")
+    parser.add_argument("--jitter", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--zoho-rpm", type=int, default=0, help="Fake Zoho per-minute limit (0 = unlimited)")
+    parser.add_argument("--api-rpm", type=int, default=100000, help="ZOHO_RATE_LIMIT_PER_MINUTE for the API under test")
+    parser.add_argument("--mirror", action="store_true", help="Serve reads from the synced mirror")
+    parser.add_argument("--api-url", help="Test an already running API (with its own Zoho) instead of starting one")
+    parser.add_argument("--zoho-url", help="Fake Zoho used by --api-url")
+    parser.add_argument("--save", help="Write results as JSON")
+    parser.add_argument("--baseline", help="Compare with results saved by --save; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    processes = []
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            if args.api_url:
+                if not args.zoho_url:
+                    parser.error("--api-url needs --zoho-url")
+                api_url, zoho_url = args.api_url, args.zoho_url
+            else:
+                api_url, zoho_url, processes = start_servers(args, workdir)
+            if args.mirror:
+                wait_for_mirror(api_url)
+            fixture = Fixture(zoho_url)
+
+            results = []
+            for name in scenarios:
+                results.append(asyncio.run(run_scenario(name, api_url, zoho_url, fixture, args.requests, args.concurrency)))
+        finally:
+            for process in processes:
+                process.terminate()
+                process.wait(timeout=10)
+
+    print(f"--- {args.requests} requests per scenario, concurrency {args.concurrency}, fake Zoho latency {args.latency}ms ---")
+    print_report(results)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        if regressions:
+            print("Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("No regressions against baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+# Add the parent directory to sys.path to import app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.webhooks import ZOHO_WEBHOOK_TOKEN
+from app.services.zoho_jobs import ZohoJobService
+
+# Subscribes POST /webhooks/zoho to Zoho Recruit notifications for
+# JobOpenings and Candidates. Channels expire, so run this on a schedule
+# (e.g. daily from cron) to renew it before --hours runs out.
+#
+#   python scripts/zoho_watch.py --url https://api.example.com/webhooks/zoho
+
+def main():
+    parser = argparse.ArgumentParser(description="Enable or renew Zoho Recruit change notifications")
+    parser.add_argument("--url", required=True, help="Public URL of POST /webhooks/zoho")
+    parser.add_argument("--channel-id", default=os.getenv("ZOHO_WEBHOOK_CHANNEL_ID", "1000000068001"))
+    parser.add_argument("--hours", type=float, default=24, help="Channel lifetime")
+    args = parser.parse_args()
+
+    if not ZOHO_WEBHOOK_TOKEN:
+        sys.exit("Set ZOHO_WEBHOOK_TOKEN first; Zoho sends it back with every notification")
+
+    expiry = datetime.now(timezone.utc) + timedelta(hours=args.hours)
+    result = ZohoJobService.watch_notifications(
+        args.channel_id,
+        args.url,
+        ZOHO_WEBHOOK_TOKEN,
+        ["JobOpenings.all", "Candidates.all"],
+        expiry=expiry,
+    )
+    for item in result.get("watch", []):
+        print(f"{item.get('status')}: {item.get('message')} {item.get('details', {})}")
+
+if __name__ == "__main__":
+    main()
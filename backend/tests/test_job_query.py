@@ -0,0 +1,46 @@
+import asyncio
+import httpx
+from app.services.job_query import JobQuery, zoho_criteria
+from app.services.zoho_jobs_async import AsyncZohoJobService
+
+
+def _zoho_job(job_id, status="In-progress"):
+    return {"id": job_id, "Posting_Title": f"Job {job_id}", "Job_Opening_Status": status}
+
+
+def test_ids_query_fetches_only_those_ids(monkeypatch):
+    calls = []
+
+    async def make_request(method, url, **kwargs):
+        calls.append((method, url, kwargs.get("params")))
+        return httpx.Response(200, json={"data": [_zoho_job("1"), _zoho_job("2", "Cancelled")], "info": {"more_records": False}})
+
+    monkeypatch.setattr(AsyncZohoJobService, "_make_request", staticmethod(make_request))
+    query = JobQuery.from_params(ids="1,2", status="In-progress", fields="title")
+    jobs = asyncio.run(AsyncZohoJobService._fetch_matching_jobs(query))
+
+    assert jobs == [{"id": "1", "title": "Job 1"}]
+    assert len(calls) == 1
+    method, url, params = calls[0]
+    assert url.endswith("/JobOpenings")
+    assert params["ids"] == "1,2"
+    assert "page" not in params
+
+
+def test_ids_are_sent_in_chunks_of_100(monkeypatch):
+    calls = []
+
+    async def make_request(method, url, **kwargs):
+        calls.append(kwargs["params"]["ids"].split(","))
+        return httpx.Response(204)
+
+    monkeypatch.setattr(AsyncZohoJobService, "_make_request", staticmethod(make_request))
+    query = JobQuery.from_params(ids=",".join(str(i) for i in range(250)))
+    asyncio.run(AsyncZohoJobService._fetch_matching_jobs(query))
+
+    assert [len(ids) for ids in calls] == [100, 100, 50]
+
+
+def test_criteria_values_are_escaped():
+    query = JobQuery.from_params(client="Acme (India), Ltd")
+    assert zoho_criteria(query) == "(Client_Name:equals:Acme \\(India\\)\\, Ltd)"
@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def test_multiproc_dir_from_dotenv_enables_multiprocess_values(tmp_path):
+    # A fresh interpreter, as prometheus_client decides at import time. The
+    # variable only appears once load_dotenv() runs, as when it is set in .env.
+    script = f"""
+import os, dotenv
+dotenv.load_dotenv = lambda *args, **kwargs: os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", {str(tmp_path)!r}) and True
+from app.services import metrics
+from prometheus_client import values
+metrics.HTTP_REQUESTS.labels("GET", "/jobs", "200").inc()
+print(values.ValueClass.__name__)
+"""
+    env = {key: value for key, value in os.environ.items() if key.lower() != "prometheus_multiproc_dir"}
+    result = subprocess.run([sys.executable, "-c", script], cwd=BACKEND, env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "MmapedValue"
+    # Metric values are written to the shared directory
+    assert any(name.endswith(".db") for name in os.listdir(tmp_path))
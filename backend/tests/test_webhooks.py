@@ -0,0 +1,57 @@
+from app.services import webhooks
+from app.services.webhooks import CANDIDATES_MODULE, UPDATE, ZohoWebhookProcessor
+
+WORKFLOW_BODY = {"module": "Candidates", "operation": "update", "id": "c1"}
+
+
+def _processor(monkeypatch):
+    processor = ZohoWebhookProcessor(debounce=0, max_delay=0)
+    applied = []
+
+    def apply_candidates(session, operations):
+        applied.append(dict(operations))
+        return []
+
+    monkeypatch.setattr(processor, "_apply_candidates", apply_candidates)
+    return processor, applied
+
+
+def test_same_workflow_body_after_a_flush_is_applied_again(monkeypatch):
+    processor, applied = _processor(monkeypatch)
+    module, operation, ids = webhooks.parse_notification(WORKFLOW_BODY)
+    key = webhooks.redelivery_key(WORKFLOW_BODY)
+    assert key is None
+
+    assert processor.submit(module, operation, ids, key)
+    processor.flush()
+    assert processor.submit(module, operation, ids, key)
+    processor.flush()
+
+    assert applied == [{"c1": UPDATE}, {"c1": UPDATE}]
+    assert processor.duplicates == 0
+
+
+def test_repeat_while_pending_is_coalesced(monkeypatch):
+    processor, applied = _processor(monkeypatch)
+    assert processor.submit(CANDIDATES_MODULE, UPDATE, ["c1"])
+    assert not processor.submit(CANDIDATES_MODULE, UPDATE, ["c1"])
+    processor.flush()
+
+    assert applied == [{"c1": UPDATE}]
+    assert processor.duplicates == 1
+
+
+def test_notification_redelivery_is_dropped_after_a_flush(monkeypatch):
+    processor, applied = _processor(monkeypatch)
+    payload = {"module": "Candidates", "operation": "update", "ids": ["c1"], "channel_id": "1000", "server_time": 1760000000000}
+    module, operation, ids = webhooks.parse_notification(payload)
+
+    assert processor.submit(module, operation, ids, webhooks.redelivery_key(payload))
+    processor.flush()
+    assert not processor.submit(module, operation, ids, webhooks.redelivery_key(payload))
+    processor.flush()
+
+    assert applied == [{"c1": UPDATE}]
+    # A later change to the same record is a new notification
+    later = {**payload, "server_time": 1760000005000}
+    assert processor.submit(module, operation, ids, webhooks.redelivery_key(later))
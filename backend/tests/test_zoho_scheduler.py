@@ -0,0 +1,32 @@
+import sys
+import threading
+from types import SimpleNamespace
+
+from app.services.zoho_scheduler import ZohoScheduler
+
+
+def test_retry_counters_are_exact_under_concurrent_callers():
+    scheduler = ZohoScheduler(max_retries=10)
+    rate_limited = SimpleNamespace(status_code=429, headers={})
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    threads, calls = 8, 2000
+
+    def worker():
+        for _ in range(calls):
+            scheduler.retry_delay("GET", 0)
+            scheduler.retry_delay("POST", 0, rate_limited)
+
+    try:
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    stats = scheduler.stats()
+    assert stats["transport_errors"] == threads * calls
+    assert stats["rate_limited"] == threads * calls
+    assert stats["retries"] == 2 * threads * calls
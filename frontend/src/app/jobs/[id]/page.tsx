@@ -31,8 +31,8 @@ export default function JobDetailsPage() {
     const [selectedStatuses, setSelectedStatuses] = useState<string[]>([]);
 
     const { data: jobs, isLoading: isJobsLoading } = useQuery({
-        queryKey: ['jobs'],
-        queryFn: fetchJobs
+        queryKey: ['jobs', id],
+        queryFn: () => fetchJobs({ ids: id, fields: 'id,title,status,location,job_type' })
     });
 
     const { data: candidates, isLoading: isCandidatesLoading } = useQuery({
@@ -48,7 +48,7 @@ export default function JobDetailsPage() {
         }
     });
 
-    const job = jobs?.find(j => j.id === id);
+    const job = jobs?.[0];
 
     const filteredCandidates = candidates?.filter(c => {
         const nameMatch = `${c.first_name} ${c.last_name}`.toLowerCase().includes(searchQuery.toLowerCase());
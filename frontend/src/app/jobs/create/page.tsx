@@ -29,7 +29,7 @@ export default function CreateJobPage() {
     });
 
     const createJobMutation = useMutation({
-        mutationFn: createJob,
+        mutationFn: (job: Omit<JobPosting, 'id'>) => createJob(job),
         onSuccess: async () => {
             queryClient.invalidateQueries({ queryKey: ['jobs'] });
             router.push('/');
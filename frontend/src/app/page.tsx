@@ -16,7 +16,7 @@ export default function Dashboard() {
 
   const { data: jobs, isLoading, error } = useQuery({
     queryKey: ['jobs'],
-    queryFn: fetchJobs
+    queryFn: () => fetchJobs()
   });
 
   if (isLoading) return <div className="flex justify-center items-center h-64 text-muted-foreground animate-pulse">Loading jobs...</div>;
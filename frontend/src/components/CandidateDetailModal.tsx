@@ -2,7 +2,7 @@
 
 import React from 'react';
 import { useQuery } from '@tanstack/react-query';
-import { fetchCandidateById } from '@/lib/api/candidates';
+import { attachmentUrl, fetchCandidateAttachments, fetchCandidateById } from '@/lib/api/candidates';
 import { Button } from '@/components/ui/button';
 import { Badge } from '@/components/ui/badge';
 import {
@@ -21,6 +21,10 @@ export default function CandidateDetailModal({ jobId, candidateId, onClose }: Ca
         queryKey: ['candidate', candidateId],
         queryFn: () => fetchCandidateById(jobId, candidateId),
     });
+    const { data: attachments } = useQuery({
+        queryKey: ['candidate-attachments', candidateId],
+        queryFn: () => fetchCandidateAttachments(candidateId),
+    });
 
     if (!candidateId) return null;
 
@@ -129,13 +133,14 @@ export default function CandidateDetailModal({ jobId, candidateId, onClose }: Ca
                                             <LinkIcon className="h-4 w-4" /> Links & Attachments
                                         </h3>
                                         <div className="space-y-3">
-                                            {candidate.resume_url ? (
-                                                <Button variant="outline" className="w-full justify-start gap-2 h-12" asChild>
-                                                    <a href={candidate.resume_url} target="_blank" rel="noopener noreferrer">
-                                                        <FileText className="h-5 w-5 text-blue-500" /> View Resume (PDF)
+                                            {attachments && attachments.length > 0 ? attachments.map((attachment) => (
+                                                <Button key={attachment.id} variant="outline" className="w-full justify-start gap-2 h-12" asChild>
+                                                    <a href={attachmentUrl(candidateId, attachment.id)} target="_blank" rel="noopener noreferrer">
+                                                        <FileText className="h-5 w-5 text-blue-500" /> {attachment.file_name}
+                                                        {attachment.category && <span className="ml-auto text-xs text-muted-foreground">{attachment.category}</span>}
                                                     </a>
                                                 </Button>
-                                            ) : (
+                                            )) : (
                                                 <p className="text-sm text-muted-foreground italic border-2 border-dashed rounded-lg p-4 text-center">No resume attached.</p>
                                             )}
                                         </div>
@@ -27,8 +27,8 @@ export default function Header() {
     const { mode, setMode, selectedCompany, setSelectedCompany } = usePortal();
 
     const { data: jobs } = useQuery({
-        queryKey: ['jobs'],
-        queryFn: fetchJobs,
+        queryKey: ['jobs', 'clients'],
+        queryFn: () => fetchJobs({ fields: 'id,client_name' }),
         staleTime: 60000 // Cache for 1 minute
     });
 
@@ -33,8 +33,11 @@ export default function KanbanBoard({ jobId, candidates }: KanbanBoardProps) {
     const mutation = useMutation({
         mutationFn: ({ candidateId, status }: { candidateId: string, status: string }) =>
             updateCandidateStatus(jobId, candidateId, status),
-        onSuccess: () => {
-            queryClient.invalidateQueries({ queryKey: ['candidates', jobId] });
+        onSuccess: (_, { candidateId, status }) => {
+            // Patch the cached list; other tabs get the same change over /events
+            queryClient.setQueryData<Candidate[]>(['candidates', jobId], old =>
+                old?.map(c => (c.id === candidateId ? { ...c, status } : c))
+            );
         }
     });
 
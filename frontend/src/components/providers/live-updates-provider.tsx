@@ -0,0 +1,23 @@
+'use client';
+
+import { useEffect } from 'react';
+import { useQueryClient } from '@tanstack/react-query';
+import { EVENTS_URL, LIVE_EVENT_TYPES, applyLiveEvent } from '@/lib/api/events';
+
+// One EventSource per tab; it reconnects on its own and the server replays
+// whatever was missed (Last-Event-ID).
+export default function LiveUpdatesProvider({ children }: { children: React.ReactNode }) {
+    const queryClient = useQueryClient();
+
+    useEffect(() => {
+        const source = new EventSource(EVENTS_URL);
+        LIVE_EVENT_TYPES.forEach(type => {
+            source.addEventListener(type, event => {
+                applyLiveEvent(queryClient, type, JSON.parse((event as MessageEvent).data));
+            });
+        });
+        return () => source.close();
+    }, [queryClient]);
+
+    return <>{children}</>;
+}
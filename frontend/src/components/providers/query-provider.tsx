@@ -2,11 +2,13 @@
 
 import { QueryClient, QueryClientProvider } from '@tanstack/react-query';
 import { useState } from 'react';
+import LiveUpdatesProvider from './live-updates-provider';
 
 export default function Providers({ children }: { children: React.ReactNode }) {
     const [queryClient] = useState(() => new QueryClient({
         defaultOptions: {
             queries: {
+                // Pushed deltas (LiveUpdatesProvider) keep cached data current
                 staleTime: 60 * 1000,
             },
         },
@@ -14,7 +16,9 @@ export default function Providers({ children }: { children: React.ReactNode }) {
 
     return (
         <QueryClientProvider client={queryClient}>
-            {children}
+            <LiveUpdatesProvider>
+                {children}
+            </LiveUpdatesProvider>
         </QueryClientProvider>
     );
 }
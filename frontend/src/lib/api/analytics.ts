@@ -0,0 +1,39 @@
+import apiClient from './client';
+
+export interface PipelineStatus {
+    status: string;
+    stage?: string | null;
+    current: number;
+    entered: number;
+    exited: number;
+    avg_days_in_status?: number | null;
+}
+
+export interface PipelineStage {
+    stage: string;
+    current: number;
+    reached: number;
+    conversion?: number | null;
+    conversion_from_start?: number | null;
+}
+
+export interface PipelineJob {
+    job_id: string;
+    title?: string | null;
+    total: number;
+    counts: Record<string, number>;
+}
+
+export interface PipelineAnalytics {
+    job_id?: string | null;
+    total: number;
+    statuses: PipelineStatus[];
+    funnel: PipelineStage[];
+    jobs?: PipelineJob[] | null;
+}
+
+// Status counts, time in status and funnel conversion for one job, or all jobs when jobId is omitted
+export const fetchPipelineAnalytics = async (jobId?: string): Promise<PipelineAnalytics> => {
+    const response = await apiClient.get('/analytics/pipeline', { params: jobId ? { job_id: jobId } : {} });
+    return response.data;
+};
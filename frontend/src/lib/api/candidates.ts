@@ -1,4 +1,4 @@
-import apiClient from './client';
+import apiClient, { API_BASE_URL, TENANT } from './client';
 
 export interface Candidate {
     id: string;
@@ -26,3 +26,69 @@ export const updateCandidateStatus = async (jobId: string, candidateId: string,
     const response = await apiClient.patch(`/jobs/${jobId}/candidates/${candidateId}/status`, { status });
     return response.data;
 };
+
+export interface BulkStatusResult {
+    candidate_id: string;
+    status: string;
+    success: boolean;
+    error?: string;
+    candidate_record_error?: string;
+}
+
+export const bulkUpdateCandidateStatus = async (
+    jobId: string,
+    updates: { candidate_id: string; status: string }[]
+): Promise<{ updated: number; failed: number; results: BulkStatusResult[] }> => {
+    const response = await apiClient.patch(`/jobs/${jobId}/candidates/status`, { updates });
+    return response.data;
+};
+
+export interface CandidateWithDetails extends Candidate {
+    details: Record<string, any>;
+}
+
+// All candidates of a job with profile details, hydrated server-side in one request
+export const fetchCandidatesWithDetails = async (jobId: string): Promise<CandidateWithDetails[]> => {
+    const response = await apiClient.get(`/jobs/${jobId}/candidates/details`);
+    return response.data;
+};
+
+export interface CandidateAttachment {
+    id: string;
+    candidate_id: string;
+    file_name: string;
+    size?: number;
+    category?: string;
+    modified_time?: string;
+}
+
+export const fetchCandidateAttachments = async (candidateId: string): Promise<CandidateAttachment[]> => {
+    const response = await apiClient.get(`/candidates/${candidateId}/attachments`);
+    return response.data;
+};
+
+// Opened in a new tab, where the X-Tenant header can't be set
+export const attachmentUrl = (candidateId: string, attachmentId: string): string => {
+    const url = `${API_BASE_URL}/candidates/${candidateId}/attachments/${attachmentId}`;
+    return TENANT ? `${url}?tenant=${encodeURIComponent(TENANT)}` : url;
+};
+
+export interface CandidateSearchResult extends Candidate {
+    job_title?: string;
+}
+
+export interface CandidateSearchPage {
+    total: number;
+    limit: number;
+    offset: number;
+    results: CandidateSearchResult[];
+}
+
+// Prefix search over name, email, phone, status and job title across all jobs
+export const searchCandidates = async (
+    q: string,
+    params?: { status?: string; job_id?: string; limit?: number; offset?: number }
+): Promise<CandidateSearchPage> => {
+    const response = await apiClient.get('/candidates/search', { params: { q, ...params } });
+    return response.data;
+};
@@ -1,11 +1,14 @@
 import axios from 'axios';
 
-const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+export const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+// Zoho org to work against (a tenant id from the backend's ZOHO_TENANTS_FILE)
+export const TENANT = process.env.NEXT_PUBLIC_TENANT;
 
 const apiClient = axios.create({
     baseURL: API_BASE_URL,
     headers: {
         'Content-Type': 'application/json',
+        ...(TENANT ? { 'X-Tenant': TENANT } : {}),
     },
 });
 
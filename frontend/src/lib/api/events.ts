@@ -0,0 +1,79 @@
+import { QueryClient } from '@tanstack/react-query';
+import { API_BASE_URL, TENANT } from './client';
+import { Candidate } from './candidates';
+import { JobPosting } from './jobs';
+
+// Server-Sent Events pushed by GET /events (see backend app/services/events.py).
+// EventSource cannot send headers, so the tenant goes in the query string.
+export const EVENTS_URL = `${API_BASE_URL}/events${TENANT ? `?tenant=${encodeURIComponent(TENANT)}` : ''}`;
+
+export const LIVE_EVENT_TYPES = [
+    'job.created',
+    'job.updated',
+    'job.archived',
+    'candidate.status',
+    'candidate.updated',
+    'candidate.removed',
+    'resync',
+] as const;
+
+export type LiveEventType = typeof LIVE_EVENT_TYPES[number];
+
+export interface CandidateStatusEvent {
+    job_id: string;
+    updates: { candidate_id: string; status: string }[];
+}
+
+const upsertJob = (jobs: JobPosting[] | undefined, job: JobPosting) => {
+    if (!jobs) return jobs;
+    const exists = jobs.some(j => j.id === job.id);
+    return exists ? jobs.map(j => (j.id === job.id ? { ...j, ...job } : j)) : [job, ...jobs];
+};
+
+const patchJob = (queryClient: QueryClient, jobId: string, patch: Partial<JobPosting>) => {
+    queryClient.setQueryData<JobPosting[]>(['jobs'], jobs => jobs?.map(j => (j.id === jobId ? { ...j, ...patch } : j)));
+    queryClient.setQueryData<JobPosting[]>(['jobs', jobId], jobs => jobs?.map(j => ({ ...j, ...patch })));
+};
+
+const patchCandidates = (queryClient: QueryClient, jobId: string, update: (candidates: Candidate[]) => Candidate[]) => {
+    queryClient.setQueryData<Candidate[]>(['candidates', jobId], candidates => (candidates ? update(candidates) : candidates));
+};
+
+// Applies one pushed delta to the TanStack Query cache instead of refetching
+export const applyLiveEvent = (queryClient: QueryClient, type: LiveEventType, data: any) => {
+    switch (type) {
+        case 'job.created':
+        case 'job.updated':
+            queryClient.setQueryData<JobPosting[]>(['jobs'], jobs => upsertJob(jobs, data.job));
+            patchJob(queryClient, data.job.id, data.job);
+            queryClient.invalidateQueries({ queryKey: ['jobs', 'clients'], exact: true });
+            break;
+        case 'job.archived':
+            patchJob(queryClient, data.job_id, { status: data.status });
+            break;
+        case 'candidate.status': {
+            const statuses = new Map((data as CandidateStatusEvent).updates.map(u => [u.candidate_id, u.status]));
+            patchCandidates(queryClient, data.job_id, candidates =>
+                candidates.map(c => (statuses.has(c.id) ? { ...c, status: statuses.get(c.id)! } : c))
+            );
+            break;
+        }
+        case 'candidate.updated': {
+            const candidate: Candidate = data.candidate;
+            patchCandidates(queryClient, data.job_id, candidates =>
+                candidates.some(c => c.id === candidate.id)
+                    ? candidates.map(c => (c.id === candidate.id ? { ...c, ...candidate } : c))
+                    : [...candidates, candidate]
+            );
+            queryClient.invalidateQueries({ queryKey: ['candidate', candidate.id] });
+            break;
+        }
+        case 'candidate.removed':
+            patchCandidates(queryClient, data.job_id, candidates => candidates.filter(c => c.id !== data.candidate_id));
+            break;
+        case 'resync':
+            // Too many changes (or we missed some); fall back to refetching
+            queryClient.invalidateQueries();
+            break;
+    }
+};
@@ -14,8 +14,21 @@ export interface JobPosting {
     status?: string;
 }
 
-export const fetchJobs = async (): Promise<JobPosting[]> => {
-    const response = await apiClient.get('/jobs/');
+export interface JobListParams {
+    ids?: string;
+    status?: string;
+    client?: string;
+    location?: string;
+    industry?: string;
+    target_date_from?: string;
+    target_date_to?: string;
+    sort?: string;
+    // Comma-separated projection, e.g. 'id,title,status' (skips description)
+    fields?: string;
+}
+
+export const fetchJobs = async (params?: JobListParams): Promise<JobPosting[]> => {
+    const response = await apiClient.get('/jobs/', { params });
     return response.data;
 };
 
@@ -24,8 +37,31 @@ export const fetchJobById = async (id: string): Promise<JobPosting> => {
     return response.data;
 };
 
-export const createJob = async (job: Omit<JobPosting, 'id'>) => {
-    const response = await apiClient.post('/jobs/', job);
+export interface PublishStatus {
+    db_id: number;
+    zoho_id: string | null;
+    status: 'pending' | 'in_progress' | 'done' | 'failed';
+    steps: {
+        target: string;
+        status: string;
+        attempts: number;
+        next_attempt_at: string | null;
+        last_error: string | null;
+        result: string | null;
+    }[];
+}
+
+// The API queues the job and publishes it to Zoho in the background.
+// Pass the same idempotencyKey when retrying a submit so it is not queued twice.
+export const createJob = async (job: Omit<JobPosting, 'id'>, idempotencyKey: string = crypto.randomUUID()) => {
+    const response = await apiClient.post('/jobs/', job, {
+        headers: { 'Idempotency-Key': idempotencyKey },
+    });
+    return response.data;
+};
+
+export const fetchPublishStatus = async (dbId: number): Promise<PublishStatus> => {
+    const response = await apiClient.get(`/jobs/publish/${dbId}`);
     return response.data;
 };
 